@@ -0,0 +1,39 @@
+import os.path
+import sys
+
+here = os.path.realpath(__file__)
+package_path_root = os.path.realpath(os.path.join(os.path.dirname(here), "../src/unix_accounts"))
+sys.path.append(package_path_root)
+
+from storage_sqlite.db_sqlite import SqliteDatabase
+from storage_sqlite.schema import (
+    UnixAccountSchema,
+    Group,
+    GroupId,
+    User,
+    UserId
+)
+from storage_sqlite.password_schema import Password
+
+
+def populate(db: str, users: int, groups: int = 0, members_per_group: int = 0):
+    """ Fill database with users, each with an own primary group, and additional groups with members """
+    database = SqliteDatabase(UnixAccountSchema(), db)
+    session = database.session
+    first_id = 10000
+    for n in range(users):
+        name = "user{n}".format(n=n)
+        user = User(name=name, user_id=UserId(id=first_id + n), home_dir="/home/" + name, shell="/bin/bash")
+        user.group = Group(name=name, group_id=GroupId(id=first_id + n))
+        user.password = Password(name=name)
+        session.add(user)
+    session.flush()
+    for n in range(groups):
+        group = Group(name="group{n}".format(n=n), group_id=GroupId(id=first_id + users + n))
+        session.add(group)
+        session.flush()
+        session.execute(
+            "INSERT INTO user_group_membership (user_name, group_name) "
+            "SELECT name, :group FROM user LIMIT :members", dict(group=group.name, members=members_per_group))
+    session.commit()
+    session.close()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+""" Users added to a group one membership at a time, against all at once with add_members
+
+Usage: python3 benchmarks/group_members.py [--users N]
+"""
+
+import argparse
+import os.path
+import tempfile
+import time
+
+import common
+from storage_sqlite import Api
+
+
+def add_one_by_one(api: Api, group: str, users: list):
+    for user in users:
+        api.group_members.add_member(user, group)
+
+
+def add_at_once(api: Api, group: str, users: list):
+    api.group_members.add_members(group, users)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=3000)
+    args = parser.parse_args()
+    users = ["user{n}".format(n=n) for n in range(args.users)]
+    print("{users} users added to a group".format(users=args.users))
+    for add, name in ((add_one_by_one, "add_member per user"), (add_at_once, "add_members")):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "accounts.sqlite")
+            common.populate(db, users=args.users, groups=1)
+            api = Api(db)
+            start = time.perf_counter()
+            with api.session_scope():
+                add(api, "group0", users)
+            elapsed = time.perf_counter() - start
+            print("{:<22} {:>8.2f} s".format(name, elapsed))
+            api.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+""" Lowest free uid, the same free uid and gid, and a block of free uids, with all ids of the range before in use
+
+Usage: python3 benchmarks/id_allocation.py [--users N] [--repeat N]
+"""
+
+import argparse
+import os.path
+import tempfile
+import time
+
+import common
+from storage_sqlite.db_sqlite import SqliteDatabase
+from storage_sqlite.id_allocator import (
+    IdAllocatorSqlite,
+    IdRange,
+    IdRanges
+)
+from storage_sqlite.schema import UnixAccountSchema
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "accounts.sqlite")
+        common.populate(db, users=args.users)
+        database = SqliteDatabase(UnixAccountSchema(), db)
+        # populated ids start at 10000, a gap at the start of the range is found right away:
+        for first in (9000, 10000):
+            ids = IdAllocatorSqlite(database, IdRanges(users=IdRange(first, 2 ** 31 - 1), groups=IdRange(first, 2 ** 31 - 1)))
+            print("range from {first}, {users} ids in use".format(first=first, users=args.users))
+            for name, allocate in (("uid", ids.uid), ("uid and gid", ids.uid_and_gid), ("block of 1000", lambda: ids.reserve_uids(1000))):
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    allocate()
+                elapsed = time.perf_counter() - start
+                print("  {:<16} {:>8.2f} ms".format(name, elapsed / args.repeat * 1000))
+        database.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+""" Enumeration and lookups formatted as json rows, through the ORM storages against the Core read path
+
+Usage: python3 benchmarks/json_rows.py [--users N [N ...]] [--lookups N]
+"""
+
+import argparse
+import os.path
+import random
+import tempfile
+import time
+
+import common
+from format import (
+    JsonFormatterGroup,
+    JsonFormatterPassword,
+    JsonFormatterUser
+)
+from storage_sqlite import Api
+
+
+def measure(api: Api, lookup, *args) -> float:
+    """ Best of three, each run starting with an empty session """
+    best = None
+    for _ in range(3):
+        api.close_session()
+        start = time.perf_counter()
+        lookup(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def lookup_each(lookup, keys: list):
+    for key in keys:
+        lookup(key)
+
+
+def benchmark(db: str, users: int, lookups: int):
+    api = Api(db)
+    json_rows = api.json_rows
+    names = ["user{n}".format(n=random.randrange(users)) for _ in range(lookups)]
+    cases = (
+        ("all users", users,
+            lambda: [JsonFormatterUser(user) for user in api.users.iter_all()],
+            lambda: list(json_rows.users())),
+        ("all groups", users + 1,
+            lambda: [JsonFormatterGroup(group) for group in api.groups.iter_all()],
+            lambda: list(json_rows.groups())),
+        ("all passwords", users,
+            lambda: [JsonFormatterPassword(password) for password in api.password.iter_all()],
+            lambda: list(json_rows.passwords())),
+        ("user by name", lookups,
+            lambda: lookup_each(lambda name: JsonFormatterUser(api.users.get_by_name(name)), names),
+            lambda: lookup_each(json_rows.user_by_name, names)),
+        ("group by name", lookups,
+            lambda: lookup_each(lambda name: JsonFormatterGroup(api.groups.get_by_name(name)), names),
+            lambda: lookup_each(json_rows.group_by_name, names)),
+    )
+    print("{users} users".format(users=users))
+    print("{:<16} {:>12} {:>12} {:>8}".format("", "orm rows/s", "core rows/s", "speedup"))
+    for name, rows, orm, core in cases:
+        orm_time, core_time = measure(api, orm), measure(api, core)
+        print("{:<16} {:>12.0f} {:>12.0f} {:>7.1f}x".format(name, rows / orm_time, rows / core_time, orm_time / core_time))
+    api.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+    for users in args.users:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "accounts.sqlite")
+            # a group with every tenth user as member, besides the primary groups
+            common.populate(db, users, groups=1, members_per_group=users // 10)
+            benchmark(db, users, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
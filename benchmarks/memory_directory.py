@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+""" Lookup latency and memory use of the in-memory directory
+
+Usage: python3 benchmarks/memory_directory.py [--users N]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+import common
+from group import UnixGroup
+from storage_memory import Directory
+from user import UnixUser
+
+
+def build(users: int) -> Directory:
+    """ Strings are created per user, the same as read from database rows """
+    groups = [UnixGroup("user{n}".format(n=n), 10000 + n) for n in range(users)]
+    shared = UnixGroup("shared", 10000 + users, tuple("user{n}".format(n=n) for n in range(0, users, 2)))
+    groups.append(shared)
+    unix_users = [
+        UnixUser(
+            name=group.name,
+            uid=group.id,
+            group=group,
+            home_dir="/home/" + group.name,
+            shell="/bin/{shell}".format(shell="bash")
+        ) for group in groups[:users]
+    ]
+    return Directory(unix_users, groups, generation=1)
+
+
+def measure(name: str, lookup, keys: list):
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    elapsed = time.perf_counter() - start
+    print("{:<20} {:>8.2f} us/lookup".format(name, 1e6 * elapsed / len(keys)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+    tracemalloc.start()
+    start = time.perf_counter()
+    directory = build(args.users)
+    elapsed = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("Built directory with {users} users in {time:.2f} s, {size:.1f} MiB allocated".format(
+        users=args.users, time=elapsed, size=allocated / 2 ** 20))
+    ids = [10000 + random.randrange(args.users) for _ in range(args.lookups)]
+    names = ["user{n}".format(n=uid - 10000) for uid in ids]
+    measure("user by name", directory.user_by_name, names)
+    measure("user by id", directory.user_by_id, ids)
+    measure("group by name", directory.group_by_name, names)
+    measure("group by id", directory.group_by_id, ids)
+    measure("groups by member", directory.groups_by_member, names)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+""" Compares lookups through the sync backend in a thread pool against the asyncio backend
+
+Usage: python3 benchmarks/storage_backends.py [--users N] [--lookups N]
+"""
+
+import argparse
+import asyncio
+import os.path
+import random
+import tempfile
+import time
+
+import common
+from http_request import StorageExecutor
+from storage_sqlite import Api
+from storage_sqlite_async import AsyncApi
+
+CONCURRENCY = (1, 8, 64, 256)
+
+
+async def run_lookups(lookup, names, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(name):
+        async with semaphore:
+            await lookup(name)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(name) for name in names))
+    return time.perf_counter() - start
+
+
+async def benchmark(db: str, names: list, threads: int):
+    sync_api = Api(db)
+    executor = StorageExecutor(threads, sync_api.session_scope)
+    sync_users = sync_api.users
+    async_api = AsyncApi(db)
+    async_users = async_api.users
+
+    async def sync_lookup(name):
+        await executor.run(sync_users.get_by_name, name)
+
+    print("{:>11} {:>16} {:>16}".format("concurrency", "sync+threads/s", "asyncio/s"))
+    for concurrency in CONCURRENCY:
+        sync_time = await run_lookups(sync_lookup, names, concurrency)
+        async_time = await run_lookups(async_users.get_by_name, names, concurrency)
+        print("{:>11} {:>16.0f} {:>16.0f}".format(concurrency, len(names) / sync_time, len(names) / async_time))
+    executor.shutdown()
+    await async_api.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4, help="Size of storage thread pool")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "accounts.sqlite")
+        common.populate(db, args.users)
+        names = ["user{n}".format(n=random.randrange(args.users)) for _ in range(args.lookups)]
+        asyncio.get_event_loop().run_until_complete(benchmark(db, names, args.threads))
+
+
+if __name__ == "__main__":
+    main()
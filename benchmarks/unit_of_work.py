@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+""" Users added with memberships of a few groups, each storage call committed on its own against one transaction per user
+
+Usage: python3 benchmarks/unit_of_work.py [--users N] [--groups N]
+"""
+
+import argparse
+import os.path
+import tempfile
+import time
+
+import common
+from storage_sqlite import Api
+
+
+def add_users(api: Api, users: int, groups: int, per_user_transaction: bool):
+    group_members = api.group_members
+    for n in range(users):
+        name = "student{n}".format(n=n)
+        if per_user_transaction:
+            with api.transaction():
+                api.users.add(name)
+                for group in range(groups):
+                    group_members.add_member(name, "group{n}".format(n=group))
+        else:
+            api.users.add(name)
+            for group in range(groups):
+                group_members.add_member(name, "group{n}".format(n=group))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=3)
+    args = parser.parse_args()
+    print("{users} users, each member of {groups} groups".format(users=args.users, groups=args.groups))
+    for per_user_transaction, name in ((False, "commit per call"), (True, "transaction per user")):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = os.path.join(tmp, "accounts.sqlite")
+            common.populate(db, users=1000, groups=args.groups)
+            api = Api(db)
+            start = time.perf_counter()
+            with api.session_scope():
+                add_users(api, args.users, args.groups, per_user_transaction)
+            elapsed = time.perf_counter() - start
+            print("{:<22} {:>8.1f} users/s".format(name, args.users / elapsed))
+            api.dispose()
+
+
+if __name__ == "__main__":
+    main()
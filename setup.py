@@ -36,6 +36,11 @@ setup(
         "terminaltables>=3.1",
         "tornado>=6.1"
     ],
+    extras_require={
+        "async": ["aiosqlite>=0.17"],
+        "zstd": ["zstandard>=0.15"],
+        "orjson": ["orjson>=3.6"],
+    },
     entry_points={
         "console_scripts": [
             "unix-accounts-server=unix_accounts.bin.server:main",
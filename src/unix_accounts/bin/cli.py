@@ -1,12 +1,21 @@
 #!/usr/bin/env python3
 
-from typing import List
+from collections import Counter
+from typing import (
+    List,
+    Tuple
+)
 import argparse
 import readline # import is enough to enable readline for "input()" prompt
 import shlex
+import sys
 
 from . import package_base
-from storage_sqlite import Api
+from storage_sqlite import (
+    Api,
+    IdRange,
+    IdRanges
+)
 from commandline import (
     CommandUnixAccount
 )
@@ -24,6 +33,21 @@ class ArgumentParseError(Exception):
     pass
 
 
+class BatchError(Exception):
+    pass
+
+
+def id_range(value: str) -> IdRange:
+    """ Range as "first-last" """
+    try:
+        first, last = (int(id_) for id_ in value.split("-"))
+        if not 0 <= first <= last:
+            raise ValueError(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("\"{value}\" is not a range of ids as first-last".format(value=value))
+    return IdRange(first, last)
+
+
 class UnixAccountArgumentParser(argparse.ArgumentParser):
 
     def exit(self,status=0, message=None):
@@ -37,14 +61,21 @@ class Application:
         app_parser = self._build_application_parser()
         # TODO parse below can throw (on "--help", only), where to handle that??
         args, remaining_cmdline_args = app_parser.parse_known_args()
-        self._api = Api(args.db, args.verbose)
+        self._api = Api(args.db, args.verbose, id_ranges=IdRanges(args.uid_range, args.gid_range, args.system_id_range))
+        self._batch = args.batch
         self._remaining_cmdline_args = remaining_cmdline_args
 
     # TODO: this will consume the --help and not propagate to subparsers..
     def _build_application_parser(self) -> argparse.ArgumentParser:
         parser = self._get_parser()
+        # options of commands, such as "user add --uid", are not abbreviations of these:
+        parser.allow_abbrev = False
         parser.add_argument("--db", type=str, default=DefaultPath.DATABASE, help="Path to database")
         parser.add_argument("--verbose", action="store_true", help="Print database commands")
+        parser.add_argument("--batch", type=str, help="Run commands from file, or \"-\" for stdin, all in one transaction")
+        parser.add_argument("--uid-range", type=id_range, default=IdRanges().users, help="Range of allocated uids, as first-last")
+        parser.add_argument("--gid-range", type=id_range, default=IdRanges().groups, help="Range of allocated gids, as first-last")
+        parser.add_argument("--system-id-range", type=id_range, default=IdRanges().system, help="Range of allocated ids of system accounts, as first-last")
         return parser
 
     @staticmethod
@@ -52,7 +83,9 @@ class Application:
         return UnixAccountArgumentParser(description="unix account shell")
 
     def run(self):
-        if self._remaining_cmdline_args:
+        if self._batch:
+            self._run_batch(self._batch)
+        elif self._remaining_cmdline_args:
             self._run_once(self._remaining_cmdline_args)
         else:
             self._run_interactive()
@@ -91,8 +124,67 @@ class Application:
         parser = self._get_parser()
         cmd = CommandUnixAccount(parser, self._api)
         args = parser.parse_args(cmdline_args)
-        cmd.exec(args)
+        # Each command starts with a new session, the interactive shell sees changes made by others meanwhile:
+        with self._api.session_scope():
+            cmd.exec(args)
+
+    def _run_batch(self, path: str):
+        """ Commands are parsed first, then executed in one transaction without output of each command
+
+        Nothing is changed if any command fails.
+        """
+        parser = self._get_parser()
+        cmd = CommandUnixAccount(parser, self._api, output=lambda result: None)
+        try:
+            commands = self._parse_batch(parser, cmd, path)
+        except ArgumentParseError as err:
+            print("\n{}".format(err))
+            exit(1)
+        executed = Counter()
+        try:
+            with self._api.transaction():
+                for line_number, args in commands:
+                    try:
+                        cmd.exec(args)
+                    except UnixAccountError as err:
+                        raise BatchError("line {line}: {error}".format(line=line_number, error=err)) from err
+                    executed[args.command] += 1
+        except BatchError as err:
+            print("ERROR: {error}, no changes made".format(error=err))
+            exit(1)
+        print("Executed {count} commands in one transaction: {commands}".format(
+            count=sum(executed.values()),
+            commands=", ".join("{command} {count}".format(command=command, count=count) for command, count in executed.items())
+        ))
 
+    @staticmethod
+    def _parse_batch(parser: argparse.ArgumentParser, cmd: CommandUnixAccount, path: str) -> List[Tuple[int, argparse.Namespace]]:
+        """ Parsed commands with their line number, empty lines and comments are skipped
+
+        Commands prompting for input are rejected, they would wait for it with the database locked by the transaction.
+        """
+        try:
+            if path == "-":
+                lines = list(sys.stdin)
+            else:
+                with open(path) as batch:
+                    lines = list(batch)
+        except OSError as err:
+            raise InternalError("Can't read {path}: {error}".format(path=path, error=err.strerror))
+        commands = []
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                cmdline_args = shlex.split(line, comments=True)
+                if cmdline_args:
+                    args = parser.parse_args(cmdline_args)
+                    if cmd.is_incomplete(args):
+                        raise ArgumentParseError("missing command")
+                    if cmd.is_interactive(args):
+                        raise ArgumentParseError("{command} prompts for input, not supported in batch mode".format(command=args.command))
+                    commands.append((line_number, args))
+            except (ArgumentParseError, ValueError) as err:
+                raise ArgumentParseError("line {line}: {error}".format(line=line_number, error=str(err).strip()))
+        return commands
 
 def main():
     try:
@@ -6,19 +6,38 @@ from ssl import (
     SSLContext,
     CERT_REQUIRED
 )
+import tornado.httpserver
 import tornado.ioloop
+import tornado.netutil
 from tornado.options import (
     define,
     options
 )
+import tornado.process
 import tornado.web
 
 from . import package_base
+from format import (
+    JsonSerializer,
+    json_serializer
+)
+from storage import DirectoryGeneration
 from storage_sqlite import Api
+from storage_sqlite_async import AsyncApi
+from storage_memory import (
+    DirectoryGenerationMemory,
+    MaterializedDirectory,
+    UnixGroupStorageMemory,
+    UnixUserStorageMemory
+)
 from http_request import (
     HttpRequestGroup,
+    HttpRequestMetrics,
     HttpRequestPassword,
-    HttpRequestUser
+    HttpRequestUser,
+    RequestMetrics,
+    ResponseCache,
+    StorageExecutor
 )
 from .auth_tokens import AuthorizationTokens
 from .default_paths import DefaultPath
@@ -30,7 +49,22 @@ log = logging.getLogger(__name__)
 define("db", default=DefaultPath.DATABASE, help="Path to database", type=str)
 define("host", default="127.0.0.1", help="Listen address for server", type=str)
 define("port", default=8025, help="Listen port for server", type=int)
+define("unix_socket", help="Also serve on a unix domain socket at this path, without TLS and client certificates", type=str)
+define("unix_socket_mode", default="660", help="Permissions of the unix domain socket, in octal", type=str)
+define("unix_socket_with_tls", help="Serve the unix domain socket also when TLS is configured, local clients skip the client certificate check", type=bool)
 define("verbose", help="Print database commands", type=bool)
+define("slow_statement_threshold", default=0.1, help="Log database statements slower than this many seconds, negative disables statement timing", type=float)
+define("async_storage", help="Serve lookups with the asyncio storage backend, requires aiosqlite", type=bool)
+define("memory_directory", help="Serve user and group lookups from an in-memory copy of the database", type=bool)
+define("refresh_interval", default=1.0, help="Seconds between checks for database changes, with --memory-directory", type=float)
+define("response_cache", default=True, help="Cache encoded responses until the database changes", type=bool)
+define("response_cache_size", default=10000, help="Max number of cached responses per endpoint", type=int)
+define("cache_max_age", default=0, help="Seconds clients may cache responses without revalidation", type=int)
+define("workers", default=1, help="Number of server processes sharing the listen socket, 0 starts one per CPU core", type=int)
+define("json_serializer", default=JsonSerializer.STDLIB, help="Encoder of json responses: stdlib or orjson. orjson is faster, its output is not byte for byte the same", type=str)
+define("metrics", default=True, help="Serve request and storage metrics of each process @ /metrics, in Prometheus format", type=bool)
+define("storage_threads", default=4, help="Number of threads serving storage lookups", type=int)
+define("storage_stats_interval", default=0, help="Seconds between logging storage thread pool statistics, 0 disables", type=int)
 define("generate-token", help="Generate a new authorization token for accessing passwords", type=bool)
 define("token-db", default=DefaultPath.API_TOKENS, help="Path to authorization token database file", type=str)
 define("cert_path", default=DefaultPath.TLS_CERT_PATH, group="tls", help="Prefix path for files", type=str)
@@ -61,8 +95,18 @@ class ServerSSLContext(SSLContext):
 class Application:
 
     def __init__(self):
-        self._api = Api(options.db, options.verbose)
+        self._api = Api(options.db, options.verbose, options.slow_statement_threshold if options.slow_statement_threshold >= 0 else None)
         self._auth_tokens = AuthorizationTokens(options.token_db)
+        self._json_serializer = json_serializer(options.json_serializer)
+        self._directory = self._create_directory() if options.memory_directory else None
+        self._refreshing = False
+        # Threads and connections don't survive a fork, created per worker process:
+        self._lookup_api = None
+        self._storage_executor = None
+        self._request_metrics = None
+
+    def _create_directory(self) -> MaterializedDirectory:
+        return MaterializedDirectory(self._api.users, self._api.groups, self._api.generation)
 
     def run(self):
         if options.generate_token:
@@ -77,30 +121,120 @@ class Application:
         except OSError as err:
             print("Failed to generate token: {err}".format(err=err))
 
-    def _run_server(self):
-        server = tornado.web.Application([
-            ("/api/group", HttpRequestGroup, dict(group_storage=self._api.groups)),
-            ("/api/password", HttpRequestPassword, dict(password_storage=self._api.password, auth_tokens=self._try_load_auth_tokens())),
-            ("/api/user", HttpRequestUser, dict(user_storage=self._api.users))
-        ])
-
-        if self._tls_args_provided():
-            ssl_context = ServerSSLContext(
-                options.cert_file,
-                options.key_file,
-                options.ca_cert_file,
-                options.cert_path
-            )
-            ssl_context.set_verify_client_cert()
-            server.listen(options.port, options.host, ssl_options=ssl_context)
+    def _handlers(self) -> list:
+        if self._directory:
+            # Dict lookups only, cheaper to run directly on the IOLoop than in a thread:
+            generation = DirectoryGenerationMemory(self._directory)
+            user_lookups = dict(user_storage=UnixUserStorageMemory(self._directory), response_cache=self._response_cache(generation))
+            group_lookups = dict(group_storage=UnixGroupStorageMemory(self._directory), response_cache=self._response_cache(generation))
         else:
-            server.listen(options.port, options.host)
+            user_lookups = dict(user_storage=self._lookup_api.passwd_users, storage_executor=self._storage_executor, response_cache=self._response_cache(self._api.generation))
+            group_lookups = dict(group_storage=self._lookup_api.groups, storage_executor=self._storage_executor, response_cache=self._response_cache(self._api.generation))
+        password_lookups = dict(password_storage=self._lookup_api.password, auth_tokens=self._try_load_auth_tokens(), storage_executor=self._storage_executor, response_cache=self._response_cache(self._api.generation))
+        handlers = [
+            ("/api/group", HttpRequestGroup, dict(group_lookups, request_metrics=self._request_metrics, json_serializer=self._json_serializer)),
+            ("/api/password", HttpRequestPassword, dict(password_lookups, request_metrics=self._request_metrics, json_serializer=self._json_serializer)),
+            ("/api/user", HttpRequestUser, dict(user_lookups, request_metrics=self._request_metrics, json_serializer=self._json_serializer))
+        ]
+        if self._request_metrics:
+            handlers.append(("/metrics", HttpRequestMetrics, dict(request_metrics=self._request_metrics)))
+        return handlers
+
+    @staticmethod
+    def _response_cache(generation: DirectoryGeneration) -> ResponseCache:
+        if options.response_cache:
+            return ResponseCache(generation, options.cache_max_age, options.response_cache_size)
+        else:
+            return None
+
+    def _run_server(self):
+        if options.unix_socket:
+            unix_socket_mode = self._unix_socket_mode()
+        if self._directory:
+            # Loaded before fork, shared by all workers until changed:
+            self._refresh_directory()
+        sockets = tornado.netutil.bind_sockets(options.port, options.host)
         log.info("Running server @ port {host}:{port}".format(
             host=options.host,
             port=options.port
         ))
+        if options.unix_socket:
+            # Access is limited by the socket permissions only, no client certificates are required:
+            unix_socket = tornado.netutil.bind_unix_socket(options.unix_socket, mode=unix_socket_mode)
+            log.info("Running server @ {path}".format(path=options.unix_socket))
+        if options.workers != 1:
+            tornado.process.fork_processes(options.workers)
+            # Connections of the parent must not be used by workers:
+            self._api.dispose()
+        self._start_worker()
+
+        application = tornado.web.Application(self._handlers())
+        server = tornado.httpserver.HTTPServer(
+            application,
+            ssl_options=self._ssl_context() if self._tls_args_provided() else None
+        )
+        server.add_sockets(sockets)
+        if options.unix_socket:
+            tornado.httpserver.HTTPServer(application).add_socket(unix_socket)
+        if options.storage_stats_interval > 0:
+            tornado.ioloop.PeriodicCallback(self._log_storage_stats, options.storage_stats_interval * 1000).start()
+        if self._directory:
+            tornado.ioloop.PeriodicCallback(self._schedule_refresh_directory, options.refresh_interval * 1000).start()
         tornado.ioloop.IOLoop.current().start()
 
+    def _start_worker(self):
+        self._lookup_api = AsyncApi(options.db, options.verbose) if options.async_storage else self._api
+        # Loaded rows are released after each storage call, for a bounded session and changes by others to be seen:
+        self._storage_executor = StorageExecutor(options.storage_threads, self._api.session_scope)
+        self._request_metrics = RequestMetrics(self._storage_executor, self._api.statement_stats) if options.metrics else None
+
+    def _unix_socket_mode(self) -> int:
+        """ With TLS, clients of the tcp listener need a client certificate, the socket must not bypass it unasked """
+        if self._tls_args_provided() and not options.unix_socket_with_tls:
+            raise InternalError("--unix-socket skips the client certificate check of TLS, start with --unix-socket-with-tls to serve it anyway")
+        try:
+            return int(options.unix_socket_mode, 8)
+        except ValueError:
+            raise InternalError("--unix-socket-mode {mode} is not an octal mode".format(mode=options.unix_socket_mode))
+
+    @staticmethod
+    def _ssl_context() -> ServerSSLContext:
+        ssl_context = ServerSSLContext(
+            options.cert_file,
+            options.key_file,
+            options.ca_cert_file,
+            options.cert_path
+        )
+        ssl_context.set_verify_client_cert()
+        return ssl_context
+
+    def _refresh_directory(self):
+        # Don't keep loaded objects, next refresh must see changes from other processes:
+        with self._api.session_scope():
+            if self._directory.refresh():
+                log.info("Loaded directory generation {generation}".format(generation=self._directory.current.generation))
+
+    async def _schedule_refresh_directory(self):
+        if self._refreshing:
+            return
+        self._refreshing = True
+        try:
+            await self._storage_executor.run(self._refresh_directory)
+        except Exception as err:
+            log.error("Failed to refresh directory: {err}".format(err=err))
+        finally:
+            self._refreshing = False
+
+    def _log_storage_stats(self):
+        stats = self._storage_executor.stats()
+        log.info("Storage threads: queue depth {queued}, active {active}, completed {completed}, wait time avg {wait_avg:.2f} ms max {wait_max:.2f} ms".format(
+            queued=stats.queue_depth,
+            active=stats.active,
+            completed=stats.completed,
+            wait_avg=1000 * stats.wait_time_total / max(stats.completed + stats.active, 1),
+            wait_max=1000 * stats.wait_time_max
+        ))
+
     def _try_load_auth_tokens(self):
         try:
             return self._auth_tokens.get_tokens()
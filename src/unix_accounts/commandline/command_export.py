@@ -0,0 +1,92 @@
+import argparse
+import sys
+from contextlib import contextmanager
+
+from error import NotPossible
+from format import (
+    ExportFormat,
+    json_serializer,
+    write_csv,
+    write_jsonl,
+    write_lines
+)
+from format.etc_files import (
+    group_line,
+    passwd_line,
+    shadow_line
+)
+from storage_sqlite.json_rows import JsonRowsSqlite
+from .command import Command
+
+
+@contextmanager
+def _stdout():
+    """ sys.stdout, not closed after writing """
+    yield sys.stdout
+
+
+class Mode:
+    USER, GROUP, GROUP_MEMBER, PASSWORD = "user", "group", "group-member", "password"
+
+
+class CommandExport(Command):
+
+    def __init__(self, parser: argparse.ArgumentParser, json_rows: JsonRowsSqlite):
+        self._register_commands(parser)
+        self._parser = parser
+        self._json_rows = json_rows
+
+    @staticmethod
+    def _register_commands(parser: argparse.ArgumentParser):
+        parser.add_argument("entries", type=str, choices=(Mode.USER, Mode.GROUP, Mode.GROUP_MEMBER, Mode.PASSWORD), help="Entries to export")
+        parser.add_argument("--format", type=str, default=ExportFormat.JSONL, choices=(ExportFormat.JSONL, ExportFormat.CSV, ExportFormat.ETC),
+                            help="Json lines, csv, or passwd, group and shadow file format")
+        parser.add_argument("--output", type=str, help="Write to file instead of stdout")
+
+    def exec(self, args: argparse.Namespace):
+        cmd = CommandExec(args, self._json_rows)
+        cmd.exec()
+
+
+class CommandExec:
+
+    def __init__(self, args: argparse.Namespace, json_rows: JsonRowsSqlite):
+        self._args = args
+        self._json_rows = json_rows
+
+    def exec(self):
+        line = self._etc_line() if self._args.format == ExportFormat.ETC else None
+        rows = self._rows()
+        # entries are written while read from the database, chunk by chunk
+        with self._output() as output:
+            if self._args.format == ExportFormat.JSONL:
+                write_jsonl(output, rows, json_serializer())
+            elif self._args.format == ExportFormat.CSV:
+                write_csv(output, rows)
+            else:
+                write_lines(output, rows, line)
+
+    def _rows(self):
+        return {
+            Mode.USER: self._json_rows.users,
+            Mode.GROUP: self._json_rows.groups,
+            Mode.GROUP_MEMBER: self._json_rows.memberships,
+            Mode.PASSWORD: self._json_rows.passwords
+        }[self._args.entries]()
+
+    def _etc_line(self):
+        if self._args.entries == Mode.GROUP_MEMBER:
+            raise NotPossible("Group members are exported with groups in format {format}".format(format=ExportFormat.ETC))
+        return {
+            Mode.USER: passwd_line,
+            Mode.GROUP: group_line,
+            Mode.PASSWORD: shadow_line
+        }[self._args.entries]
+
+    def _output(self):
+        if not self._args.output:
+            return _stdout()
+        try:
+            return open(self._args.output, "w", encoding="utf-8", newline="")
+        except OSError as err:
+            raise NotPossible("Can't write {path}: {error}".format(path=self._args.output, error=err.strerror))
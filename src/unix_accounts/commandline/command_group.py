@@ -1,4 +1,5 @@
 import argparse
+from typing import Callable
 
 from format import GroupsAsciiTable
 from storage import UnixGroupStorage
@@ -13,10 +14,11 @@ class Mode:
 
 class CommandGroup(Command):
 
-    def __init__(self, parser: argparse.ArgumentParser, group_storage: UnixGroupStorage):
+    def __init__(self, parser: argparse.ArgumentParser, group_storage: UnixGroupStorage, output: Callable[[object], None] = print):
         self._register_commands(parser)
         self._parser = parser
         self._group_storage = group_storage
+        self._output = output
 
     @staticmethod
     def _register_commands(parser: argparse.ArgumentParser):
@@ -24,6 +26,7 @@ class CommandGroup(Command):
         cmd_add = subparsers.add_parser(Mode.ADD)
         cmd_add.add_argument("name", type=str, nargs=1, help="Group name")
         cmd_add.add_argument("--gid", type=int, help="Group id")
+        cmd_add.add_argument("--system", action="store_true", help="Allocate gid from the range of system accounts")
         cmd_get = subparsers.add_parser(Mode.GET)
         cmd_get.add_argument("--gid", type=int)
         cmd_get.add_argument("name", type=str, nargs="?")
@@ -36,7 +39,7 @@ class CommandGroup(Command):
         grp.add_argument("--new-name", type=str)
 
     def exec(self, args: argparse.Namespace):
-        cmd = CommandExec(args, self._group_storage)
+        cmd = CommandExec(args, self._group_storage, self._output)
         success = cmd.exec()
         if not success:
             self._parser.print_help()
@@ -44,9 +47,10 @@ class CommandGroup(Command):
 
 class CommandExec:
 
-    def __init__(self, args: argparse.Namespace, group_storage: UnixGroupStorage):
+    def __init__(self, args: argparse.Namespace, group_storage: UnixGroupStorage, output: Callable[[object], None]):
         self._args = args
         self._group_storage = group_storage
+        self._output = output
 
     def exec(self) -> bool:
         if self._args.groups_command == Mode.ADD:
@@ -62,8 +66,8 @@ class CommandExec:
         return True
 
     def _add(self):
-        group = self._group_storage.add(self._args.name[0], self._args.gid)
-        print(GroupsAsciiTable((group,)))
+        group = self._group_storage.add(self._args.name[0], self._args.gid, self._args.system)
+        self._output(GroupsAsciiTable((group,)))
 
     def _get(self):
         if self._args.gid:
@@ -72,7 +76,7 @@ class CommandExec:
             groups = (self._group_storage.get_by_name(self._args.name),)
         else:
             groups = self._group_storage.get_all()
-        print(GroupsAsciiTable(groups))
+        self._output(GroupsAsciiTable(groups))
 
     def _delete(self):
         self._group_storage.delete(self._args.name)
@@ -84,4 +88,4 @@ class CommandExec:
             groups = (self._group_storage.update_name(self._args.name, self._args.new_name),)
         else:
             raise InternalError("Cmdline: this shall never happen")
-        print(GroupsAsciiTable(groups))
+        self._output(GroupsAsciiTable(groups))
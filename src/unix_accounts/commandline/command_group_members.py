@@ -1,5 +1,10 @@
 import argparse
+from typing import (
+    Callable,
+    List
+)
 
+from error import NotPossible
 from format import GroupsAsciiTable
 from storage import UnixGroupMemberStorage
 
@@ -8,14 +13,16 @@ from .command import Command
 
 class Mode:
     ADD, DELETE = "add", "del"
+    ADD_MANY, DELETE_MANY, SET = "add-many", "del-many", "set"
 
 
 class CommandGroupMembers(Command):
 
-    def __init__(self, parser: argparse.ArgumentParser, grp_member_storage: UnixGroupMemberStorage):
+    def __init__(self, parser: argparse.ArgumentParser, grp_member_storage: UnixGroupMemberStorage, output: Callable[[object], None] = print):
         self._register_commands(parser)
         self._parser = parser
         self._grp_member_storage = grp_member_storage
+        self._output = output
 
     @staticmethod
     def _register_commands(parser: argparse.ArgumentParser):
@@ -26,9 +33,16 @@ class CommandGroupMembers(Command):
         cmd_delete = subparsers.add_parser(Mode.DELETE, help="Remove user from group")
         cmd_delete.add_argument("user", type=str, nargs=1, help="User name")
         cmd_delete.add_argument("group", type=str, nargs=1, help="Group name")
+        for mode, help_text in ((Mode.ADD_MANY, "Add users to group"),
+                                (Mode.DELETE_MANY, "Remove users from group"),
+                                (Mode.SET, "Replace all members of group")):
+            cmd = subparsers.add_parser(mode, help=help_text)
+            cmd.add_argument("group", type=str, nargs=1, help="Group name")
+            cmd.add_argument("users", type=str, nargs="*", help="User names")
+            cmd.add_argument("--file", type=str, help="File with one user name per line, in addition to the user names given")
 
     def exec(self, args: argparse.Namespace):
-        cmd = CommandExec(args, self._grp_member_storage)
+        cmd = CommandExec(args, self._grp_member_storage, self._output)
         success = cmd.exec()
         if not success:
             self._parser.print_help()
@@ -36,23 +50,52 @@ class CommandGroupMembers(Command):
 
 class CommandExec:
 
-    def __init__(self, args: argparse.Namespace, grp_member_storage: UnixGroupMemberStorage):
+    def __init__(self, args: argparse.Namespace, grp_member_storage: UnixGroupMemberStorage, output: Callable[[object], None]):
         self._args = args
         self._grp_member_storage = grp_member_storage
+        self._output = output
 
     def exec(self) -> bool:
         if self._args.group_member_command == Mode.ADD:
             self._add()
         elif self._args.group_member_command == Mode.DELETE:
             self._delete()
+        elif self._args.group_member_command == Mode.ADD_MANY:
+            self._add_many()
+        elif self._args.group_member_command == Mode.DELETE_MANY:
+            self._delete_many()
+        elif self._args.group_member_command == Mode.SET:
+            self._set()
         else:
             return False
         return True
 
     def _add(self):
         group = self._grp_member_storage.add_member(self._args.user[0], self._args.group[0])
-        print(GroupsAsciiTable((group,)))
+        self._output(GroupsAsciiTable((group,)))
 
     def _delete(self):
         group = self._grp_member_storage.delete_member(self._args.user[0], self._args.group[0])
-        print(GroupsAsciiTable((group,)))
+        self._output(GroupsAsciiTable((group,)))
+
+    def _add_many(self):
+        group = self._grp_member_storage.add_members(self._args.group[0], self._users())
+        self._output(GroupsAsciiTable((group,)))
+
+    def _delete_many(self):
+        group = self._grp_member_storage.remove_members(self._args.group[0], self._users())
+        self._output(GroupsAsciiTable((group,)))
+
+    def _set(self):
+        group = self._grp_member_storage.set_members(self._args.group[0], self._users())
+        self._output(GroupsAsciiTable((group,)))
+
+    def _users(self) -> List[str]:
+        users = list(self._args.users)
+        if self._args.file:
+            try:
+                with open(self._args.file, encoding="utf-8") as file:
+                    users.extend(line.strip() for line in file if line.strip())
+            except OSError as err:
+                raise NotPossible("Can't read {path}: {error}".format(path=self._args.file, error=err.strerror))
+        return users
@@ -0,0 +1,63 @@
+import argparse
+from typing import Callable
+from contextlib import ExitStack
+
+from error import NotPossible
+from format.etc_files import (
+    parse_group,
+    parse_passwd,
+    parse_shadow
+)
+from storage_sqlite.bulk_import import BulkImportSqlite
+from .command import Command
+
+
+class CommandImport(Command):
+
+    def __init__(self, parser: argparse.ArgumentParser, bulk_import: BulkImportSqlite, output: Callable[[object], None] = print):
+        self._register_commands(parser)
+        self._parser = parser
+        self._bulk_import = bulk_import
+        self._output = output
+
+    @staticmethod
+    def _register_commands(parser: argparse.ArgumentParser):
+        parser.add_argument("--passwd", type=str, help="Users from file in passwd format")
+        parser.add_argument("--group", type=str, help="Groups and members from file in group format")
+        parser.add_argument("--shadow", type=str, help="Passwords of imported users from file in shadow format")
+
+    def exec(self, args: argparse.Namespace):
+        if args.passwd or args.group or args.shadow:
+            cmd = CommandExec(args, self._bulk_import, self._output)
+            cmd.exec()
+        else:
+            self._parser.print_help()
+
+
+class CommandExec:
+
+    def __init__(self, args: argparse.Namespace, bulk_import: BulkImportSqlite, output: Callable[[object], None]):
+        self._args = args
+        self._bulk_import = bulk_import
+        self._output = output
+
+    def exec(self):
+        with ExitStack() as files:
+            # files are parsed line by line while validated, nothing is inserted unless all entries are valid
+            entries = {
+                name: parse(files.enter_context(self._open(path)), path) if path else ()
+                for name, parse, path in (
+                    ("users", parse_passwd, self._args.passwd),
+                    ("groups", parse_group, self._args.group),
+                    ("passwords", parse_shadow, self._args.shadow)
+                )
+            }
+            result = self._bulk_import.import_accounts(**entries)
+        self._output("Imported {users} users, {groups} groups, {memberships} group memberships and {passwords} passwords".format(**result._asdict()))
+
+    @staticmethod
+    def _open(path: str):
+        try:
+            return open(path, encoding="utf-8")
+        except OSError as err:
+            raise NotPossible("Can't read {path}: {error}".format(path=path, error=err.strerror))
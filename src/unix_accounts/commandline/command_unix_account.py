@@ -1,4 +1,5 @@
 import argparse
+from typing import Callable
 
 from storage_sqlite import Api
 from .command import Command
@@ -6,6 +7,8 @@ from .command_group import CommandGroup
 from .command_user import CommandUsers
 from .command_group_members import CommandGroupMembers
 from .command_password import CommandPassword
+from .command_import import CommandImport
+from .command_export import CommandExport
 
 
 class Mode:
@@ -13,24 +16,49 @@ class Mode:
     USER = "user"
     GROUP_MEMBER = "group-member"
     PASSWORD = "password"
+    IMPORT = "import"
+    EXPORT = "export"
+
+
+# Commands prompting for input:
+INTERACTIVE_COMMANDS = (Mode.PASSWORD,)
+# Argument of the subcommand for commands having subcommands:
+SUBCOMMANDS = {
+    Mode.GROUP: "groups_command",
+    Mode.USER: "users_command",
+    Mode.GROUP_MEMBER: "group_member_command"
+}
 
 
 class CommandUnixAccount(Command):
 
-    def __init__(self, parser: argparse.ArgumentParser, api: Api):
+    def __init__(self, parser: argparse.ArgumentParser, api: Api, output: Callable[[object], None] = print):
+        """ Results of commands are passed to output, such as tables of changed accounts """
         self._parser = parser
         self._api = api
+        self._output = output
         self._subcommands = self._register_commands(parser)
 
     def _register_commands(self, parser: argparse.ArgumentParser):
         subparsers = parser.add_subparsers(dest="command")
         return {
-            Mode.GROUP: CommandGroup(subparsers.add_parser(Mode.GROUP, help="Group commands"), self._api.groups),
-            Mode.USER: CommandUsers(subparsers.add_parser(Mode.USER, help="User commands"), self._api.users),
-            Mode.GROUP_MEMBER: CommandGroupMembers(subparsers.add_parser(Mode.GROUP_MEMBER, help="Group membership commands"), self._api.group_members),
-            Mode.PASSWORD: CommandPassword(subparsers.add_parser(Mode.PASSWORD, help="Group membership commands"), self._api.password)
+            Mode.GROUP: CommandGroup(subparsers.add_parser(Mode.GROUP, help="Group commands"), self._api.groups, self._output),
+            Mode.USER: CommandUsers(subparsers.add_parser(Mode.USER, help="User commands"), self._api.users, self._output),
+            Mode.GROUP_MEMBER: CommandGroupMembers(subparsers.add_parser(Mode.GROUP_MEMBER, help="Group membership commands"), self._api.group_members, self._output),
+            Mode.PASSWORD: CommandPassword(subparsers.add_parser(Mode.PASSWORD, help="Group membership commands"), self._api.password),
+            Mode.IMPORT: CommandImport(subparsers.add_parser(Mode.IMPORT, help="Import accounts from passwd, group and shadow files"), self._api.bulk_import, self._output),
+            Mode.EXPORT: CommandExport(subparsers.add_parser(Mode.EXPORT, help="Export all entries as json lines, csv or passwd, group and shadow files"), self._api.export)
         }
 
+    @staticmethod
+    def is_interactive(args: argparse.Namespace) -> bool:
+        return args.command in INTERACTIVE_COMMANDS
+
+    @staticmethod
+    def is_incomplete(args: argparse.Namespace) -> bool:
+        """ Without command or subcommand, only the help is printed """
+        return args.command is None or (args.command in SUBCOMMANDS and getattr(args, SUBCOMMANDS[args.command]) is None)
+
     def exec(self, args: argparse.Namespace):
         if args.command in self._subcommands:
             cmd = self._subcommands[args.command]
@@ -1,4 +1,5 @@
 import argparse
+from typing import Callable
 
 from format import UsersAsciiTable
 from storage import UnixUserStorage
@@ -13,10 +14,11 @@ class Mode:
 
 class CommandUsers(Command):
 
-    def __init__(self, parser: argparse.ArgumentParser, user_storage: UnixUserStorage):
+    def __init__(self, parser: argparse.ArgumentParser, user_storage: UnixUserStorage, output: Callable[[object], None] = print):
         self._register_commands(parser)
         self._parser = parser
         self._user_storage = user_storage
+        self._output = output
 
     @staticmethod
     def _register_commands(parser: argparse.ArgumentParser):
@@ -27,6 +29,7 @@ class CommandUsers(Command):
         cmd_add.add_argument("--gecos", type=str, help="User account info")
         cmd_add.add_argument("--home-dir", type=str, help="Users home")
         cmd_add.add_argument("--shell", type=str, help="Users login shell")
+        cmd_add.add_argument("--system", action="store_true", help="Allocate ids from the range of system accounts")
         cmd_get = subparsers.add_parser(Mode.GET)
         cmd_get.add_argument("name", type=str, nargs="?")
         cmd_get.add_argument("--uid", type=int)
@@ -43,7 +46,7 @@ class CommandUsers(Command):
         grp.add_argument("--new-shell", type=str)
 
     def exec(self, args: argparse.Namespace):
-        cmd = CommandExec(args, self._user_storage)
+        cmd = CommandExec(args, self._user_storage, self._output)
         success = cmd.exec()
         if not success:
             self._parser.print_help()
@@ -51,9 +54,10 @@ class CommandUsers(Command):
 
 class CommandExec:
 
-    def __init__(self, args: argparse.Namespace, user_storage: UnixUserStorage):
+    def __init__(self, args: argparse.Namespace, user_storage: UnixUserStorage, output: Callable[[object], None]):
         self._args = args
         self._user_storage = user_storage
+        self._output = output
 
     def exec(self) -> bool:
         mode = self._args.users_command
@@ -75,9 +79,10 @@ class CommandExec:
             uid=self._args.uid,
             gecos=self._args.gecos,
             home_dir=self._args.home_dir,
-            shell=self._args.shell
+            shell=self._args.shell,
+            system=self._args.system
         )
-        print(UsersAsciiTable((new_user,)))
+        self._output(UsersAsciiTable((new_user,)))
 
     def _get(self):
         if self._args.uid:
@@ -86,7 +91,7 @@ class CommandExec:
             users = (self._user_storage.get_by_name(self._args.name),)
         else:
             users = self._user_storage.get_all()
-        print(UsersAsciiTable(users))
+        self._output(UsersAsciiTable(users))
 
     def _delete(self):
         self._user_storage.delete(self._args.name)
@@ -106,4 +111,4 @@ class CommandExec:
             users = (self._user_storage.update_shell(self._args.name, self._args.new_shell),)
         else:
             raise InternalError("Cmdline: this shall never happen")
-        print(UsersAsciiTable(users))
+        self._output(UsersAsciiTable(users))
@@ -3,6 +3,19 @@ from .groups_json import (
     JsonFormatterGroup,
     JsonAttributeGroup
 )
+from .export import (
+    ExportFormat,
+    write_csv,
+    write_jsonl,
+    write_lines
+)
+from .json_serializer import (
+    JsonSerializer,
+    available_serializers,
+    encode_orjson,
+    encode_stdlib,
+    json_serializer
+)
 from .users_json import (
     JsonAttributeUser,
     JsonFormatterUser
@@ -0,0 +1,125 @@
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple
+)
+
+from error import NotPossible
+from .groups_json import JsonAttributeGroup
+from .password_json import JsonAttributePassword
+from .users_json import JsonAttributeUser
+
+
+class PasswdEntry(NamedTuple):
+    name: str
+    # ids left empty are allocated on import
+    uid: Optional[int]
+    gid: Optional[int]
+    gecos: Optional[str]
+    home_dir: str
+    shell: str
+
+
+class GroupEntry(NamedTuple):
+    name: str
+    gid: Optional[int]
+    members: Tuple[str, ...]
+
+
+class ShadowEntry(NamedTuple):
+    name: str
+    encrypted_password: str
+    days_since_epoch_last_change: Optional[int]
+    days_min: Optional[int]
+    days_max: Optional[int]
+    days_warn: Optional[int]
+    days_inactive: Optional[int]
+    days_since_epoch_expires: Optional[int]
+
+
+def _fields(lines: Iterable[str], count: int, source: str) -> Iterator[Tuple[str, int, List[str]]]:
+    """ Fields of each entry with its line number, comments, empty lines and nis entries ("+", "-") are skipped """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.rstrip("\n")
+        if not line or line[0] in "#+-":
+            continue
+        fields = line.split(":")
+        if len(fields) != count:
+            raise NotPossible("{source}:{line}: expected {count} fields, got {got}".format(source=source, line=line_number, count=count, got=len(fields)))
+        yield source, line_number, fields
+
+
+def _number(value: str, source: str, line_number: int) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise NotPossible("{source}:{line}: \"{value}\" is not a valid number".format(source=source, line=line_number, value=value))
+
+
+def _id(value: str, source: str, line_number: int) -> Optional[int]:
+    """ Empty ids are None """
+    id_ = _number(value, source, line_number)
+    if id_ is not None and id_ < 0:
+        raise NotPossible("{source}:{line}: \"{value}\" is not a valid id".format(source=source, line=line_number, value=value))
+    return id_
+
+
+def parse_passwd(lines: Iterable[str], source: str = "passwd") -> Iterator[PasswdEntry]:
+    """ Entries of a passwd(5) file, "name:password:uid:gid:gecos:home:shell", read one line at a time """
+    for source, line_number, (name, _, uid, gid, gecos, home_dir, shell) in _fields(lines, 7, source):
+        yield PasswdEntry(name, _id(uid, source, line_number), _id(gid, source, line_number), gecos or None, home_dir, shell)
+
+
+def parse_group(lines: Iterable[str], source: str = "group") -> Iterator[GroupEntry]:
+    """ Entries of a group(5) file, "name:password:gid:member,member,..." """
+    for source, line_number, (name, _, gid, members) in _fields(lines, 4, source):
+        yield GroupEntry(name, _id(gid, source, line_number), tuple(dict.fromkeys(member for member in members.split(",") if member)))
+
+
+def parse_shadow(lines: Iterable[str], source: str = "shadow") -> Iterator[ShadowEntry]:
+    """ Entries of a shadow(5) file, empty fields are None """
+    for source, line_number, (name, encrypted_password, *days, _) in _fields(lines, 9, source):
+        yield ShadowEntry(name, encrypted_password, *(_number(value, source, line_number) for value in days))
+
+
+def _field(value) -> str:
+    return "" if value is None else str(value)
+
+
+def passwd_line(user: Dict) -> str:
+    """ Line of a passwd file from a user formatted as json, the reverse of parse_passwd """
+    return "{name}:x:{uid}:{gid}:{gecos}:{dir}:{shell}\n".format(
+        name=user[JsonAttributeUser.name],
+        uid=user[JsonAttributeUser.uid],
+        gid=user[JsonAttributeUser.gid],
+        gecos=_field(user[JsonAttributeUser.gecos]),
+        dir=user[JsonAttributeUser.dir],
+        shell=user[JsonAttributeUser.shell]
+    )
+
+
+def group_line(group: Dict) -> str:
+    return "{name}:x:{gid}:{members}\n".format(
+        name=group[JsonAttributeGroup.name],
+        gid=group[JsonAttributeGroup.gid],
+        members=",".join(group[JsonAttributeGroup.members])
+    )
+
+
+def shadow_line(password: Dict) -> str:
+    return "{name}:{password}:{last_change}:{min}:{max}:{warn}:{inactive}:{expire}:\n".format(
+        name=password[JsonAttributePassword.name],
+        password=password[JsonAttributePassword.password],
+        last_change=_field(password[JsonAttributePassword.last_change]),
+        min=_field(password[JsonAttributePassword.days_min]),
+        max=_field(password[JsonAttributePassword.days_max]),
+        warn=_field(password[JsonAttributePassword.days_warn]),
+        inactive=_field(password[JsonAttributePassword.days_inactive]),
+        expire=_field(password[JsonAttributePassword.expire])
+    )
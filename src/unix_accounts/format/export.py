@@ -0,0 +1,36 @@
+from itertools import chain
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    TextIO
+)
+import csv
+
+
+class ExportFormat:
+    JSONL, CSV, ETC = "jsonl", "csv", "etc"
+
+
+def write_jsonl(output: TextIO, rows: Iterable[Dict], encode: Callable[[Any], bytes]):
+    """ One json object per line """
+    output.writelines(encode(row).decode("utf-8") + "\n" for row in rows)
+
+
+def write_csv(output: TextIO, rows: Iterable[Dict]):
+    """ Header with the attribute names of the first row, lists such as group members are comma separated """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    writer = csv.writer(output)
+    writer.writerow(first.keys())
+    writer.writerows(
+        [",".join(value) if isinstance(value, tuple) else value for value in row.values()]
+        for row in chain((first,), rows)
+    )
+
+
+def write_lines(output: TextIO, rows: Iterable[Dict], line: Callable[[Dict], str]):
+    output.writelines(line(row) for row in rows)
@@ -0,0 +1,50 @@
+from typing import (
+    Any,
+    Callable,
+    Tuple
+)
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from error import InternalError
+
+
+class JsonSerializer:
+    ORJSON, STDLIB = "orjson", "stdlib"
+
+
+# Built once, without the check for circular references formatted items can't have:
+_STDLIB_ENCODER = json.JSONEncoder(check_circular=False)
+
+
+def encode_stdlib(value: Any) -> bytes:
+    """ Byte for byte the same as tornado.escape.json_encode, the output is ascii only """
+    return _STDLIB_ENCODER.encode(value).replace("</", "<\\/").encode("ascii")
+
+
+def encode_orjson(value: Any) -> bytes:
+    """ Same values, not the same bytes: no whitespace between items, non-ascii characters as utf-8 and "</" unescaped """
+    return orjson.dumps(value)
+
+
+def available_serializers() -> Tuple[str]:
+    if orjson:
+        return JsonSerializer.ORJSON, JsonSerializer.STDLIB
+    else:
+        return JsonSerializer.STDLIB,
+
+
+def json_serializer(name: str = JsonSerializer.STDLIB) -> Callable[[Any], bytes]:
+    """ Encoder of formatted items and responses to utf-8 bytes, orjson only when selected """
+    if name == JsonSerializer.ORJSON:
+        if not orjson:
+            raise InternalError("Json serializer orjson requires orjson to be installed")
+        return encode_orjson
+    elif name == JsonSerializer.STDLIB:
+        return encode_stdlib
+    else:
+        raise InternalError("Unsupported json serializer {name}".format(name=name))
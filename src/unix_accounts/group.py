@@ -1,12 +1,21 @@
 from typing import Tuple
+import sys
+
+
+def intern_optional(value: str) -> str:
+    return sys.intern(value) if value else value
 
 
 class UnixGroup:
 
+    """ Immutable, without a __dict__ per instance. Names are interned, members are shared with users' names """
+
+    __slots__ = ("_name", "_id", "_members")
+
     def __init__(self, name: str, id_: int, members: Tuple[str] = ()):
-        self._name = name
+        self._name = intern_optional(name)
         self._id = id_
-        self._members = members
+        self._members = tuple(map(intern_optional, members))
 
     @property
     def name(self) -> str:
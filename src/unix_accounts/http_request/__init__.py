@@ -1,9 +1,17 @@
 from .group import HttpRequestGroup
+from .metrics import HttpRequestMetrics
 from .password import HttpRequestPassword
 from .user import HttpRequestUser
+from .request_metrics import RequestMetrics
+from .response_cache import ResponseCache
+from .storage_executor import StorageExecutor
 
 __all__ = [
     "HttpRequestGroup",
+    "HttpRequestMetrics",
     "HttpRequestPassword",
-    "HttpRequestUser"
+    "HttpRequestUser",
+    "RequestMetrics",
+    "ResponseCache",
+    "StorageExecutor"
 ]
@@ -0,0 +1,62 @@
+from typing import (
+    Optional,
+    Tuple
+)
+import gzip
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class ContentEncoding:
+    GZIP, ZSTD = "gzip", "zstd"
+
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def available_encodings() -> Tuple[str]:
+    """ Supported encodings, in order of preference """
+    if zstandard:
+        return ContentEncoding.ZSTD, ContentEncoding.GZIP
+    else:
+        return ContentEncoding.GZIP,
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == ContentEncoding.GZIP:
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    elif encoding == ContentEncoding.ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    else:
+        raise ValueError("Unsupported content encoding {encoding}".format(encoding=encoding))
+
+
+def _parse_accept_encoding(accept_encoding: str):
+    for item in accept_encoding.split(","):
+        encoding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        yield encoding.strip().lower(), quality
+
+
+def negotiate(accept_encoding: str, available: Tuple[str] = None) -> Optional[str]:
+    """ Best of available encodings accepted by the client, None if identity shall be used """
+    if not accept_encoding:
+        return None
+    accepted = dict(_parse_accept_encoding(accept_encoding))
+    best, best_quality = None, 0.0
+    for encoding in available or available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
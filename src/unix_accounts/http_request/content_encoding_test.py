@@ -0,0 +1,38 @@
+import gzip
+import unittest
+
+from .content_encoding import (
+    ContentEncoding,
+    compress,
+    negotiate
+)
+
+AVAILABLE = (ContentEncoding.ZSTD, ContentEncoding.GZIP)
+
+
+class ContentEncodingTest(unittest.TestCase):
+
+    def test_no_accept_encoding(self):
+        self.assertIsNone(negotiate("", AVAILABLE))
+
+    def test_unsupported_encoding(self):
+        self.assertIsNone(negotiate("br, deflate", AVAILABLE))
+
+    def test_gzip(self):
+        self.assertEqual(ContentEncoding.GZIP, negotiate("gzip, deflate", AVAILABLE))
+
+    def test_prefer_server_order_on_equal_quality(self):
+        self.assertEqual(ContentEncoding.ZSTD, negotiate("gzip, zstd", AVAILABLE))
+
+    def test_prefer_client_quality(self):
+        self.assertEqual(ContentEncoding.GZIP, negotiate("gzip;q=1.0, zstd;q=0.5", AVAILABLE))
+
+    def test_refused_encoding(self):
+        self.assertIsNone(negotiate("gzip;q=0", AVAILABLE))
+
+    def test_wildcard(self):
+        self.assertEqual(ContentEncoding.GZIP, negotiate("*", (ContentEncoding.GZIP,)))
+
+    def test_gzip_roundtrip(self):
+        body = b"{\"all\": []}"
+        self.assertEqual(body, gzip.decompress(compress(body, ContentEncoding.GZIP)))
@@ -1,58 +1,94 @@
-from typing import List, Dict
-import tornado.web
+from typing import Any, Callable, List, Dict, Union
 
-from storage import UnixGroupStorage
+from storage import (
+    UnixGroupStorage,
+    UnixGroupStorageAsync
+)
+from storage.page import GROUP_PAGE_KEYS
 from format import (
     JsonFormatterGroup,
 )
 
 from error import DoesNotExist
+from .request_metrics import RequestMetrics
+from .response_cache import ResponseCache
+from .storage_executor import StorageExecutor
+from .storage_handler import (
+    InvalidArgument,
+    PageParameter,
+    StorageRequestHandler
+)
 
 
 class Parameter(object):
     """ Valid parameters in http requests """
     USER_NAME = "name"
     USER_ID = "id"
+    MEMBER = "member"
+
 
+class HttpRequestGroup(StorageRequestHandler):
 
-class HttpRequestGroup(tornado.web.RequestHandler):
+    PAGE_KEYS = GROUP_PAGE_KEYS
 
-    def initialize(self, group_storage: UnixGroupStorage):
+    def initialize(self, group_storage: Union[UnixGroupStorage, UnixGroupStorageAsync], storage_executor: StorageExecutor = None, response_cache: ResponseCache = None, request_metrics: RequestMetrics = None, json_serializer: Callable[[Any], bytes] = None):
+        super().initialize(storage_executor, response_cache, request_metrics, json_serializer)
         self._group_storage = group_storage
 
-    def get(self):
+    async def post(self):
+        """ Batch lookup with keys in a json body """
+        await self.get()
+
+    async def get(self):
         try:
-            self._try_get()
+            await self._try_get()
         except DoesNotExist as err:
             self.set_status(404, str(err))
+        except InvalidArgument as err:
+            self.set_status(400, str(err))
         except ValueError as err:
             self.set_status(400, "user id is not a valid number")
 
-    def _try_get(self):
-        if Parameter.USER_ID in self.request.arguments:
-            self.write(self._get_by_id(
-                int(self.get_argument(Parameter.USER_ID))
-            ))
+    async def _try_get(self):
+        if self._is_batch(Parameter.USER_ID, Parameter.USER_NAME):
+            self._write_json(await self._get_many())
+        elif Parameter.USER_ID in self.request.arguments:
+            id_ = int(self.get_argument(Parameter.USER_ID))
+            await self._write_lookup((Parameter.USER_ID, id_), self._get_by_id, id_)
         elif Parameter.USER_NAME in self.request.arguments:
-            self.write(self._get_by_name(
-                self.get_argument(Parameter.USER_NAME)
-            ))
+            name = self.get_argument(Parameter.USER_NAME)
+            await self._write_lookup((Parameter.USER_NAME, name), self._get_by_name, name)
+        elif Parameter.MEMBER in self.request.arguments:
+            member = self.get_argument(Parameter.MEMBER)
+            await self._write_lookup((Parameter.MEMBER, member), self._get_by_member, member)
+        elif PageParameter.LIMIT in self.request.arguments:
+            await self._write_page(self._group_storage.get_page, JsonFormatterGroup)
         elif not self.request.arguments:
-            self.write(self._get_all())
+            await self._write_all(self._group_storage.iter_all, JsonFormatterGroup)
         else:
             self.set_status(400)
 
-    def _get_all(self) -> Dict:
+    async def _get_by_id(self, gid: int) -> Dict:
+        return JsonFormatterGroup(
+            await self._storage_call(self._group_storage.get_by_id, gid)
+        )
+
+    async def _get_by_member(self, user: str) -> Dict:
+        groups = await self._storage_call(self._group_storage.get_by_member, user)
         return {
-            "all": list(JsonFormatterGroup(grp) for grp in self._group_storage.get_all())
+            "all": list(JsonFormatterGroup(grp) for grp in groups)
         }
 
-    def _get_by_id(self, gid: int) -> Dict:
-        return JsonFormatterGroup(
-            self._group_storage.get_by_id(gid)
-        )
+    async def _get_many(self) -> Dict:
+        names = self._batch_keys(Parameter.USER_NAME)
+        ids = self._batch_keys(Parameter.USER_ID, int)
+        groups = await self._storage_call(self._group_storage.get_many, names, ids)
+        return self._batch_response(groups, JsonFormatterGroup, {
+            Parameter.USER_NAME: (names, {group.name for group in groups}),
+            Parameter.USER_ID: (ids, {group.id for group in groups})
+        })
 
-    def _get_by_name(self, name: str)-> Dict:
+    async def _get_by_name(self, name: str)-> Dict:
         return JsonFormatterGroup(
-            self._group_storage.get_by_name(name)
+            await self._storage_call(self._group_storage.get_by_name, name)
         )
@@ -7,11 +7,16 @@ from unittest.mock import Mock
 from error import DoesNotExist
 from format import JsonAttributeGroup
 from group import UnixGroup
+from .storage_executor import StorageExecutor
+from .storage_handler import PageParameter
 from .group import (
     HttpRequestGroup,
     Parameter,
 )
-from storage import UnixGroupStorage
+from storage import (
+    PageOrder,
+    UnixGroupStorage
+)
 
 
 class Defaults:
@@ -47,7 +52,7 @@ class GroupsTest(AsyncHTTPTestCase):
             ])
 
     def test_get_all_groups(self):
-        self._mocks.storage.get_all.return_value = [
+        self._mocks.storage.iter_all.return_value = [
             Defaults.unix_group,
             Defaults.unix_group
         ]
@@ -58,13 +63,46 @@ class GroupsTest(AsyncHTTPTestCase):
         self.assertEqual(len(decoded_response["all"]), 2, "Expects to return two groups")
 
     def test_get_all_groups_when_non_existing(self):
-        self._mocks.storage.get_all.return_value = []
+        self._mocks.storage.iter_all.return_value = []
         response = self.fetch(self.API_ENDPOINT, method="GET")
         decoded_response = tornado.escape.json_decode(response.body)
         self.assertEqual(200, response.code)
         self.assertIn("all", decoded_response)
         self.assertEqual(len(decoded_response["all"]), 0, "Expects to return empty list")
 
+    def test_get_page_by_id(self):
+        self._mocks.storage.get_page.return_value = [Defaults.unix_group]
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            PageParameter.LIMIT: "1",
+            PageParameter.ORDER: PageOrder.ID
+        })
+        response = self.fetch(url, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual(Defaults.unix_group.id, decoded_response["next"])
+        self._mocks.storage.get_page.assert_called_once_with(1, None, PageOrder.ID)
+
+    def test_get_many(self):
+        self._mocks.storage.get_many.return_value = [Defaults.unix_group]
+        url = "{endpoint}?id={gid}&id=123".format(endpoint=self.API_ENDPOINT, gid=Defaults.unix_group.id)
+        response = self.fetch(url, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual(Defaults.unix_group.name, decoded_response["all"][0][JsonAttributeGroup.name])
+        self.assertEqual([123], decoded_response["missing"][Parameter.USER_ID])
+
+    def test_get_by_member(self):
+        self._mocks.storage.get_by_member.return_value = [Defaults.unix_group]
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            Parameter.MEMBER: "first-user"
+        })
+        response = self.fetch(url, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual(1, len(decoded_response["all"]))
+        self._assert_attributes(decoded_response["all"][0])
+        self._mocks.storage.get_by_member.assert_called_once_with("first-user")
+
     def test_get_group_by_invalid_id(self):
         url = tornado.httputil.url_concat(self.API_ENDPOINT, {
             Parameter.USER_ID: "nan"
@@ -120,3 +158,22 @@ class GroupsTest(AsyncHTTPTestCase):
         })
         response = self.fetch(url, method="GET")
         self.assertEqual(404, response.code)
+
+
+class GroupsTestWithStorageExecutor(GroupsTest):
+
+    """ Same tests as above, with storage lookups run in a thread pool """
+
+    def setUp(self):
+        self._executor = StorageExecutor(max_workers=2)
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        self._executor.shutdown()
+
+    def get_app(self):
+        return tornado.web.Application(
+            handlers=[
+                (self.API_ENDPOINT, HttpRequestGroup, dict(group_storage=self._mocks.storage, storage_executor=self._executor)),
+            ])
@@ -0,0 +1,13 @@
+import tornado.web
+
+from .request_metrics import RequestMetrics
+
+
+class HttpRequestMetrics(tornado.web.RequestHandler):
+
+    def initialize(self, request_metrics: RequestMetrics):
+        self._request_metrics = request_metrics
+
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(self._request_metrics.render())
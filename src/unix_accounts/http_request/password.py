@@ -1,13 +1,24 @@
-from typing import Dict, FrozenSet
-import tornado.web
+from typing import Any, Callable, Dict, FrozenSet, Union
 import re
 
-from storage import UnixPasswordStorage
+from storage import (
+    UnixPasswordStorage,
+    UnixPasswordStorageAsync
+)
+from storage.page import PASSWORD_PAGE_KEYS
 from format import (
     JsonFormatterPassword,
 )
 
 from error import DoesNotExist
+from .request_metrics import RequestMetrics
+from .response_cache import ResponseCache
+from .storage_executor import StorageExecutor
+from .storage_handler import (
+    InvalidArgument,
+    PageParameter,
+    StorageRequestHandler
+)
 
 
 class Parameter(object):
@@ -15,30 +26,45 @@ class Parameter(object):
     USER_NAME = "name"
 
 
-class HttpRequestPassword(tornado.web.RequestHandler):
+class HttpRequestPassword(StorageRequestHandler):
+
+    PAGE_KEYS = PASSWORD_PAGE_KEYS
 
-    def initialize(self, password_storage: UnixPasswordStorage, auth_tokens: FrozenSet):
+    # Must not be stored by shared caches
+    CACHE_CONTROL_PREFIX = "private, "
+
+    def initialize(self, password_storage: Union[UnixPasswordStorage, UnixPasswordStorageAsync], auth_tokens: FrozenSet, storage_executor: StorageExecutor = None, response_cache: ResponseCache = None, request_metrics: RequestMetrics = None, json_serializer: Callable[[Any], bytes] = None):
+        super().initialize(storage_executor, response_cache, request_metrics, json_serializer)
         self._password_storage = password_storage
         self._auth_tokens = auth_tokens
 
-    def get(self):
+    async def post(self):
+        """ Batch lookup with keys in a json body """
+        await self.get()
+
+    async def get(self):
         try:
-            self._try_get()
+            await self._try_get()
         except DoesNotExist as err:
             self.set_status(404, str(err))
+        except InvalidArgument as err:
+            self.set_status(400, str(err))
         except ValueError as err:
             self.set_status(400, "user id is not a valid number")
 
-    def _try_get(self):
+    async def _try_get(self):
         bearer_token = self._get_bearer_token()
         if not bearer_token or bearer_token not in self._auth_tokens:
             self.set_status(401, "Bearer token unauthorized")
+        elif self._is_batch(Parameter.USER_NAME):
+            self._write_json(await self._get_many())
         elif Parameter.USER_NAME in self.request.arguments:
-            self.write(self._get_by_name(
-                self.get_argument(Parameter.USER_NAME)
-            ))
+            name = self.get_argument(Parameter.USER_NAME)
+            await self._write_lookup((Parameter.USER_NAME, name), self._get_by_name, name)
+        elif PageParameter.LIMIT in self.request.arguments:
+            await self._write_page(self._password_storage.get_page, JsonFormatterPassword)
         elif not self.request.arguments:
-            self.write(self._get_all())
+            await self._write_all(self._password_storage.iter_all, JsonFormatterPassword)
         else:
             self.set_status(400)
 
@@ -51,12 +77,14 @@ class HttpRequestPassword(tornado.web.RequestHandler):
                 token = match.group(1)
         return token
 
-    def _get_all(self) -> Dict:
-        return {
-            "all": list(JsonFormatterPassword(grp) for grp in self._password_storage.get_all())
-        }
+    async def _get_many(self) -> Dict:
+        names = self._batch_keys(Parameter.USER_NAME)
+        passwords = await self._storage_call(self._password_storage.get_many, names)
+        return self._batch_response(passwords, JsonFormatterPassword, {
+            Parameter.USER_NAME: (names, {password.name for password in passwords})
+        })
 
-    def _get_by_name(self, name: str)-> Dict:
+    async def _get_by_name(self, name: str)-> Dict:
         return JsonFormatterPassword(
-            self._password_storage.get_by_name(name)
+            await self._storage_call(self._password_storage.get_by_name, name)
         )
@@ -8,11 +8,16 @@ from unittest.mock import Mock
 from error import DoesNotExist
 from format import JsonAttributePassword
 from password import UnixPassword
+from .storage_executor import StorageExecutor
+from .storage_handler import PageParameter
 from .password import (
     HttpRequestPassword,
     Parameter,
 )
-from storage import UnixPasswordStorage
+from storage import (
+    PageOrder,
+    UnixPasswordStorage
+)
 
 
 class Defaults:
@@ -61,7 +66,7 @@ class PasswordsTest(AsyncHTTPTestCase):
             ])
 
     def test_get_all_passwords(self):
-        self._mocks.storage.get_all.return_value = [
+        self._mocks.storage.iter_all.return_value = [
             Defaults.unix_password,
             Defaults.unix_password
         ]
@@ -72,7 +77,7 @@ class PasswordsTest(AsyncHTTPTestCase):
         self.assertEqual(len(decoded_response["all"]), 2, "Expects to return two passwords")
 
     def test_get_all_passwords_when_non_existing(self):
-        self._mocks.storage.get_all.return_value = []
+        self._mocks.storage.iter_all.return_value = []
         response = self.fetch(self.API_ENDPOINT, headers=default_headers())
         decoded_response = tornado.escape.json_decode(response.body)
         self.assertEqual(200, response.code)
@@ -86,6 +91,39 @@ class PasswordsTest(AsyncHTTPTestCase):
         response = self.fetch(url, headers=default_headers())
         self.assertEqual(400, response.code)
 
+    def test_get_page(self):
+        self._mocks.storage.get_page.return_value = []
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            PageParameter.LIMIT: "10",
+            PageParameter.AFTER: "user"
+        })
+        response = self.fetch(url, headers=default_headers())
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual({"all": [], "next": None}, decoded_response)
+
+    def test_get_page_by_id_not_supported(self):
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            PageParameter.LIMIT: "10",
+            PageParameter.ORDER: PageOrder.ID
+        })
+        response = self.fetch(url, headers=default_headers())
+        self.assertEqual(400, response.code)
+
+    def test_get_many(self):
+        self._mocks.storage.get_many.return_value = []
+        body = tornado.escape.json_encode({Parameter.USER_NAME: ["user"]})
+        response = self.fetch(self.API_ENDPOINT, method="POST", body=body, headers=default_headers())
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual({"all": [], "missing": {Parameter.USER_NAME: ["user"]}}, decoded_response)
+
+    def test_get_many_unauthorized(self):
+        body = tornado.escape.json_encode({Parameter.USER_NAME: ["user"]})
+        response = self.fetch(self.API_ENDPOINT, method="POST", body=body)
+        self.assertEqual(401, response.code)
+        self._mocks.storage.get_many.assert_not_called()
+
     def test_get_password_by_name(self):
         self._mocks.storage.get_by_name.return_value = Defaults.unix_password
         url = tornado.httputil.url_concat(self.API_ENDPOINT, {
@@ -127,6 +165,26 @@ class PasswordsTest(AsyncHTTPTestCase):
         self.assertEqual(401, response.code)
 
     def test_authorized_bearer_token(self):
-        self._mocks.storage.get_all.return_value = []
+        self._mocks.storage.iter_all.return_value = []
         response = self.fetch(self.API_ENDPOINT, headers=default_headers())
         self.assertEqual(200, response.code)
+
+
+class PasswordsTestWithStorageExecutor(PasswordsTest):
+
+    """ Same tests as above, with storage lookups run in a thread pool """
+
+    def setUp(self):
+        self._executor = StorageExecutor(max_workers=2)
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        self._executor.shutdown()
+
+    def get_app(self):
+        return tornado.web.Application(
+            handlers=[
+                (self.API_ENDPOINT, HttpRequestPassword, dict(password_storage=self._mocks.storage, auth_tokens={
+                    Defaults.auth_token}, storage_executor=self._executor)),
+            ])
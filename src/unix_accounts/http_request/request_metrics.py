@@ -0,0 +1,145 @@
+from bisect import bisect_left
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Tuple
+)
+
+from .storage_executor import StorageExecutor
+
+# Upper bounds in seconds, from dict lookups to slow database scans
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = "unix_accounts_"
+
+
+class Histogram:
+
+    """ Bucket counts are allocated once, an observation is a binary search and two additions """
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float):
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._sum += value
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """ Upper bound label and count of observations less or equal to it """
+        total = 0
+        for bound, count in zip(self._bounds, self._counts):
+            total += count
+            yield repr(bound), total
+        yield "+Inf", total + self._counts[-1]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple) -> str:
+    return ",".join("{name}=\"{value}\"".format(name=name, value=_escape(value)) for name, value in zip(names, values))
+
+
+def _render_histograms(name: str, help_: str, label_names: Tuple[str, ...], histograms: Dict[Tuple, Histogram]) -> List[str]:
+    lines = [
+        "# HELP {name} {help}".format(name=name, help=help_),
+        "# TYPE {name} histogram".format(name=name)
+    ]
+    for label_values, histogram in sorted(histograms.items()):
+        labels = _labels(label_names, label_values)
+        for bound, count in histogram.cumulative():
+            lines.append("{name}_bucket{{{labels},le=\"{bound}\"}} {count}".format(name=name, labels=labels, bound=bound, count=count))
+        lines.append("{name}_sum{{{labels}}} {sum!r}".format(name=name, labels=labels, sum=histogram.sum))
+        lines.append("{name}_count{{{labels}}} {count}".format(name=name, labels=labels, count=histogram.count))
+    return lines
+
+
+def _render_counters(name: str, help_: str, label_names: Tuple[str, ...], counters: Dict[Tuple, float], type_: str = "counter") -> List[str]:
+    lines = [
+        "# HELP {name} {help}".format(name=name, help=help_),
+        "# TYPE {name} {type}".format(name=name, type=type_)
+    ]
+    for label_values, value in sorted(counters.items()):
+        labels = _labels(label_names, label_values)
+        lines.append("{name}{{{labels}}} {value!r}".format(name=name, labels=labels, value=value) if labels else "{name} {value!r}".format(name=name, value=value))
+    return lines
+
+
+class RequestMetrics:
+
+    """ Request and storage call metrics of this process, in the Prometheus text format
+
+    Only updated from the IOLoop thread, no locking is needed.
+    """
+
+    def __init__(self, storage_executor: StorageExecutor = None, statement_stats: Callable[[], Dict] = None):
+        """ statement_stats returns statement to (count, time_total, time_max) """
+        self._storage_executor = storage_executor
+        self._statement_stats = statement_stats
+        self._in_flight = 0
+        self._requests = {}
+        self._request_durations = {}
+        self._storage_call_durations = {}
+
+    def request_started(self):
+        self._in_flight += 1
+
+    def request_finished(self, route: str, lookup: str, code: int, duration: float, started: bool = True):
+        """ started is False for requests rejected without request_started, such as with an unsupported method """
+        if started:
+            self._in_flight -= 1
+        key = (route, lookup, code)
+        self._requests[key] = self._requests.get(key, 0) + 1
+        histogram = self._request_durations.get((route, lookup))
+        if histogram is None:
+            histogram = self._request_durations[(route, lookup)] = Histogram()
+        histogram.observe(duration)
+
+    def storage_call(self, call: str, duration: float):
+        histogram = self._storage_call_durations.get((call,))
+        if histogram is None:
+            histogram = self._storage_call_durations[(call,)] = Histogram()
+        histogram.observe(duration)
+
+    def render(self) -> str:
+        lines = []
+        lines += _render_counters(PREFIX + "requests_total", "Requests by route, lookup kind and status code.", ("route", "lookup", "code"), self._requests)
+        lines += _render_counters(PREFIX + "requests_in_flight", "Requests being served.", (), {(): self._in_flight}, "gauge")
+        lines += _render_histograms(PREFIX + "request_duration_seconds", "Request latency by route and lookup kind.", ("route", "lookup"), self._request_durations)
+        lines += _render_histograms(PREFIX + "storage_call_duration_seconds", "Storage call latency, including wait for a storage thread.", ("call",), self._storage_call_durations)
+        if self._storage_executor:
+            lines += self._render_storage_executor()
+        if self._statement_stats:
+            lines += self._render_statements()
+        return "\n".join(lines) + "\n"
+
+    def _render_storage_executor(self) -> List[str]:
+        stats = self._storage_executor.stats()
+        lines = []
+        lines += _render_counters(PREFIX + "storage_threads_queue_depth", "Storage calls waiting for a thread.", (), {(): stats.queue_depth}, "gauge")
+        lines += _render_counters(PREFIX + "storage_threads_active", "Storage calls running.", (), {(): stats.active}, "gauge")
+        lines += _render_counters(PREFIX + "storage_threads_completed_total", "Storage calls completed.", (), {(): stats.completed})
+        lines += _render_counters(PREFIX + "storage_threads_wait_seconds_total", "Time storage calls waited for a thread.", (), {(): stats.wait_time_total})
+        lines += _render_counters(PREFIX + "storage_threads_run_seconds_total", "Time storage calls ran in a thread.", (), {(): stats.run_time_total})
+        return lines
+
+    def _render_statements(self) -> List[str]:
+        stats = self._statement_stats()
+        lines = []
+        lines += _render_counters(PREFIX + "statements_total", "Database statements executed.", ("statement",), {(statement,): count for statement, (count, _, _) in stats.items()})
+        lines += _render_counters(PREFIX + "statement_seconds_total", "Time spent executing database statements.", ("statement",), {(statement,): time_total for statement, (_, time_total, _) in stats.items()})
+        lines += _render_counters(PREFIX + "statement_seconds_max", "Slowest execution of database statements.", ("statement",), {(statement,): time_max for statement, (_, _, time_max) in stats.items()}, "gauge")
+        return lines
@@ -0,0 +1,64 @@
+import unittest
+
+from .request_metrics import (
+    Histogram,
+    RequestMetrics
+)
+from .storage_executor import StorageExecutor
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_cumulative_buckets(self):
+        histogram = Histogram(bounds=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        self.assertEqual([("0.1", 2), ("1.0", 3), ("+Inf", 4)], list(histogram.cumulative()))
+        self.assertEqual(4, histogram.count)
+        self.assertAlmostEqual(2.65, histogram.sum)
+
+
+class RequestMetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = RequestMetrics()
+
+    def test_request(self):
+        self.metrics.request_started()
+        self.assertIn("unix_accounts_requests_in_flight 1\n", self.metrics.render())
+        self.metrics.request_finished("/api/user", "name", 200, 0.002)
+        rendered = self.metrics.render()
+        self.assertIn("unix_accounts_requests_in_flight 0\n", rendered)
+        self.assertIn("unix_accounts_requests_total{route=\"/api/user\",lookup=\"name\",code=\"200\"} 1\n", rendered)
+        self.assertIn("unix_accounts_request_duration_seconds_bucket{route=\"/api/user\",lookup=\"name\",le=\"0.001\"} 0\n", rendered)
+        self.assertIn("unix_accounts_request_duration_seconds_bucket{route=\"/api/user\",lookup=\"name\",le=\"0.0025\"} 1\n", rendered)
+        self.assertIn("unix_accounts_request_duration_seconds_count{route=\"/api/user\",lookup=\"name\"} 1\n", rendered)
+
+    def test_request_finished_without_start(self):
+        self.metrics.request_finished("/api/user", "none", 405, 0.001, started=False)
+        rendered = self.metrics.render()
+        self.assertIn("unix_accounts_requests_in_flight 0\n", rendered)
+        self.assertIn("unix_accounts_requests_total{route=\"/api/user\",lookup=\"none\",code=\"405\"} 1\n", rendered)
+
+    def test_storage_call(self):
+        self.metrics.storage_call("UnixUserStorageSqlite.get_by_name", 0.5)
+        self.assertIn("unix_accounts_storage_call_duration_seconds_sum{call=\"UnixUserStorageSqlite.get_by_name\"} 0.5\n", self.metrics.render())
+
+    def test_label_values_are_escaped(self):
+        self.metrics.request_started()
+        self.metrics.request_finished("/api/\"user\"", "none", 400, 0.001)
+        self.assertIn("route=\"/api/\\\"user\\\"\"", self.metrics.render())
+
+    def test_storage_executor(self):
+        executor = StorageExecutor(max_workers=1)
+        try:
+            rendered = RequestMetrics(executor).render()
+            self.assertIn("unix_accounts_storage_threads_queue_depth 0\n", rendered)
+        finally:
+            executor.shutdown()
+
+    def test_statements(self):
+        metrics = RequestMetrics(statement_stats=lambda: {"SELECT \"user\".name FROM \"user\"": (2, 0.5, 0.3)})
+        rendered = metrics.render()
+        self.assertIn("unix_accounts_statements_total{statement=\"SELECT \\\"user\\\".name FROM \\\"user\\\"\"} 2\n", rendered)
+        self.assertIn("unix_accounts_statement_seconds_max{statement=\"SELECT \\\"user\\\".name FROM \\\"user\\\"\"} 0.3\n", rendered)
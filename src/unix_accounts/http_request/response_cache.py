@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from typing import (
+    Hashable,
+    Optional,
+    Tuple
+)
+import hashlib
+
+from storage import DirectoryGeneration
+
+from .content_encoding import compress
+
+
+class CachedResponse:
+
+    def __init__(self, body: bytes):
+        self._body = body
+        self._digest = hashlib.sha1(body).hexdigest()
+        self._etag = "\"{digest}\"".format(digest=self._digest)
+        self._encoded = {}
+
+    @property
+    def body(self) -> bytes:
+        return self._body
+
+    @property
+    def etag(self) -> str:
+        return self._etag
+
+    def encoded(self, encoding: str) -> Tuple[bytes, str]:
+        """ Compressed body and its etag, compressed once on first use """
+        if encoding not in self._encoded:
+            self._encoded[encoding] = (
+                compress(self._body, encoding),
+                "\"{digest}-{encoding}\"".format(digest=self._digest, encoding=encoding)
+            )
+        return self._encoded[encoding]
+
+
+class ResponseCache:
+
+    """ Encoded response bodies, valid for one directory generation
+
+    Entries are evicted least recently used when full, and all at once when the generation changes.
+    Not thread safe, intended to be used from the IOLoop only.
+    """
+
+    def __init__(self, generation: DirectoryGeneration, max_age: int = 0, max_entries: int = 10000):
+        self._generation = generation
+        self._max_age = max_age
+        self._max_entries = max_entries
+        self._entries_generation = None
+        self._entries = OrderedDict()
+
+    @property
+    def generation(self) -> DirectoryGeneration:
+        return self._generation
+
+    @property
+    def cache_control(self) -> str:
+        if self._max_age > 0:
+            return "max-age={max_age}".format(max_age=self._max_age)
+        else:
+            return "no-cache"
+
+    def get(self, generation: int, key: Hashable) -> Optional[CachedResponse]:
+        if generation != self._entries_generation:
+            self._entries.clear()
+            self._entries_generation = generation
+            return None
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    def put(self, generation: int, key: Hashable, body: bytes) -> CachedResponse:
+        response = CachedResponse(body)
+        if generation == self._entries_generation:
+            self._entries[key] = response
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return response
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import Mock
+
+from storage import DirectoryGeneration
+
+from .response_cache import ResponseCache
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(Mock(spec=DirectoryGeneration), max_entries=2)
+
+    def test_miss_on_empty_cache(self):
+        self.assertIsNone(self.cache.get(1, "key"))
+
+    def test_hit_on_same_generation(self):
+        self.cache.get(1, "key")
+        put = self.cache.put(1, "key", b"{}")
+        self.assertIs(put, self.cache.get(1, "key"))
+
+    def test_miss_on_new_generation(self):
+        self.cache.get(1, "key")
+        self.cache.put(1, "key", b"{}")
+        self.assertIsNone(self.cache.get(2, "key"))
+
+    def test_put_with_outdated_generation_is_not_cached(self):
+        self.cache.get(2, "key")
+        self.cache.put(1, "key", b"{}")
+        self.assertIsNone(self.cache.get(2, "key"))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.get(1, "first")
+        self.cache.put(1, "first", b"1")
+        self.cache.put(1, "second", b"2")
+        self.cache.get(1, "first")
+        self.cache.put(1, "third", b"3")
+        self.assertIsNone(self.cache.get(1, "second"))
+        self.assertIsNotNone(self.cache.get(1, "first"))
+
+    def test_etag_from_content(self):
+        self.assertEqual(self.cache.put(1, "a", b"{}").etag, self.cache.put(1, "b", b"{}").etag)
+        self.assertNotEqual(self.cache.put(1, "a", b"{}").etag, self.cache.put(1, "b", b"[]").etag)
+
+    def test_cache_control(self):
+        self.assertEqual("no-cache", self.cache.cache_control)
+        self.assertEqual("max-age=60", ResponseCache(Mock(spec=DirectoryGeneration), max_age=60).cache_control)
@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from typing import (
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple
+)
+import asyncio
+import threading
+import time
+
+import tornado.ioloop
+
+
+def chunked(items: Iterable, chunk_size: int) -> Iterator[List]:
+    items = iter(items)
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, chunk_size))
+
+
+@contextmanager
+def _no_scope():
+    yield
+
+
+class _EndOfStream:
+    pass
+
+
+class StorageExecutorStats(NamedTuple):
+    queue_depth: int
+    active: int
+    completed: int
+    wait_time_total: float
+    wait_time_max: float
+    run_time_total: float
+
+
+class StorageExecutor:
+
+    """ Runs blocking storage calls in a bounded thread pool, off the IOLoop """
+
+    def __init__(self, max_workers: int = 4, call_scope: Callable[[], ContextManager] = _no_scope, max_streams: int = None):
+        """ Each call is run within call_scope(), such as a database session released when the call returns
+
+        A stream holds a worker until consumed, at most max_streams run at once, by default one less than max_workers
+        for other calls not to wait for slow consumers.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+        self._call_scope = call_scope
+        self._max_streams = max_streams or max(1, max_workers - 1)
+        # Created in the loop running the streams:
+        self._streams = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+        self._run_time_total = 0.0
+
+    async def run(self, fn: Callable, *args):
+        submitted = time.monotonic()
+        with self._lock:
+            self._submitted += 1
+        return await tornado.ioloop.IOLoop.current().run_in_executor(
+            self._executor, self._measured_call, submitted, fn, args)
+
+    async def stream(self, fn: Callable[..., Iterable], *args, chunk_size: int = 1000, max_pending: int = 2) -> AsyncIterator[List]:
+        """ Iterate fn(*args) in one worker thread and yield chunks as they are produced
+
+        At most max_pending chunks are buffered, the worker waits for the consumer to catch up. Streams beyond
+        max_streams wait for one to end before starting.
+        """
+        if self._streams is None:
+            self._streams = asyncio.Semaphore(self._max_streams)
+        async with self._streams:
+            loop = asyncio.get_event_loop()
+            chunks = asyncio.Queue(maxsize=max_pending)
+            cancelled = threading.Event()
+
+            def put(item):
+                asyncio.run_coroutine_threadsafe(chunks.put(item), loop).result()
+
+            def produce():
+                try:
+                    for chunk in chunked(fn(*args), chunk_size):
+                        if cancelled.is_set():
+                            return
+                        put(chunk)
+                    put(_EndOfStream)
+                except Exception as err:
+                    put(err)
+
+            producer = asyncio.ensure_future(self.run(produce))
+            try:
+                while True:
+                    item = await chunks.get()
+                    if item is _EndOfStream:
+                        break
+                    elif isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                cancelled.set()
+                # unblock worker if waiting for space in queue:
+                while not producer.done():
+                    while not chunks.empty():
+                        chunks.get_nowait()
+                    await asyncio.wait([producer], timeout=0.01)
+
+    def _measured_call(self, submitted: float, fn: Callable, args: tuple):
+        started = time.monotonic()
+        self._on_started(started - submitted)
+        try:
+            with self._call_scope():
+                return fn(*args)
+        finally:
+            self._on_completed(time.monotonic() - started)
+
+    def _on_started(self, wait_time: float):
+        with self._lock:
+            self._started += 1
+            self._wait_time_total += wait_time
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+
+    def _on_completed(self, run_time: float):
+        with self._lock:
+            self._completed += 1
+            self._run_time_total += run_time
+
+    def stats(self) -> StorageExecutorStats:
+        with self._lock:
+            return StorageExecutorStats(
+                queue_depth=self._submitted - self._started,
+                active=self._started - self._completed,
+                completed=self._completed,
+                wait_time_total=self._wait_time_total,
+                wait_time_max=self._wait_time_max,
+                run_time_total=self._run_time_total
+            )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
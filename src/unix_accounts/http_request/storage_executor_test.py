@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+from tornado.testing import (
+    AsyncTestCase,
+    gen_test
+)
+import asyncio
+import threading
+
+from .storage_executor import StorageExecutor
+
+
+class StorageExecutorTest(AsyncTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.executor = StorageExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        super().tearDown()
+
+    @gen_test
+    async def test_run_returns_result(self):
+        result = await self.executor.run(lambda a, b: a + b, 1, 2)
+        self.assertEqual(3, result)
+
+    @gen_test
+    async def test_run_off_calling_thread(self):
+        thread = await self.executor.run(threading.current_thread)
+        self.assertIsNot(threading.current_thread(), thread)
+
+    @gen_test
+    async def test_run_propagates_exception(self):
+        def fail():
+            raise ValueError()
+        with self.assertRaises(ValueError):
+            await self.executor.run(fail)
+
+    @gen_test
+    async def test_run_within_call_scope(self):
+        scopes = []
+
+        @contextmanager
+        def call_scope():
+            scopes.append(threading.current_thread())
+            yield
+            scopes.append(threading.current_thread())
+
+        executor = StorageExecutor(max_workers=1, call_scope=call_scope)
+        try:
+            thread = await executor.run(threading.current_thread)
+        finally:
+            executor.shutdown()
+        self.assertEqual([thread, thread], scopes)
+
+    @gen_test
+    async def test_stats_count_completed_calls(self):
+        await self.executor.run(lambda: None)
+        await self.executor.run(lambda: None)
+        stats = self.executor.stats()
+        self.assertEqual(2, stats.completed)
+        self.assertEqual(0, stats.queue_depth)
+        self.assertEqual(0, stats.active)
+
+    @gen_test
+    async def test_stats_queue_depth_when_pool_busy(self):
+        release = threading.Event()
+        calls = [asyncio.ensure_future(self.executor.run(release.wait)) for _ in range(3)]
+        await asyncio.sleep(0)
+        stats = self.executor.stats()
+        self.assertLessEqual(1, stats.queue_depth)
+        self.assertEqual(3, stats.queue_depth + stats.active)
+        release.set()
+        await asyncio.gather(*calls)
+        self.assertEqual(0, self.executor.stats().queue_depth)
+
+    @gen_test
+    async def test_stream_in_chunks(self):
+        chunks = [chunk async for chunk in self.executor.stream(range, 5, chunk_size=2)]
+        self.assertEqual([[0, 1], [2, 3], [4]], chunks)
+
+    @gen_test
+    async def test_stream_propagates_exception(self):
+        def fail():
+            yield 1
+            raise ValueError()
+        with self.assertRaises(ValueError):
+            async for _ in self.executor.stream(fail):
+                pass
+
+    @gen_test
+    async def test_stream_stopped_by_consumer(self):
+        produced = []
+
+        def produce():
+            for item in range(100):
+                produced.append(item)
+                yield item
+        stream = self.executor.stream(produce, chunk_size=1, max_pending=1)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        self.assertEqual(0, self.executor.stats().active)
+        self.assertLess(len(produced), 100)
+
+    @gen_test
+    async def test_streams_leave_a_worker_for_other_calls(self):
+        release = threading.Event()
+
+        def produce():
+            release.wait()
+            yield 1
+        first, second = self.executor.stream(produce), self.executor.stream(produce)
+        reading_first = asyncio.ensure_future(first.__anext__())
+        reading_second = asyncio.ensure_future(second.__anext__())
+        await asyncio.sleep(0.05)
+        self.assertEqual(1, self.executor.stats().active)
+        self.assertEqual(3, await asyncio.wait_for(self.executor.run(lambda: 3), timeout=1))
+        release.set()
+        self.assertEqual([1], await reading_first)
+        self.assertFalse(reading_second.done())
+        await first.aclose()
+        self.assertEqual([1], await asyncio.wait_for(reading_second, timeout=1))
+        await second.aclose()
@@ -0,0 +1,250 @@
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Set,
+    Tuple
+)
+import asyncio
+import time
+import tornado.escape
+import tornado.web
+
+from format import encode_stdlib
+from storage import PageOrder
+
+from .content_encoding import negotiate
+from .request_metrics import RequestMetrics
+from .response_cache import (
+    CachedResponse,
+    ResponseCache
+)
+from .storage_executor import (
+    StorageExecutor,
+    chunked
+)
+
+
+class PageParameter(object):
+    """ Parameters for paged enumeration """
+    LIMIT = "limit"
+    AFTER = "after"
+    ORDER = "order"
+
+
+class InvalidArgument(Exception):
+    pass
+
+
+class StorageRequestHandler(tornado.web.RequestHandler):
+
+    """ Base for handlers doing storage lookups, blocking calls are run in the storage executor when provided """
+
+    CACHE_CONTROL_PREFIX = ""
+    # Smaller responses are not worth compressing
+    COMPRESS_MIN_SIZE = 1024
+    STREAM_CHUNK_SIZE = 1000
+    MAX_PAGE_SIZE = 1000
+    MAX_BATCH_SIZE = 1000
+    # Page order to the cursor of an item, set in subclasses supporting paged enumeration
+    PAGE_KEYS = {}
+
+    def initialize(self, storage_executor: StorageExecutor = None, response_cache: ResponseCache = None, request_metrics: RequestMetrics = None, json_serializer: Callable[[Any], bytes] = None):
+        """ Responses are encoded with json_serializer, by default the same as "self.write(dict)" """
+        self._storage_executor = storage_executor
+        self._response_cache = response_cache
+        self._request_metrics = request_metrics
+        self._encode_json = json_serializer or encode_stdlib
+        self._json_body = None
+        # Label of the lookup in metrics, "none" when rejected before any lookup:
+        self._lookup_kind = "none"
+        # on_finish is called without prepare for requests rejected by tornado:
+        self._prepared = False
+
+    def prepare(self):
+        self._prepared = True
+        if self._request_metrics:
+            self._request_metrics.request_started()
+
+    def on_finish(self):
+        if self._request_metrics:
+            self._request_metrics.request_finished(self.request.path, self._lookup_kind, self.get_status(), self.request.request_time(), self._prepared)
+
+    async def _storage_call(self, fn: Callable, *args):
+        if not self._request_metrics:
+            return await self._unmeasured_storage_call(fn, *args)
+        started = time.perf_counter()
+        try:
+            return await self._unmeasured_storage_call(fn, *args)
+        finally:
+            self._request_metrics.storage_call(fn.__qualname__, time.perf_counter() - started)
+
+    async def _unmeasured_storage_call(self, fn: Callable, *args):
+        if asyncio.iscoroutinefunction(fn):
+            return await fn(*args)
+        elif self._storage_executor:
+            return await self._storage_executor.run(fn, *args)
+        else:
+            return fn(*args)
+
+    async def _storage_chunks(self, fn: Callable, *args) -> AsyncIterator[List]:
+        """ Iterate in chunks over items returned by fn(*args) """
+        started = time.perf_counter()
+        async for chunk in self._unmeasured_storage_chunks(fn, *args):
+            yield chunk
+        if self._request_metrics:
+            self._request_metrics.storage_call(fn.__qualname__, time.perf_counter() - started)
+
+    async def _unmeasured_storage_chunks(self, fn: Callable, *args) -> AsyncIterator[List]:
+        if asyncio.iscoroutinefunction(fn):
+            for chunk in chunked(await fn(*args), self.STREAM_CHUNK_SIZE):
+                yield chunk
+        elif self._storage_executor:
+            async for chunk in self._storage_executor.stream(fn, *args, chunk_size=self.STREAM_CHUNK_SIZE):
+                yield chunk
+        else:
+            for chunk in chunked(fn(*args), self.STREAM_CHUNK_SIZE):
+                yield chunk
+
+    def _write_json(self, value: Any):
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        self.write(self._encode_json(value))
+
+    async def _write_all(self, iter_all: Callable, fmt: Callable[..., Dict]):
+        """ Write {"all": [...]} encoded chunk by chunk, without having all items loaded
+
+        With the response cache the encoded body is cached and written at once, else each chunk is written as encoded.
+        """
+        if self._response_cache:
+            await self._write_lookup("all", self._encode_all, iter_all, fmt, compress=True, encoded=True)
+        else:
+            self._lookup_kind = "all"
+            self.set_header("Content-Type", "application/json; charset=UTF-8")
+            async for part in self._encoded_all(iter_all, fmt):
+                self.write(part)
+                await self.flush()
+
+    async def _encode_all(self, iter_all: Callable, fmt: Callable[..., Dict]) -> bytes:
+        return b"".join([part async for part in self._encoded_all(iter_all, fmt)])
+
+    async def _encoded_all(self, iter_all: Callable, fmt: Callable[..., Dict]) -> AsyncIterator[bytes]:
+        """ Same bytes as {"all": [...]} encoded at once by encode_stdlib """
+        separator = b""
+        yield b"{\"all\": ["
+        async for chunk in self._storage_chunks(iter_all, self.STREAM_CHUNK_SIZE):
+            yield separator + b", ".join(self._encode_json(fmt(item)) for item in chunk)
+            separator = b", "
+        yield b"]}"
+
+    def _page_arguments(self) -> Tuple[int, Any, str]:
+        order = self.get_argument(PageParameter.ORDER, PageOrder.NAME)
+        if order not in self.PAGE_KEYS:
+            raise InvalidArgument("order must be one of: {orders}".format(orders=", ".join(self.PAGE_KEYS)))
+        try:
+            limit = int(self.get_argument(PageParameter.LIMIT))
+            after = self.get_argument(PageParameter.AFTER, None)
+            if after is not None and order == PageOrder.ID:
+                after = int(after)
+        except ValueError:
+            raise InvalidArgument("limit and id are not valid numbers")
+        if limit < 1:
+            raise InvalidArgument("limit must be a positive number")
+        return min(limit, self.MAX_PAGE_SIZE), after, order
+
+    async def _write_page(self, get_page: Callable, fmt: Callable[..., Dict]):
+        """ Write {"all": [...], "next": cursor}, "next" is null on the last page """
+        limit, after, order = self._page_arguments()
+        await self._write_lookup(("page", order, after, limit), self._get_page, get_page, fmt, limit, after, order, compress=True)
+
+    async def _get_page(self, get_page: Callable, fmt: Callable[..., Dict], limit: int, after, order: str) -> Dict:
+        items = await self._storage_call(get_page, limit, after, order)
+        return {
+            "all": [fmt(item) for item in items],
+            "next": self.PAGE_KEYS[order](items[-1]) if len(items) == limit else None
+        }
+
+    def _is_batch(self, *parameters: str) -> bool:
+        """ POST, or any parameter repeated in the query, looks up many keys at once """
+        if self.request.method == "POST" or any(len(self.get_arguments(parameter)) > 1 for parameter in parameters):
+            self._lookup_kind = "batch"
+            return True
+        return False
+
+    def _batch_keys(self, parameter: str, type_: type = str) -> List:
+        """ Keys from repeated query parameters, or from a list in a json body: {"<parameter>": [...]}
+
+        Query parameters are converted to type_, json values must be of type_ already, true is not the id 1.
+        """
+        if self.request.method == "POST":
+            values = self._get_json_body().get(parameter, [])
+            if not isinstance(values, list):
+                raise InvalidArgument("{parameter} must be a list".format(parameter=parameter))
+        else:
+            values = self.get_arguments(parameter)
+        if len(values) > self.MAX_BATCH_SIZE:
+            raise InvalidArgument("at most {size} keys per lookup".format(size=self.MAX_BATCH_SIZE))
+        if self.request.method == "POST":
+            if not all(isinstance(value, type_) and not isinstance(value, bool) for value in values):
+                raise InvalidArgument("{parameter} is not valid".format(parameter=parameter))
+            return list(dict.fromkeys(values))
+        try:
+            return list(dict.fromkeys(type_(value) for value in values))
+        except ValueError:
+            raise InvalidArgument("{parameter} is not valid".format(parameter=parameter))
+
+    def _get_json_body(self) -> Dict:
+        if self._json_body is None:
+            try:
+                self._json_body = tornado.escape.json_decode(self.request.body)
+            except ValueError:
+                raise InvalidArgument("body is not valid json")
+            if not isinstance(self._json_body, dict):
+                raise InvalidArgument("body must be a json object")
+        return self._json_body
+
+    @staticmethod
+    def _batch_response(items: List, fmt: Callable[..., Dict], requested: Dict[str, Tuple[List, Set]]) -> Dict:
+        """ {"all": [...], "missing": {"<parameter>": [...]}}, requested is parameter to (keys, keys found) """
+        return {
+            "all": [fmt(item) for item in items],
+            "missing": {parameter: [key for key in keys if key not in found] for parameter, (keys, found) in requested.items()}
+        }
+
+    async def _write_lookup(self, key: Hashable, lookup: Callable[..., Awaitable], *args, compress: bool = False, encoded: bool = False):
+        """ Write lookup result, already encoded json when encoded, compressed responses are cached too and requires the response cache """
+        self._lookup_kind = key if isinstance(key, str) else key[0]
+        if self._response_cache:
+            await self._write_cached_lookup(key, lookup, *args, compress=compress, encoded=encoded)
+        else:
+            result = await lookup(*args)
+            self.set_header("Content-Type", "application/json; charset=UTF-8")
+            self.write(result if encoded else self._encode_json(result))
+
+    async def _write_cached_lookup(self, key: Hashable, lookup: Callable[..., Awaitable], *args, compress: bool, encoded: bool):
+        generation = await self._storage_call(self._response_cache.generation.get)
+        response = self._response_cache.get(generation, key)
+        if response is None:
+            result = await lookup(*args)
+            body = result if encoded else self._encode_json(result)
+            response = self._response_cache.put(generation, key, body)
+        body, etag = self._negotiate_content_encoding(response) if compress else (response.body, response.etag)
+        self.set_header("Etag", etag)
+        self.set_header("Cache-Control", self.CACHE_CONTROL_PREFIX + self._response_cache.cache_control)
+        if self.check_etag_header():
+            self.set_status(304)
+        else:
+            self.set_header("Content-Type", "application/json; charset=UTF-8")
+            self.write(body)
+
+    def _negotiate_content_encoding(self, response: CachedResponse) -> Tuple[bytes, str]:
+        self.set_header("Vary", "Accept-Encoding")
+        encoding = negotiate(self.request.headers.get("Accept-Encoding", ""))
+        if encoding and len(response.body) >= self.COMPRESS_MIN_SIZE:
+            self.set_header("Content-Encoding", encoding)
+            return response.encoded(encoding)
+        else:
+            return response.body, response.etag
@@ -1,12 +1,23 @@
-from typing import Dict
-import tornado.web
+from typing import Any, Callable, Dict, Union
 
-from storage import UnixUserStorage
+from storage import (
+    UnixUserStorage,
+    UnixUserStorageAsync
+)
+from storage.page import USER_PAGE_KEYS
 from format import (
     JsonFormatterUser,
 )
 
 from error import DoesNotExist
+from .request_metrics import RequestMetrics
+from .response_cache import ResponseCache
+from .storage_executor import StorageExecutor
+from .storage_handler import (
+    InvalidArgument,
+    PageParameter,
+    StorageRequestHandler
+)
 
 
 class Parameter(object):
@@ -15,44 +26,59 @@ class Parameter(object):
     USER_ID = "id"
 
 
-class HttpRequestUser(tornado.web.RequestHandler):
+class HttpRequestUser(StorageRequestHandler):
+
+    PAGE_KEYS = USER_PAGE_KEYS
 
-    def initialize(self, user_storage: UnixUserStorage):
+    def initialize(self, user_storage: Union[UnixUserStorage, UnixUserStorageAsync], storage_executor: StorageExecutor = None, response_cache: ResponseCache = None, request_metrics: RequestMetrics = None, json_serializer: Callable[[Any], bytes] = None):
+        super().initialize(storage_executor, response_cache, request_metrics, json_serializer)
         self._user_storage = user_storage
 
-    def get(self):
+    async def post(self):
+        """ Batch lookup with keys in a json body """
+        await self.get()
+
+    async def get(self):
         try:
-            self._try_get()
+            await self._try_get()
         except DoesNotExist as err:
             self.set_status(404, str(err))
+        except InvalidArgument as err:
+            self.set_status(400, str(err))
         except ValueError as err:
             self.set_status(400, "user id is not a valid number")
 
-    def _try_get(self):
-        if Parameter.USER_ID in self.request.arguments:
-            self.write(self._get_by_id(
-                int(self.get_argument(Parameter.USER_ID))
-            ))
+    async def _try_get(self):
+        if self._is_batch(Parameter.USER_ID, Parameter.USER_NAME):
+            self._write_json(await self._get_many())
+        elif Parameter.USER_ID in self.request.arguments:
+            id_ = int(self.get_argument(Parameter.USER_ID))
+            await self._write_lookup((Parameter.USER_ID, id_), self._get_by_id, id_)
         elif Parameter.USER_NAME in self.request.arguments:
-            self.write(self._get_by_name(
-                self.get_argument(Parameter.USER_NAME)
-            ))
+            name = self.get_argument(Parameter.USER_NAME)
+            await self._write_lookup((Parameter.USER_NAME, name), self._get_by_name, name)
+        elif PageParameter.LIMIT in self.request.arguments:
+            await self._write_page(self._user_storage.get_page, JsonFormatterUser)
         elif not self.request.arguments:
-            self.write(self._get_all())
+            await self._write_all(self._user_storage.iter_all, JsonFormatterUser)
         else:
             self.set_status(400)
 
-    def _get_all(self) -> Dict:
-        return {
-            "all": list(JsonFormatterUser(user) for user in self._user_storage.get_all())
-        }
-
-    def _get_by_id(self, gid: int) -> Dict:
+    async def _get_by_id(self, gid: int) -> Dict:
         return JsonFormatterUser(
-            self._user_storage.get_by_id(gid)
+            await self._storage_call(self._user_storage.get_by_id, gid)
         )
 
-    def _get_by_name(self, name: str)-> Dict:
+    async def _get_many(self) -> Dict:
+        names = self._batch_keys(Parameter.USER_NAME)
+        ids = self._batch_keys(Parameter.USER_ID, int)
+        users = await self._storage_call(self._user_storage.get_many, names, ids)
+        return self._batch_response(users, JsonFormatterUser, {
+            Parameter.USER_NAME: (names, {user.name for user in users}),
+            Parameter.USER_ID: (ids, {user.uid for user in users})
+        })
+
+    async def _get_by_name(self, name: str)-> Dict:
         return JsonFormatterUser(
-            self._user_storage.get_by_name(name)
+            await self._storage_call(self._user_storage.get_by_name, name)
         )
@@ -1,18 +1,36 @@
 from tornado.testing import AsyncHTTPTestCase
+import gzip
+import unittest
 import tornado.web
 import tornado.httputil
 import tornado.escape
 from unittest.mock import Mock
 
 from error import DoesNotExist
-from format import JsonAttributeUser
+from format import (
+    JsonAttributeUser,
+    JsonFormatterUser,
+    JsonSerializer,
+    available_serializers,
+    encode_orjson
+)
 from user import UnixUser
 from group import UnixGroup
+from .metrics import HttpRequestMetrics
+from .request_metrics import RequestMetrics
+from .response_cache import ResponseCache
+from .storage_executor import StorageExecutor
+from .storage_handler import PageParameter
 from .user import (
     HttpRequestUser,
     Parameter,
 )
-from storage import UnixUserStorage
+from storage import (
+    DirectoryGeneration,
+    PageOrder,
+    UnixUserStorage,
+    UnixUserStorageAsync
+)
 
 
 class Defaults:
@@ -56,8 +74,19 @@ class UsersTest(AsyncHTTPTestCase):
                 (self.API_ENDPOINT, HttpRequestUser, dict(user_storage=self._mocks.storage)),
             ])
 
+    def assertSameBody(self, expected, body: bytes):
+        self.assertEqual(tornado.escape.utf8(tornado.escape.json_encode(expected)), body)
+
+    def test_body_same_as_tornado_json_encode(self):
+        self._mocks.storage.get_by_name.return_value = Defaults.unix_user
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            Parameter.USER_NAME: Defaults.unix_user.name
+        })
+        response = self.fetch(url, method="GET")
+        self.assertSameBody(JsonFormatterUser(Defaults.unix_user), response.body)
+
     def test_get_all_users(self):
-        self._mocks.storage.get_all.return_value = [
+        self._mocks.storage.iter_all.return_value = [
             Defaults.unix_user,
             Defaults.unix_user
         ]
@@ -68,13 +97,100 @@ class UsersTest(AsyncHTTPTestCase):
         self.assertEqual(len(decoded_response["all"]), 2, "Expects to return two users")
 
     def test_get_all_users_when_non_existing(self):
-        self._mocks.storage.get_all.return_value = []
+        self._mocks.storage.iter_all.return_value = []
         response = self.fetch(self.API_ENDPOINT, method="GET")
         decoded_response = tornado.escape.json_decode(response.body)
         self.assertEqual(200, response.code)
         self.assertIn("all", decoded_response)
         self.assertEqual(len(decoded_response["all"]), 0, "Expects to return empty list")
 
+    def test_get_all_users_streamed_in_chunks(self):
+        self._mocks.storage.iter_all.return_value = [Defaults.unix_user] * (HttpRequestUser.STREAM_CHUNK_SIZE + 1)
+        response = self.fetch(self.API_ENDPOINT, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(HttpRequestUser.STREAM_CHUNK_SIZE + 1, len(decoded_response["all"]))
+
+    def test_get_all_users_same_body_as_write(self):
+        self._mocks.storage.iter_all.return_value = [Defaults.unix_user] * 2
+        response = self.fetch(self.API_ENDPOINT, method="GET")
+        expected = {"all": [JsonFormatterUser(Defaults.unix_user)] * 2}
+        self.assertSameBody(expected, response.body)
+        self.assertEqual("application/json; charset=UTF-8", response.headers["Content-Type"])
+
+    def test_get_page(self):
+        self._mocks.storage.get_page.return_value = [Defaults.unix_user] * 2
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            PageParameter.LIMIT: "2",
+            PageParameter.AFTER: "a"
+        })
+        response = self.fetch(url, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual(2, len(decoded_response["all"]))
+        self.assertEqual(Defaults.unix_user.name, decoded_response["next"])
+        self._mocks.storage.get_page.assert_called_once_with(2, "a", PageOrder.NAME)
+
+    def test_get_last_page_by_id(self):
+        self._mocks.storage.get_page.return_value = [Defaults.unix_user]
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            PageParameter.LIMIT: "2",
+            PageParameter.AFTER: "10",
+            PageParameter.ORDER: PageOrder.ID
+        })
+        response = self.fetch(url, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertIsNone(decoded_response["next"])
+        self._mocks.storage.get_page.assert_called_once_with(2, 10, PageOrder.ID)
+
+    def test_get_page_size_is_limited(self):
+        self._mocks.storage.get_page.return_value = []
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            PageParameter.LIMIT: str(HttpRequestUser.MAX_PAGE_SIZE + 1)
+        })
+        self.fetch(url, method="GET")
+        self._mocks.storage.get_page.assert_called_once_with(HttpRequestUser.MAX_PAGE_SIZE, None, PageOrder.NAME)
+
+    def test_get_page_invalid_arguments(self):
+        for arguments in ({PageParameter.LIMIT: "0"},
+                          {PageParameter.LIMIT: "nan"},
+                          {PageParameter.LIMIT: "1", PageParameter.ORDER: "shell"},
+                          {PageParameter.LIMIT: "1", PageParameter.ORDER: PageOrder.ID, PageParameter.AFTER: "nan"}):
+            response = self.fetch(tornado.httputil.url_concat(self.API_ENDPOINT, arguments), method="GET")
+            self.assertEqual(400, response.code)
+
+    def test_get_many_with_repeated_parameters(self):
+        self._mocks.storage.get_many.return_value = [Defaults.unix_user]
+        url = "{endpoint}?id=10000&id=123&name=username&name=nonexisting-user".format(endpoint=self.API_ENDPOINT)
+        response = self.fetch(url, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual(1, len(decoded_response["all"]))
+        self.assertEqual({Parameter.USER_ID: [123], Parameter.USER_NAME: ["nonexisting-user"]}, decoded_response["missing"])
+        self._mocks.storage.get_many.assert_called_once_with(["username", "nonexisting-user"], [10000, 123])
+
+    def test_get_many_with_json_body(self):
+        self._mocks.storage.get_many.return_value = []
+        body = tornado.escape.json_encode({Parameter.USER_ID: [10000, 10000]})
+        response = self.fetch(self.API_ENDPOINT, method="POST", body=body)
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual({Parameter.USER_ID: [10000], Parameter.USER_NAME: []}, decoded_response["missing"])
+        self._mocks.storage.get_many.assert_called_once_with([], [10000])
+
+    def test_get_many_invalid_arguments(self):
+        too_many = {Parameter.USER_NAME: ["user"] * (HttpRequestUser.MAX_BATCH_SIZE + 1)}
+        for body in ("[]", "not json", tornado.escape.json_encode({Parameter.USER_ID: ["nan"]}), tornado.escape.json_encode(too_many)):
+            response = self.fetch(self.API_ENDPOINT, method="POST", body=body)
+            self.assertEqual(400, response.code)
+        self._mocks.storage.get_many.assert_not_called()
+
+    def test_get_many_with_json_values_of_other_types(self):
+        for keys in ({Parameter.USER_ID: [True]}, {Parameter.USER_ID: [1.5]}, {Parameter.USER_ID: ["10000"]},
+                     {Parameter.USER_NAME: [1]}, {Parameter.USER_NAME: [None]}, {Parameter.USER_NAME: [["user"]]}):
+            response = self.fetch(self.API_ENDPOINT, method="POST", body=tornado.escape.json_encode(keys))
+            self.assertEqual(400, response.code, keys)
+        self._mocks.storage.get_many.assert_not_called()
+
     def test_get_user_by_invalid_id(self):
         url = tornado.httputil.url_concat(self.API_ENDPOINT, {
             Parameter.USER_ID: "nan"
@@ -133,3 +249,199 @@ class UsersTest(AsyncHTTPTestCase):
         })
         response = self.fetch(url, method="GET")
         self.assertEqual(404, response.code)
+
+
+class UsersTestWithStorageExecutor(UsersTest):
+
+    """ Same tests as above, with storage lookups run in a thread pool """
+
+    def setUp(self):
+        self._executor = StorageExecutor(max_workers=2)
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        self._executor.shutdown()
+
+    def get_app(self):
+        return tornado.web.Application(
+            handlers=[
+                (self.API_ENDPOINT, HttpRequestUser, dict(user_storage=self._mocks.storage, storage_executor=self._executor)),
+            ])
+
+
+@unittest.skipUnless(JsonSerializer.ORJSON in available_serializers(), "orjson is not installed")
+class UsersTestWithOrjson(UsersTest):
+
+    """ Same tests as above, with responses encoded by orjson """
+
+    def assertSameBody(self, expected, body: bytes):
+        """ Same json, not the same whitespace """
+        self.assertEqual(tornado.escape.json_decode(tornado.escape.json_encode(expected)), tornado.escape.json_decode(body))
+
+    def get_app(self):
+        return tornado.web.Application(
+            handlers=[
+                (self.API_ENDPOINT, HttpRequestUser, dict(user_storage=self._mocks.storage, json_serializer=encode_orjson)),
+            ])
+
+
+class UsersAsyncStorageTest(AsyncHTTPTestCase):
+    API_ENDPOINT = "/api/users"
+
+    def setUp(self):
+        self._storage = Mock(spec=UnixUserStorageAsync)
+        super().setUp()
+
+    def get_app(self):
+        return tornado.web.Application(
+            handlers=[
+                (self.API_ENDPOINT, HttpRequestUser, dict(user_storage=self._storage)),
+            ])
+
+    def test_get_all_users(self):
+        self._storage.iter_all.return_value = [Defaults.unix_user]
+        response = self.fetch(self.API_ENDPOINT, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual(len(decoded_response["all"]), 1, "Expects to return one user")
+
+    def test_get_user_by_name(self):
+        self._storage.get_by_name.return_value = Defaults.unix_user
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            Parameter.USER_NAME: "user"
+        })
+        response = self.fetch(url, method="GET")
+        decoded_response = tornado.escape.json_decode(response.body)
+        self.assertEqual(200, response.code)
+        self.assertEqual(Defaults.unix_user.name, decoded_response[JsonAttributeUser.name])
+
+
+class UsersResponseCacheTest(AsyncHTTPTestCase):
+    API_ENDPOINT = "/api/users"
+
+    def setUp(self):
+        self._storage = Mock(spec=UnixUserStorage)
+        self._generation = Mock(spec=DirectoryGeneration)
+        self._generation.get.return_value = 1
+        super().setUp()
+
+    def get_app(self):
+        return tornado.web.Application(
+            handlers=[
+                (self.API_ENDPOINT, HttpRequestUser, dict(user_storage=self._storage, response_cache=ResponseCache(self._generation))),
+            ])
+
+    def _fetch_user(self, headers=None):
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {
+            Parameter.USER_NAME: "user"
+        })
+        return self.fetch(url, method="GET", headers=headers)
+
+    def test_cached_response(self):
+        self._storage.get_by_name.return_value = Defaults.unix_user
+        first, second = self._fetch_user(), self._fetch_user()
+        self.assertEqual(first.body, second.body)
+        self.assertEqual(1, self._storage.get_by_name.call_count)
+
+    def test_same_body_as_uncached(self):
+        self._storage.get_by_name.return_value = Defaults.unix_user
+        response = self._fetch_user()
+        self.assertEqual(tornado.escape.utf8(tornado.escape.json_encode(JsonFormatterUser(Defaults.unix_user))), response.body)
+        self.assertEqual("application/json; charset=UTF-8", response.headers["Content-Type"])
+
+    def test_new_generation_invalidates_cache(self):
+        self._storage.get_by_name.return_value = Defaults.unix_user
+        self._fetch_user()
+        self._generation.get.return_value = 2
+        self._fetch_user()
+        self.assertEqual(2, self._storage.get_by_name.call_count)
+
+    def test_not_modified(self):
+        self._storage.get_by_name.return_value = Defaults.unix_user
+        etag = self._fetch_user().headers["Etag"]
+        response = self._fetch_user(headers={"If-None-Match": etag})
+        self.assertEqual(304, response.code)
+        self.assertEqual(b"", response.body)
+
+    def test_modified(self):
+        self._storage.get_by_name.return_value = Defaults.unix_user
+        response = self._fetch_user(headers={"If-None-Match": "\"outdated\""})
+        self.assertEqual(200, response.code)
+        self.assertIn("Cache-Control", response.headers)
+
+    def test_not_found_is_not_cached(self):
+        self._storage.get_by_name = Mock(side_effect=DoesNotExist())
+        self._fetch_user()
+        self._fetch_user()
+        self.assertEqual(2, self._storage.get_by_name.call_count)
+
+    def test_compressed_enumeration(self):
+        self._storage.iter_all.return_value = [Defaults.unix_user] * 20
+        headers = {"Accept-Encoding": "gzip"}
+        response = self.fetch(self.API_ENDPOINT, method="GET", headers=headers, decompress_response=False)
+        self.assertEqual("gzip", response.headers["Content-Encoding"])
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        decoded_response = tornado.escape.json_decode(gzip.decompress(response.body))
+        self.assertEqual(20, len(decoded_response["all"]))
+        again = self.fetch(self.API_ENDPOINT, method="GET", headers=dict(headers, **{"If-None-Match": response.headers["Etag"]}))
+        self.assertEqual(304, again.code)
+
+    def test_enumeration_same_body_as_uncached(self):
+        self._storage.iter_all.return_value = [Defaults.unix_user] * (HttpRequestUser.STREAM_CHUNK_SIZE + 1)
+        first, second = self.fetch(self.API_ENDPOINT, method="GET"), self.fetch(self.API_ENDPOINT, method="GET")
+        expected = {"all": [JsonFormatterUser(Defaults.unix_user)] * (HttpRequestUser.STREAM_CHUNK_SIZE + 1)}
+        self.assertEqual(tornado.escape.utf8(tornado.escape.json_encode(expected)), first.body)
+        self.assertEqual(first.body, second.body)
+        self.assertEqual(1, self._storage.iter_all.call_count)
+
+    def test_cached_page(self):
+        self._storage.get_page.return_value = [Defaults.unix_user]
+        url = tornado.httputil.url_concat(self.API_ENDPOINT, {PageParameter.LIMIT: "1"})
+        first, second = self.fetch(url, method="GET"), self.fetch(url, method="GET")
+        self.assertEqual(first.body, second.body)
+        self.assertEqual(1, self._storage.get_page.call_count)
+
+    def test_uncompressed_enumeration(self):
+        self._storage.iter_all.return_value = [Defaults.unix_user] * 20
+        response = self.fetch(self.API_ENDPOINT, method="GET", headers={"Accept-Encoding": "identity"}, decompress_response=False)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(20, len(tornado.escape.json_decode(response.body)["all"]))
+
+
+class UsersMetricsTest(AsyncHTTPTestCase):
+    API_ENDPOINT = "/api/users"
+
+    def setUp(self):
+        self._storage = Mock(spec=UnixUserStorage)
+        self._storage.get_by_name.__qualname__ = "UnixUserStorage.get_by_name"
+        self._metrics = RequestMetrics()
+        super().setUp()
+
+    def get_app(self):
+        return tornado.web.Application(
+            handlers=[
+                (self.API_ENDPOINT, HttpRequestUser, dict(user_storage=self._storage, request_metrics=self._metrics)),
+                ("/metrics", HttpRequestMetrics, dict(request_metrics=self._metrics)),
+            ])
+
+    def test_lookup_is_measured(self):
+        self._storage.get_by_name.return_value = Defaults.unix_user
+        self.fetch(tornado.httputil.url_concat(self.API_ENDPOINT, {Parameter.USER_NAME: "user"}))
+        response = self.fetch("/metrics")
+        self.assertEqual(200, response.code)
+        self.assertIn(b"unix_accounts_requests_total{route=\"/api/users\",lookup=\"name\",code=\"200\"} 1\n", response.body)
+        self.assertIn(b"unix_accounts_storage_call_duration_seconds_count{call=\"UnixUserStorage.get_by_name\"} 1\n", response.body)
+        self.assertIn(b"unix_accounts_requests_in_flight 0\n", response.body)
+
+    def test_unsupported_method_not_in_flight(self):
+        response = self.fetch(self.API_ENDPOINT, method="PROPFIND", allow_nonstandard_methods=True)
+        self.assertEqual(405, response.code)
+        response = self.fetch("/metrics")
+        self.assertIn(b"unix_accounts_requests_total{route=\"/api/users\",lookup=\"none\",code=\"405\"} 1\n", response.body)
+        self.assertIn(b"unix_accounts_requests_in_flight 0\n", response.body)
+
+    def test_rejected_request_is_measured(self):
+        self.fetch(tornado.httputil.url_concat(self.API_ENDPOINT, {"invalid-attribute": "nan"}))
+        response = self.fetch("/metrics")
+        self.assertIn(b"unix_accounts_requests_total{route=\"/api/users\",lookup=\"none\",code=\"400\"} 1\n", response.body)
@@ -1,6 +1,19 @@
 
 class UnixPassword:
 
+    """ Immutable, without a __dict__ per instance """
+
+    __slots__ = (
+        "_name",
+        "_encrypted_password",
+        "_days_since_epoch_last_change",
+        "_days_min",
+        "_days_max",
+        "_days_warn",
+        "_days_inactive",
+        "_days_since_epoch_expires"
+    )
+
     def __init__(
             self,
             name: str,
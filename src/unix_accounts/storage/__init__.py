@@ -1,11 +1,25 @@
 from .groups import UnixGroupStorage
-from .users import UnixUserStorage
+from .groups_async import UnixGroupStorageAsync
+from .users import (
+    UnixUserStorage,
+    UserProjection
+)
+from .users_async import UnixUserStorageAsync
 from .group_member import UnixGroupMemberStorage
+from .generation import DirectoryGeneration
 from .password import UnixPasswordStorage
+from .password_async import UnixPasswordStorageAsync
+from .page import PageOrder
 
 __all__ = [
     "UnixGroupStorage",
+    "UnixGroupStorageAsync",
     "UnixUserStorage",
+    "UnixUserStorageAsync",
+    "UserProjection",
     "UnixGroupMemberStorage",
-    "UnixPasswordStorage"
+    "DirectoryGeneration",
+    "UnixPasswordStorage",
+    "UnixPasswordStorageAsync",
+    "PageOrder"
 ]
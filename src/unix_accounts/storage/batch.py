@@ -0,0 +1,34 @@
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    List,
+    Tuple
+)
+
+from error import DoesNotExist
+
+
+def get_each(lookups: Iterable[Tuple[Callable, Iterable]], key: Callable[..., Hashable]) -> List:
+    """ One lookup per key, for storages without batch lookups, missing are left out """
+    found = {}
+    for lookup, keys in lookups:
+        for each in keys:
+            try:
+                item = lookup(each)
+            except DoesNotExist:
+                continue
+            found.setdefault(key(item), item)
+    return list(found.values())
+
+
+async def get_each_async(lookups: Iterable[Tuple[Callable, Iterable]], key: Callable[..., Hashable]) -> List:
+    found = {}
+    for lookup, keys in lookups:
+        for each in keys:
+            try:
+                item = await lookup(each)
+            except DoesNotExist:
+                continue
+            found.setdefault(key(item), item)
+    return list(found.values())
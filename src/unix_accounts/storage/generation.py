@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+
+
+class DirectoryGeneration(ABC):
+
+    """ Number that changes whenever anything in the directory changes """
+
+    @abstractmethod
+    def get(self) -> int:
+        pass
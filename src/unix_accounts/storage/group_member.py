@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
 
 from group import UnixGroup
 
@@ -12,3 +13,16 @@ class UnixGroupMemberStorage(ABC):
     @abstractmethod
     def delete_member(self, user: str, group: str) -> UnixGroup:
         pass
+
+    @abstractmethod
+    def add_members(self, group: str, users: Iterable[str]) -> UnixGroup:
+        pass
+
+    @abstractmethod
+    def remove_members(self, group: str, users: Iterable[str]) -> UnixGroup:
+        pass
+
+    @abstractmethod
+    def set_members(self, group: str, users: Iterable[str]) -> UnixGroup:
+        """ Replace all members of the group """
+        pass
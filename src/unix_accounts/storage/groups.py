@@ -1,15 +1,26 @@
 from typing import (
+    Iterable,
+    Iterator,
     List
 )
 from abc import ABC, abstractmethod
+from operator import attrgetter
 
 from group import UnixGroup
 
+from .batch import get_each
+from .page import (
+    GROUP_PAGE_KEYS,
+    PageOrder,
+    page
+)
+
 
 class UnixGroupStorage(ABC):
 
     @abstractmethod
-    def add(self, name: str, gid: int=None) -> UnixGroup:
+    def add(self, name: str, gid: int=None, system: bool = False) -> UnixGroup:
+        """ The gid is allocated if not given, from the range of system accounts if system """
         pass
 
     @abstractmethod
@@ -35,3 +46,20 @@ class UnixGroupStorage(ABC):
     @abstractmethod
     def get_all(self) -> List[UnixGroup]:
         pass
+
+    @abstractmethod
+    def get_by_member(self, user: str) -> List[UnixGroup]:
+        """ All groups of the user, the primary group first, empty if the user does not exist """
+        pass
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[UnixGroup]:
+        """ Like get_all, without having all loaded at once when supported by the storage """
+        return iter(self.get_all())
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixGroup]:
+        """ Up to limit groups sorted by order, starting after the name or id in after """
+        return page(self.get_all(), GROUP_PAGE_KEYS[order], limit, after)
+
+    def get_many(self, names: Iterable[str] = (), gids: Iterable[int] = ()) -> List[UnixGroup]:
+        """ Groups matching any of the names or gids, missing are left out """
+        return get_each(((self.get_by_name, names), (self.get_by_id, gids)), key=attrgetter("name"))
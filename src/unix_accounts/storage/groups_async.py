@@ -0,0 +1,47 @@
+from typing import (
+    Iterable,
+    List
+)
+from abc import ABC, abstractmethod
+from operator import attrgetter
+
+from group import UnixGroup
+
+from .batch import get_each_async
+from .page import (
+    GROUP_PAGE_KEYS,
+    PageOrder,
+    page
+)
+
+
+class UnixGroupStorageAsync(ABC):
+
+    @abstractmethod
+    async def get_by_id(self, gid: int) -> UnixGroup:
+        pass
+
+    @abstractmethod
+    async def get_by_name(self, name: str) -> UnixGroup:
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> List[UnixGroup]:
+        pass
+
+    @abstractmethod
+    async def get_by_member(self, user: str) -> List[UnixGroup]:
+        """ All groups of the user, the primary group first, empty if the user does not exist """
+        pass
+
+    async def iter_all(self, chunk_size: int = 1000) -> Iterable[UnixGroup]:
+        """ Same as get_all, streaming is not supported """
+        return await self.get_all()
+
+    async def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixGroup]:
+        """ Up to limit groups sorted by order, starting after the name or id in after """
+        return page(await self.get_all(), GROUP_PAGE_KEYS[order], limit, after)
+
+    async def get_many(self, names: Iterable[str] = (), gids: Iterable[int] = ()) -> List[UnixGroup]:
+        """ Groups matching any of the names or gids, missing are left out """
+        return await get_each_async(((self.get_by_name, names), (self.get_by_id, gids)), key=attrgetter("name"))
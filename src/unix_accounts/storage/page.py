@@ -0,0 +1,36 @@
+from bisect import bisect_right
+from operator import attrgetter
+from typing import (
+    Callable,
+    Hashable,
+    Iterable,
+    List
+)
+
+
+class PageOrder(object):
+    """ Sort keys for paged enumeration, the "after" cursor is a value of the same key """
+    NAME = "name"
+    ID = "id"
+
+
+USER_PAGE_KEYS = {
+    PageOrder.NAME: attrgetter("name"),
+    PageOrder.ID: attrgetter("uid")
+}
+
+GROUP_PAGE_KEYS = {
+    PageOrder.NAME: attrgetter("name"),
+    PageOrder.ID: attrgetter("id")
+}
+
+PASSWORD_PAGE_KEYS = {
+    PageOrder.NAME: attrgetter("name")
+}
+
+
+def page(items: Iterable, key: Callable, limit: int, after: Hashable = None) -> List:
+    """ Up to limit items sorted by key, starting after the cursor """
+    items = sorted(items, key=key)
+    start = 0 if after is None else bisect_right([key(item) for item in items], after)
+    return items[start:start + limit]
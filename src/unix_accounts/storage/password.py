@@ -1,8 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import List
+from operator import attrgetter
+from typing import (
+    Iterable,
+    Iterator,
+    List
+)
 
 from password import UnixPassword
 
+from .batch import get_each
+from .page import (
+    PASSWORD_PAGE_KEYS,
+    PageOrder,
+    page
+)
+
 
 class UnixPasswordStorage(ABC):
 
@@ -17,3 +29,15 @@ class UnixPasswordStorage(ABC):
     @abstractmethod
     def get_all(self) -> List[UnixPassword]:
         pass
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[UnixPassword]:
+        """ Like get_all, without having all loaded at once when supported by the storage """
+        return iter(self.get_all())
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixPassword]:
+        """ Up to limit passwords sorted by name, starting after the name in after """
+        return page(self.get_all(), PASSWORD_PAGE_KEYS[order], limit, after)
+
+    def get_many(self, names: Iterable[str] = ()) -> List[UnixPassword]:
+        """ Passwords matching any of the names, missing are left out """
+        return get_each(((self.get_by_name, names),), key=attrgetter("name"))
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from operator import attrgetter
+from typing import (
+    Iterable,
+    List
+)
+
+from password import UnixPassword
+
+from .batch import get_each_async
+from .page import (
+    PASSWORD_PAGE_KEYS,
+    PageOrder,
+    page
+)
+
+
+class UnixPasswordStorageAsync(ABC):
+
+    @abstractmethod
+    async def get_by_name(self, name: str) -> UnixPassword:
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> List[UnixPassword]:
+        pass
+
+    async def iter_all(self, chunk_size: int = 1000) -> Iterable[UnixPassword]:
+        """ Same as get_all, streaming is not supported """
+        return await self.get_all()
+
+    async def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixPassword]:
+        """ Up to limit passwords sorted by name, starting after the name in after """
+        return page(await self.get_all(), PASSWORD_PAGE_KEYS[order], limit, after)
+
+    async def get_many(self, names: Iterable[str] = ()) -> List[UnixPassword]:
+        """ Passwords matching any of the names, missing are left out """
+        return await get_each_async(((self.get_by_name, names),), key=attrgetter("name"))
@@ -1,15 +1,35 @@
 from typing import (
+    Iterable,
+    Iterator,
     List
 )
 from abc import ABC, abstractmethod
+from operator import attrgetter
 
 from user import UnixUser
 
+from .batch import get_each
+from .page import (
+    USER_PAGE_KEYS,
+    PageOrder,
+    page
+)
+
+
+class UserProjection:
+    """ Fields of users returned by lookups, storages may return more than asked for """
+    # Everything, including members of the primary group and membership of other groups:
+    FULL = "full"
+    # Only the fields of a passwd entry, the primary group without members and no group membership:
+    PASSWD = "passwd"
+
 
 class UnixUserStorage(ABC):
 
     @abstractmethod
-    def add(self, name: str, uid: int = None, gid: int = None, gecos: str = None, home_dir: str = None, shell: str = None) -> UnixUser:
+    def add(self, name: str, uid: int = None, gid: int = None, gecos: str = None, home_dir: str = None, shell: str = None,
+            system: bool = False) -> UnixUser:
+        """ Ids not given are allocated, from the range of system accounts if system """
         pass
 
     @abstractmethod
@@ -51,3 +71,15 @@ class UnixUserStorage(ABC):
     @abstractmethod
     def get_all(self) -> List[UnixUser]:
         pass
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[UnixUser]:
+        """ Like get_all, without having all loaded at once when supported by the storage """
+        return iter(self.get_all())
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixUser]:
+        """ Up to limit users sorted by order, starting after the name or id in after """
+        return page(self.get_all(), USER_PAGE_KEYS[order], limit, after)
+
+    def get_many(self, names: Iterable[str] = (), uids: Iterable[int] = ()) -> List[UnixUser]:
+        """ Users matching any of the names or uids, missing are left out """
+        return get_each(((self.get_by_name, names), (self.get_by_id, uids)), key=attrgetter("name"))
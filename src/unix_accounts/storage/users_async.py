@@ -0,0 +1,42 @@
+from typing import (
+    Iterable,
+    List
+)
+from abc import ABC, abstractmethod
+from operator import attrgetter
+
+from user import UnixUser
+
+from .batch import get_each_async
+from .page import (
+    USER_PAGE_KEYS,
+    PageOrder,
+    page
+)
+
+
+class UnixUserStorageAsync(ABC):
+
+    @abstractmethod
+    async def get_by_id(self, uid: int) -> UnixUser:
+        pass
+
+    @abstractmethod
+    async def get_by_name(self, name: str) -> UnixUser:
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> List[UnixUser]:
+        pass
+
+    async def iter_all(self, chunk_size: int = 1000) -> Iterable[UnixUser]:
+        """ Same as get_all, streaming is not supported """
+        return await self.get_all()
+
+    async def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixUser]:
+        """ Up to limit users sorted by order, starting after the name or id in after """
+        return page(await self.get_all(), USER_PAGE_KEYS[order], limit, after)
+
+    async def get_many(self, names: Iterable[str] = (), uids: Iterable[int] = ()) -> List[UnixUser]:
+        """ Users matching any of the names or uids, missing are left out """
+        return await get_each_async(((self.get_by_name, names), (self.get_by_id, uids)), key=attrgetter("name"))
@@ -0,0 +1,13 @@
+from .directory import Directory
+from .materialized_directory import MaterializedDirectory
+from .generation_api import DirectoryGenerationMemory
+from .group_api import UnixGroupStorageMemory
+from .user_api import UnixUserStorageMemory
+
+__all__ = [
+    "Directory",
+    "DirectoryGenerationMemory",
+    "MaterializedDirectory",
+    "UnixGroupStorageMemory",
+    "UnixUserStorageMemory"
+]
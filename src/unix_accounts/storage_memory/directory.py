@@ -0,0 +1,116 @@
+from bisect import bisect_right
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Tuple
+)
+
+from error import DoesNotExist
+from group import UnixGroup
+from storage.page import (
+    GROUP_PAGE_KEYS,
+    USER_PAGE_KEYS,
+    PageOrder
+)
+from user import UnixUser
+
+
+def _index_members(users: Iterable[UnixUser], groups: Iterable[UnixGroup]) -> Dict[str, Tuple[UnixGroup]]:
+    """ User name to all groups the user belongs to, the primary group first """
+    groups_by_member = {user.name: [user.group] for user in users}
+    for group in groups:
+        for member in group.members:
+            member_of = groups_by_member.setdefault(member, [])
+            if group not in member_of:
+                member_of.append(group)
+    return {member: tuple(member_of) for member, member_of in groups_by_member.items()}
+
+
+class _SortedIndex:
+
+    """ Items sorted by key, pages are found with a binary search on the key """
+
+    def __init__(self, items: Iterable, key: Callable):
+        self._items = sorted(items, key=key)
+        self._keys = [key(item) for item in self._items]
+
+    def page(self, limit: int, after=None) -> List:
+        start = 0 if after is None else bisect_right(self._keys, after)
+        return self._items[start:start + limit]
+
+
+class Directory:
+
+    """ Immutable snapshot of all users and groups, with hash indexes for lookups """
+
+    def __init__(self, users: Iterable[UnixUser] = (), groups: Iterable[UnixGroup] = (), generation: int = None):
+        self._generation = generation
+        self._groups = tuple(groups)
+        self._groups_by_name = {group.name: group for group in self._groups}
+        self._groups_by_id = {group.id: group for group in self._groups}
+        # share group instances between users, instead of one copy of the primary group per user
+        self._users = tuple(self._with_shared_group(user) for user in users)
+        self._users_by_name = {user.name: user for user in self._users}
+        self._users_by_id = {user.uid: user for user in self._users}
+        self._groups_by_member = _index_members(self._users, self._groups)
+        self._users_sorted = {order: _SortedIndex(self._users, key) for order, key in USER_PAGE_KEYS.items()}
+        self._groups_sorted = {order: _SortedIndex(self._groups, key) for order, key in GROUP_PAGE_KEYS.items()}
+
+    def _with_shared_group(self, user: UnixUser) -> UnixUser:
+        group = self._groups_by_id.get(user.group.id, user.group)
+        if group is user.group:
+            return user
+        return UnixUser(
+            name=user.name,
+            uid=user.uid,
+            group=group,
+            gecos=user.gecos,
+            home_dir=user.home_dir,
+            shell=user.shell,
+            group_membership=user.group_membership
+        )
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def user_by_name(self, name: str) -> UnixUser:
+        try:
+            return self._users_by_name[name]
+        except KeyError:
+            raise DoesNotExist("User: {name} does not exist".format(name=name))
+
+    def user_by_id(self, uid: int) -> UnixUser:
+        try:
+            return self._users_by_id[uid]
+        except KeyError:
+            raise DoesNotExist("User with uid: {uid} does not exist".format(uid=uid))
+
+    def users(self) -> List[UnixUser]:
+        return list(self._users)
+
+    def users_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixUser]:
+        return self._users_sorted[order].page(limit, after)
+
+    def group_by_name(self, name: str) -> UnixGroup:
+        try:
+            return self._groups_by_name[name]
+        except KeyError:
+            raise DoesNotExist("Group {name} does not exist".format(name=name))
+
+    def group_by_id(self, gid: int) -> UnixGroup:
+        try:
+            return self._groups_by_id[gid]
+        except KeyError:
+            raise DoesNotExist("Group with id {gid} does not exist".format(gid=gid))
+
+    def groups(self) -> List[UnixGroup]:
+        return list(self._groups)
+
+    def groups_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixGroup]:
+        return self._groups_sorted[order].page(limit, after)
+
+    def groups_by_member(self, user: str) -> Tuple[UnixGroup]:
+        return self._groups_by_member.get(user, ())
@@ -0,0 +1,94 @@
+import unittest
+
+from error import DoesNotExist
+from group import UnixGroup
+from storage import PageOrder
+from user import UnixUser
+
+from .directory import Directory
+
+
+class Defaults:
+    primary_group = UnixGroup("user", 10000)
+    group = UnixGroup("group", 20000, ("user",))
+    user = UnixUser(
+        name="user",
+        uid=10000,
+        group=UnixGroup("user", 10000),
+        home_dir="/home/user",
+        shell="/bin/bash",
+        group_membership=("group",)
+    )
+
+
+class DirectoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = Directory(
+            users=(Defaults.user,),
+            groups=(Defaults.primary_group, Defaults.group),
+            generation=1
+        )
+
+    def test_user_by_name(self):
+        user = self.directory.user_by_name(Defaults.user.name)
+        self.assertEqual(Defaults.user.uid, user.uid)
+
+    def test_user_by_id(self):
+        user = self.directory.user_by_id(Defaults.user.uid)
+        self.assertEqual(Defaults.user.name, user.name)
+
+    def test_user_shares_group_instance(self):
+        user = self.directory.user_by_name(Defaults.user.name)
+        self.assertIs(Defaults.primary_group, user.group)
+
+    def test_nonexisting_user(self):
+        with self.assertRaises(DoesNotExist):
+            self.directory.user_by_name("nonexisting-user")
+        with self.assertRaises(DoesNotExist):
+            self.directory.user_by_id(123)
+
+    def test_group_by_name(self):
+        group = self.directory.group_by_name(Defaults.group.name)
+        self.assertEqual(Defaults.group.id, group.id)
+
+    def test_group_by_id(self):
+        group = self.directory.group_by_id(Defaults.group.id)
+        self.assertEqual(Defaults.group.name, group.name)
+
+    def test_nonexisting_group(self):
+        with self.assertRaises(DoesNotExist):
+            self.directory.group_by_name("nonexisting-group")
+        with self.assertRaises(DoesNotExist):
+            self.directory.group_by_id(123)
+
+    def test_get_all(self):
+        self.assertEqual([Defaults.user.name], [user.name for user in self.directory.users()])
+        self.assertEqual([Defaults.primary_group, Defaults.group], self.directory.groups())
+
+    def test_groups_page_by_name(self):
+        self.assertEqual([Defaults.group], self.directory.groups_page(1))
+        self.assertEqual([Defaults.primary_group], self.directory.groups_page(1, after=Defaults.group.name))
+        self.assertEqual([], self.directory.groups_page(1, after=Defaults.primary_group.name))
+
+    def test_groups_page_by_id(self):
+        groups = self.directory.groups_page(2, order=PageOrder.ID)
+        self.assertEqual([Defaults.primary_group, Defaults.group], groups)
+        groups = self.directory.groups_page(2, after=Defaults.primary_group.id, order=PageOrder.ID)
+        self.assertEqual([Defaults.group], groups)
+
+    def test_users_page(self):
+        self.assertEqual([Defaults.user.name], [user.name for user in self.directory.users_page(10, after="a")])
+        self.assertEqual([], self.directory.users_page(10, after=Defaults.user.uid, order=PageOrder.ID))
+
+    def test_groups_by_member(self):
+        groups = self.directory.groups_by_member(Defaults.user.name)
+        self.assertEqual((Defaults.primary_group, Defaults.group), groups)
+
+    def test_groups_by_nonexisting_member(self):
+        self.assertEqual((), self.directory.groups_by_member("nonexisting-user"))
+
+    def test_empty_directory(self):
+        directory = Directory()
+        self.assertIsNone(directory.generation)
+        self.assertEqual([], directory.users())
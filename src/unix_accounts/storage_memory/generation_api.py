@@ -0,0 +1,14 @@
+from storage import DirectoryGeneration
+
+from .materialized_directory import MaterializedDirectory
+
+
+class DirectoryGenerationMemory(DirectoryGeneration):
+
+    """ Generation of the snapshot currently served, without database access """
+
+    def __init__(self, directory: MaterializedDirectory):
+        self._directory = directory
+
+    def get(self) -> int:
+        return self._directory.current.generation
@@ -0,0 +1,47 @@
+from typing import List
+
+from group import UnixGroup
+from storage import (
+    PageOrder,
+    UnixGroupStorage
+)
+
+from .materialized_directory import (
+    MaterializedDirectory,
+    read_only
+)
+
+
+class UnixGroupStorageMemory(UnixGroupStorage):
+
+    """ Lookups served from the in-memory directory, without any database access """
+
+    def __init__(self, directory: MaterializedDirectory):
+        self._directory = directory
+
+    def add(self, name: str, gid: int = None, system: bool = False) -> UnixGroup:
+        read_only()
+
+    def update_id(self, name: str, new_id: int) -> UnixGroup:
+        read_only()
+
+    def update_name(self, name: str, new_name: str) -> UnixGroup:
+        read_only()
+
+    def delete(self, name: str):
+        read_only()
+
+    def get_by_id(self, gid: int) -> UnixGroup:
+        return self._directory.current.group_by_id(gid)
+
+    def get_by_name(self, name: str) -> UnixGroup:
+        return self._directory.current.group_by_name(name)
+
+    def get_all(self) -> List[UnixGroup]:
+        return self._directory.current.groups()
+
+    def get_by_member(self, user: str) -> List[UnixGroup]:
+        return list(self._directory.current.groups_by_member(user))
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixGroup]:
+        return self._directory.current.groups_page(limit, after, order)
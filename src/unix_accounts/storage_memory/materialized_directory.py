@@ -0,0 +1,49 @@
+from error import NotPossible
+from storage import (
+    DirectoryGeneration,
+    UnixGroupStorage,
+    UnixUserStorage
+)
+
+from .directory import Directory
+
+
+def read_only():
+    """ Raised by changes of storages served from the directory """
+    raise NotPossible("In-memory directory is read-only")
+
+
+class MaterializedDirectory:
+
+    """ Keeps the whole directory in memory, reloaded from storage when the generation changes
+
+    Lookups and refresh may run in different threads, a new snapshot is swapped in with a single assignment.
+    """
+
+    def __init__(self, users: UnixUserStorage, groups: UnixGroupStorage, generation: DirectoryGeneration):
+        self._users = users
+        self._groups = groups
+        self._generation = generation
+        self._directory = Directory()
+
+    @property
+    def current(self) -> Directory:
+        return self._directory
+
+    def refresh(self) -> bool:
+        """ Reload if changed since last refresh, returns True when reloaded """
+        generation = self._generation.get()
+        if generation == self._directory.generation:
+            return False
+        self._directory = self._load(generation)
+        return True
+
+    def _load(self, generation: int) -> Directory:
+        while True:
+            users = self._users.get_all()
+            groups = self._groups.get_all()
+            # Retry if changed during load, users and groups must be consistent with each other:
+            generation_after_load = self._generation.get()
+            if generation_after_load == generation:
+                return Directory(users, groups, generation)
+            generation = generation_after_load
@@ -0,0 +1,56 @@
+import unittest
+
+from error import NotPossible
+from storage_sqlite.schema import UnixAccountSchema
+from storage_sqlite.api import SqliteDatabase
+from storage_sqlite.generation_api import DirectoryGenerationSqlite
+from storage_sqlite.user_api import UnixUserStorageSqlite
+from storage_sqlite.group_api import UnixGroupStorageSqlite
+
+from .materialized_directory import MaterializedDirectory
+from .user_api import UnixUserStorageMemory
+from .group_api import UnixGroupStorageMemory
+
+
+class Defaults:
+    user = "user"
+    group = "group"
+
+
+class MaterializedDirectoryTest(unittest.TestCase):
+
+    def setUp(self):
+        database = SqliteDatabase(
+            UnixAccountSchema(),
+            ":memory:"
+        )
+        self.users = UnixUserStorageSqlite(database)
+        self.groups = UnixGroupStorageSqlite(database)
+        self.directory = MaterializedDirectory(self.users, self.groups, DirectoryGenerationSqlite(database))
+        self.memory_users = UnixUserStorageMemory(self.directory)
+        self.memory_groups = UnixGroupStorageMemory(self.directory)
+
+    def test_empty_until_refreshed(self):
+        self.users.add(Defaults.user)
+        self.assertEqual([], self.memory_users.get_all())
+        self.assertTrue(self.directory.refresh())
+        self.assertEqual(Defaults.user, self.memory_users.get_by_name(Defaults.user).name)
+
+    def test_refresh_when_unchanged(self):
+        self.users.add(Defaults.user)
+        self.directory.refresh()
+        self.assertFalse(self.directory.refresh())
+
+    def test_refresh_replaces_snapshot(self):
+        self.directory.refresh()
+        before = self.directory.current
+        self.groups.add(Defaults.group)
+        self.assertTrue(self.directory.refresh())
+        self.assertIsNot(before, self.directory.current)
+        self.assertEqual(Defaults.group, self.memory_groups.get_by_name(Defaults.group).name)
+
+    def test_read_only(self):
+        with self.assertRaises(NotPossible):
+            self.memory_users.add(Defaults.user, system=True)
+        with self.assertRaises(NotPossible):
+            self.memory_groups.add(Defaults.group, system=True)
@@ -0,0 +1,57 @@
+from typing import List
+
+from storage import (
+    PageOrder,
+    UnixUserStorage
+)
+from user import UnixUser
+
+from .materialized_directory import (
+    MaterializedDirectory,
+    read_only
+)
+
+
+class UnixUserStorageMemory(UnixUserStorage):
+
+    """ Lookups served from the in-memory directory, without any database access """
+
+    def __init__(self, directory: MaterializedDirectory):
+        self._directory = directory
+
+    def add(self, name: str, uid: int = None, gid: int = None, gecos: str = None, home_dir: str = None, shell: str = None,
+            system: bool = False) -> UnixUser:
+        read_only()
+
+    def update_id(self, name: str, new_uid: int) -> UnixUser:
+        read_only()
+
+    def update_gid(self, name: str, new_gid: int) -> UnixUser:
+        read_only()
+
+    def update_name(self, name: str, new_name: str) -> UnixUser:
+        read_only()
+
+    def update_gecos(self, name: str, new_gecos: str) -> UnixUser:
+        read_only()
+
+    def update_home_dir(self, name: str, new_home_dir: str) -> UnixUser:
+        read_only()
+
+    def update_shell(self, name: str, new_shell: str) -> UnixUser:
+        read_only()
+
+    def delete(self, name: str):
+        read_only()
+
+    def get_by_id(self, uid: int) -> UnixUser:
+        return self._directory.current.user_by_id(uid)
+
+    def get_by_name(self, name: str) -> UnixUser:
+        return self._directory.current.user_by_name(name)
+
+    def get_all(self) -> List[UnixUser]:
+        return self._directory.current.users()
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixUser]:
+        return self._directory.current.users_page(limit, after, order)
@@ -1,5 +1,11 @@
 from .api import Api
+from .id_allocator import (
+    IdRange,
+    IdRanges
+)
 
 __all__ = [
-    "Api"
-]
\ No newline at end of file
+    "Api",
+    "IdRange",
+    "IdRanges"
+]
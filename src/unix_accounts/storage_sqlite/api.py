@@ -1,3 +1,8 @@
+from typing import (
+    ContextManager,
+    Dict
+)
+
 from .db_sqlite import (
     SqliteDatabase,
 )
@@ -5,8 +10,10 @@ from .db_sqlite import (
 from storage import (
     UnixGroupStorage,
     UnixUserStorage,
+    UserProjection,
     UnixGroupMemberStorage,
-    UnixPasswordStorage
+    UnixPasswordStorage,
+    DirectoryGeneration
 )
 
 from .schema import UnixAccountSchema
@@ -14,24 +21,46 @@ from .group_api import UnixGroupStorageSqlite
 from .user_api import UnixUserStorageSqlite
 from .group_member_api import UnixGroupMemberStorageSqlite
 from .password_api import UnixPasswordStorageSqlite
+from .generation_api import DirectoryGenerationSqlite
+from .json_rows import JsonRowsSqlite
+from .bulk_import import BulkImportSqlite
+from .id_allocator import (
+    IdAllocatorSqlite,
+    IdRanges
+)
+from .statement_timer import StatementStats
 
 
 class Api:
 
-    def __init__(self, database_name: str, verbose: bool = False):
+    def __init__(self, database_name: str, verbose: bool = False, slow_statement_threshold: float = None, id_ranges: IdRanges = IdRanges()):
+        """ Statements are timed when slow_statement_threshold is set, those slower are logged. Ids not given for new
+        accounts are allocated within id_ranges
+        """
         self._database = SqliteDatabase(
             UnixAccountSchema(),
             database_name,
-            verbose
+            verbose,
+            slow_statement_threshold
         )
+        self._id_ranges = id_ranges
+
+    @property
+    def _ids(self) -> IdAllocatorSqlite:
+        return IdAllocatorSqlite(self._database, self._id_ranges)
 
     @property
     def groups(self) -> UnixGroupStorage:
-        return UnixGroupStorageSqlite(self._database)
+        return UnixGroupStorageSqlite(self._database, self._ids)
 
     @property
     def users(self) -> UnixUserStorage:
-        return UnixUserStorageSqlite(self._database)
+        return UnixUserStorageSqlite(self._database, ids=self._ids)
+
+    @property
+    def passwd_users(self) -> UnixUserStorage:
+        """ Lookups of passwd entries only, without loading any group members """
+        return UnixUserStorageSqlite(self._database, UserProjection.PASSWD)
 
     @property
     def group_members(self) -> UnixGroupMemberStorage:
@@ -40,3 +69,42 @@ class Api:
     @property
     def password(self) -> UnixPasswordStorage:
         return UnixPasswordStorageSqlite(self._database)
+
+    @property
+    def generation(self) -> DirectoryGeneration:
+        return DirectoryGenerationSqlite(self._database)
+
+    @property
+    def json_rows(self) -> JsonRowsSqlite:
+        """ Read-only lookups straight to json rows, without the storage objects in between """
+        return JsonRowsSqlite(self._database)
+
+    @property
+    def export(self) -> JsonRowsSqlite:
+        """ Json rows with enumerations fetched in chunks, in memory independent of the directory size """
+        return JsonRowsSqlite(self._database, chunk_size=1000)
+
+    @property
+    def bulk_import(self) -> BulkImportSqlite:
+        """ New accounts from passwd, group and shadow entries, all inserted in one transaction """
+        return BulkImportSqlite(self._database, self._ids)
+
+    def statement_stats(self) -> Dict[str, StatementStats]:
+        """ Count and time per statement, empty unless timed """
+        return self._database.statement_stats()
+
+    def session_scope(self) -> ContextManager:
+        """ All storage calls of this thread within the scope share a session, closed when the scope ends """
+        return self._database.session_scope()
+
+    def transaction(self) -> ContextManager:
+        """ All changes of this thread within the transaction are committed together, or none on error """
+        return self._database.transaction()
+
+    def close_session(self):
+        """ Release all loaded objects, next lookup starts with a new session """
+        self._database.close_session()
+
+    def dispose(self):
+        """ Close all connections, a forked process must open its own """
+        self._database.dispose()
@@ -0,0 +1,202 @@
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    NamedTuple
+)
+from sqlalchemy import select
+from sqlalchemy.orm.session import Session
+
+from error import (
+    AlreadyExist,
+    DoesNotExist,
+    NotPossible
+)
+from format.etc_files import (
+    GroupEntry,
+    PasswdEntry,
+    ShadowEntry
+)
+
+from .db import Database
+from .generation_schema import generation_bumped_once
+from .group_membership import GroupMembership
+from .id_allocator import IdAllocatorSqlite
+from .group_schema import (
+    Group,
+    GroupId
+)
+from .password_schema import (
+    Password,
+    days_since_epoch
+)
+from .user_schema import (
+    User,
+    UserId
+)
+
+
+class ImportResult(NamedTuple):
+    users: int
+    groups: int
+    memberships: int
+    passwords: int
+
+
+class _Existing:
+
+    """ Names and ids already in the database, read once with a few Core queries """
+
+    def __init__(self, session: Session):
+        self.user_names = set(session.execute(select(User.name)).scalars())
+        self.user_ids = set(session.execute(select(User.id)).scalars())
+        self.primary_gids = set(session.execute(select(User.gid)).scalars())
+        self.group_ids = dict(session.execute(select(Group.name, Group.id)).all())
+
+
+class BulkImportSqlite:
+
+    """ Accounts from passwd, group and shadow entries, validated in memory and inserted in a single transaction
+
+    Only new accounts are imported, any collision with each other or the database fails the import before
+    anything is inserted. Users without a group for their gid get an own group with the same name, the same as
+    added with the commandline interface. Empty ids are allocated as blocks of consecutive free ids.
+
+    The transaction holds the write lock from reading the existing accounts until the import is inserted, changes
+    made meanwhile, such as with the commandline interface, wait for it.
+    """
+
+    BATCH_SIZE = 5000
+
+    def __init__(self, database: Database, ids: IdAllocatorSqlite = None):
+        self._database = database
+        self._ids = ids or IdAllocatorSqlite(database)
+
+    def import_accounts(self, users: Iterable[PasswdEntry] = (), groups: Iterable[GroupEntry] = (),
+                        passwords: Iterable[ShadowEntry] = ()) -> ImportResult:
+        with self._database.transaction() as session:
+            existing = _Existing(session)
+            groups = self._new_groups(groups, existing)
+            users = self._new_users(users, groups, existing)
+            self._allocate_ids(groups, users)
+            memberships = self._memberships(groups, users, existing)
+            passwords = self._passwords(passwords, users)
+            self._insert(session, (
+                (GroupId, [{"id": group.gid} for group in groups.values()]),
+                (Group, [{"name": group.name, "id": group.gid} for group in groups.values()]),
+                (UserId, [{"id": user.uid} for user in users.values()]),
+                (User, [self._user_row(user) for user in users.values()]),
+                (Password, [self._password_row(passwords.get(name), name) for name in users]),
+                (GroupMembership, memberships)
+            ))
+        return ImportResult(len(users), len(groups), len(memberships), len(passwords))
+
+    @staticmethod
+    def _new_groups(entries: Iterable[GroupEntry], existing: _Existing) -> Dict[str, GroupEntry]:
+        groups, gids = {}, set(existing.group_ids.values())
+        for group in entries:
+            if group.name in groups or group.name in existing.group_ids:
+                raise AlreadyExist("Group {name} already exist".format(name=group.name))
+            if group.gid is not None and group.gid in gids:
+                raise AlreadyExist("Group with id {gid} already exist".format(gid=group.gid))
+            groups[group.name] = group
+            gids.add(group.gid)
+        return groups
+
+    @staticmethod
+    def _new_users(entries: Iterable[PasswdEntry], groups: Dict[str, GroupEntry], existing: _Existing) -> Dict[str, PasswdEntry]:
+        """ Users by name, own groups for unknown or empty gids are added to groups """
+        users, uids, primary_gids = {}, set(existing.user_ids), set(existing.primary_gids)
+        gids = set(existing.group_ids.values())
+        gids.update(group.gid for group in groups.values())
+        for user in entries:
+            if user.name in users or user.name in existing.user_names:
+                raise AlreadyExist("User {name} already exist".format(name=user.name))
+            if user.uid is not None and user.uid in uids:
+                raise AlreadyExist("User with uid {uid} already exist".format(uid=user.uid))
+            if user.gid is not None and user.gid in primary_gids:
+                raise NotPossible("Group with id {gid} of user {name} is already the group of another user".format(gid=user.gid, name=user.name))
+            if user.gid is None:
+                # an own group, new or imported with an empty gid as well
+                own_group = groups.setdefault(user.name, GroupEntry(user.name, None, ()))
+                if own_group.gid is not None or user.name in existing.group_ids:
+                    raise NotPossible("Group {name} already exist, user {name} needs a gid".format(name=user.name))
+            elif user.gid not in gids:
+                if user.name in groups or user.name in existing.group_ids:
+                    raise NotPossible("Group {name} already exist, but not with id {gid}".format(name=user.name, gid=user.gid))
+                groups[user.name] = GroupEntry(user.name, user.gid, ())
+                gids.add(user.gid)
+            users[user.name] = user
+            uids.add(user.uid)
+            primary_gids.add(user.gid)
+        return users
+
+    def _allocate_ids(self, groups: Dict[str, GroupEntry], users: Dict[str, PasswdEntry]):
+        """ Empty ids are replaced with ids of reserved blocks, a user without gid gets the gid of its own group """
+        new_groups = [name for name, group in groups.items() if group.gid is None]
+        gids = self._ids.reserve_gids(len(new_groups), taken=(group.gid for group in groups.values() if group.gid is not None))
+        for name, gid in zip(new_groups, gids):
+            groups[name] = groups[name]._replace(gid=gid)
+        new_users = [name for name, user in users.items() if user.uid is None]
+        uids = self._ids.reserve_uids(len(new_users), taken=(user.uid for user in users.values() if user.uid is not None))
+        for name, uid in zip(new_users, uids):
+            users[name] = users[name]._replace(uid=uid)
+        for name, user in users.items():
+            if user.gid is None:
+                users[name] = user._replace(gid=groups[name].gid)
+
+    @staticmethod
+    def _memberships(groups: Dict[str, GroupEntry], users: Dict[str, PasswdEntry], existing: _Existing) -> List[Dict]:
+        memberships = []
+        for group in groups.values():
+            for member in group.members:
+                if member not in users and member not in existing.user_names:
+                    raise DoesNotExist("User {name}, member of group {group}, does not exist".format(name=member, group=group.name))
+                memberships.append({"user_name": member, "group_name": group.name})
+        return memberships
+
+    @staticmethod
+    def _passwords(entries: Iterable[ShadowEntry], users: Dict[str, PasswdEntry]) -> Dict[str, ShadowEntry]:
+        passwords = {}
+        for password in entries:
+            if password.name not in users:
+                raise DoesNotExist("User {name} with shadow entry is not imported".format(name=password.name))
+            if password.name in passwords:
+                raise AlreadyExist("Shadow entry for user {name} already exist".format(name=password.name))
+            passwords[password.name] = password
+        return passwords
+
+    @staticmethod
+    def _user_row(user: PasswdEntry) -> Dict:
+        return {
+            "name": user.name,
+            "id": user.uid,
+            "gid": user.gid,
+            "gecos": user.gecos,
+            "home_dir": user.home_dir,
+            "shell": user.shell
+        }
+
+    @staticmethod
+    def _password_row(password: ShadowEntry, name: str) -> Dict:
+        """ Empty shadow fields and users without shadow entry get the same defaults as added users """
+        if password is None:
+            password = ShadowEntry(name, Password.DEFAULT_PASSWD, None, None, None, None, None, None)
+        return {
+            "name": name,
+            "encrypted_password": password.encrypted_password,
+            "days_since_epoch_last_change": password.days_since_epoch_last_change if password.days_since_epoch_last_change is not None else days_since_epoch(),
+            "days_min": password.days_min if password.days_min is not None else Password.DEFAULT_MIN,
+            "days_max": password.days_max if password.days_max is not None else Password.DEFAULT_MAX,
+            "days_warn": password.days_warn if password.days_warn is not None else Password.DEFAULT_WARN,
+            "days_inactive": password.days_inactive,
+            "days_since_epoch_expires": password.days_since_epoch_expires
+        }
+
+    def _insert(self, session: Session, tables: tuple):
+        """ One executemany per batch of rows, bumping the generation once """
+        with generation_bumped_once(session.connection()):
+            for cls, rows in tables:
+                statement = cls.__table__.insert()
+                for start in range(0, len(rows), self.BATCH_SIZE):
+                    session.execute(statement, rows[start:start + self.BATCH_SIZE])
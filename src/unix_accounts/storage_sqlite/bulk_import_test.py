@@ -0,0 +1,140 @@
+import unittest
+
+from error import (
+    AlreadyExist,
+    DoesNotExist,
+    NotPossible
+)
+from format.etc_files import (
+    parse_group,
+    parse_passwd,
+    parse_shadow
+)
+
+from .schema import UnixAccountSchema
+from .api import SqliteDatabase
+from .bulk_import import (
+    BulkImportSqlite,
+    ImportResult
+)
+from .generation_api import DirectoryGenerationSqlite
+from .group_api import UnixGroupStorageSqlite
+from .password_api import UnixPasswordStorageSqlite
+from .user_api import UnixUserStorageSqlite
+
+
+class Files:
+    passwd = (
+        "# comment\n",
+        "alice:x:20001:20001:Alice:/home/alice:/bin/bash\n",
+        "bob:x:20002:20002::/home/bob:/bin/sh\n",
+        "\n"
+    )
+    group = (
+        "alice:x:20001:\n",
+        "developer:x:30000:alice,bob\n"
+    )
+    shadow = (
+        "alice:$6$salt$hash:19000:1:90:14:30:20000:\n",
+    )
+
+
+class BulkImportTest(unittest.TestCase):
+
+    def setUp(self):
+        database = SqliteDatabase(
+            UnixAccountSchema(),
+            ":memory:"
+        )
+        self.bulk_import = BulkImportSqlite(database)
+        self.users = UnixUserStorageSqlite(database)
+        self.groups = UnixGroupStorageSqlite(database)
+        self.password = UnixPasswordStorageSqlite(database)
+        self.generation = DirectoryGenerationSqlite(database)
+
+    def _import(self, passwd=Files.passwd, group=Files.group, shadow=Files.shadow) -> ImportResult:
+        return self.bulk_import.import_accounts(parse_passwd(passwd), parse_group(group), parse_shadow(shadow))
+
+    def test_import(self):
+        self.assertEqual(ImportResult(users=2, groups=3, memberships=2, passwords=1), self._import())
+        alice = self.users.get_by_name("alice")
+        self.assertEqual((20001, "alice", "Alice", "/home/alice", "/bin/bash"), (alice.uid, alice.group.name, alice.gecos, alice.home_dir, alice.shell))
+        self.assertEqual(("developer",), tuple(alice.group_membership))
+        self.assertCountEqual(["alice", "bob"], self.groups.get_by_id(30000).members)
+
+    def test_own_group_for_unknown_gid(self):
+        self._import()
+        bob = self.users.get_by_name("bob")
+        self.assertEqual(("bob", 20002), (bob.group.name, bob.group.id))
+        self.assertIsNone(bob.gecos)
+
+    def test_passwords(self):
+        self._import()
+        alice = self.password.get_by_name("alice")
+        self.assertEqual(("$6$salt$hash", 19000, 1, 90, 14, 30, 20000), (
+            alice.encrypted_password, alice.days_since_epoch_last_change, alice.days_min, alice.days_max,
+            alice.days_warn, alice.days_inactive, alice.days_since_epoch_expires))
+        bob = self.password.get_by_name("bob")
+        self.assertEqual(("*", 0, 99999, 7, None), (bob.encrypted_password, bob.days_min, bob.days_max, bob.days_warn, bob.days_inactive))
+
+    def test_members_already_existing(self):
+        self.users.add("carol", 10)
+        self._import(group=Files.group + ("admin:x:30001:carol,alice\n",))
+        self.assertCountEqual(["carol", "alice"], self.groups.get_by_name("admin").members)
+
+    def test_generation_bumped_once(self):
+        before = self.generation.get()
+        self._import()
+        self.assertEqual(before + 1, self.generation.get())
+        self.users.delete("bob")
+        self.assertGreater(self.generation.get(), before + 1)
+
+    def test_existing_user(self):
+        self.users.add("alice", 10)
+        with self.assertRaises(AlreadyExist):
+            self._import(group=())
+        self.assertEqual(["alice"], [user.name for user in self.users.get_all()])
+
+    def test_uid_collision(self):
+        with self.assertRaises(AlreadyExist):
+            self._import(passwd=Files.passwd + ("carol:x:20001:20003::/home/carol:/bin/sh\n",))
+        self.assertEqual([], self.users.get_all())
+
+    def test_gid_collision(self):
+        with self.assertRaises(AlreadyExist):
+            self._import(group=Files.group + ("other:x:30000:\n",))
+
+    def test_shared_primary_group(self):
+        with self.assertRaises(NotPossible):
+            self._import(passwd=Files.passwd + ("carol:x:20003:20001::/home/carol:/bin/sh\n",))
+
+    def test_nonexisting_member(self):
+        with self.assertRaises(DoesNotExist):
+            self._import(group=Files.group + ("admin:x:30001:nonexisting-user\n",))
+        self.assertEqual([], self.groups.get_all())
+
+    def test_shadow_entry_without_user(self):
+        with self.assertRaises(DoesNotExist):
+            self._import(shadow=Files.shadow + ("nonexisting-user:*:19000:0:99999:7:::\n",))
+
+    def test_empty_ids_allocated(self):
+        self.users.add("dave")
+        self._import(passwd=Files.passwd + ("carol:x:::Carol:/home/carol:/bin/sh\n",), group=Files.group + ("staff:x::carol\n",))
+        # blocks of free ids, besides the ones of the database and the import:
+        carol = self.users.get_by_name("carol")
+        self.assertEqual((10001, "carol", 10002), (carol.uid, carol.group.name, carol.group.id))
+        self.assertEqual(10001, self.groups.get_by_name("staff").id)
+
+    def test_empty_gid_of_existing_group(self):
+        with self.assertRaises(NotPossible):
+            self._import(passwd=Files.passwd + ("developer:x:20003::::/bin/sh\n",))
+
+    def test_malformed_line(self):
+        with self.assertRaises(NotPossible):
+            self._import(passwd=("alice:x:20001\n",))
+        with self.assertRaises(NotPossible):
+            self._import(passwd=("alice:x:uid:20001::/home/alice:/bin/bash\n",))
+
+
+if __name__ == '__main__':
+    unittest.main()
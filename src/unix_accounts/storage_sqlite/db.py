@@ -2,6 +2,7 @@ from abc import (
     ABC,
     abstractmethod
 )
+from typing import ContextManager
 
 from sqlalchemy.orm.session import Session
 
@@ -14,3 +15,24 @@ class Database(ABC):
     @abstractmethod
     def session(self) -> Session:
         pass
+
+    @abstractmethod
+    def close_session(self):
+        pass
+
+    @abstractmethod
+    def session_scope(self) -> ContextManager[Session]:
+        pass
+
+    @abstractmethod
+    def transaction(self) -> ContextManager[Session]:
+        pass
+
+    @property
+    @abstractmethod
+    def in_transaction(self) -> bool:
+        pass
+
+    @abstractmethod
+    def dispose(self):
+        pass
@@ -1,3 +1,9 @@
+from contextlib import contextmanager
+from typing import (
+    Dict,
+    Iterator
+)
+import threading
 import sqlalchemy
 from sqlalchemy.orm import (
     sessionmaker,
@@ -7,10 +13,18 @@ import sqlalchemy.event
 import sqlalchemy.exc
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm.session import Session
+from sqlalchemy.pool import QueuePool
 
-from error import InternalError
+from error import (
+    InternalError,
+    NotPossible
+)
 from .schema import Schema
 from .db import Database
+from .statement_timer import (
+    StatementStats,
+    StatementTimer
+)
 
 
 @sqlalchemy.event.listens_for(Engine, "connect")
@@ -23,14 +37,92 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
 
 class SqliteDatabase(Database):
 
-    def __init__(self, model: Schema, db=":memory:", verbose=False):
-        engine = sqlalchemy.create_engine("sqlite:///{db}".format(db=db), echo=verbose)
-        self._session_maker = scoped_session(sessionmaker(bind=engine))
+    def __init__(self, model: Schema, db=":memory:", verbose=False, slow_statement_threshold: float = None):
+        self._engine = sqlalchemy.create_engine("sqlite:///{db}".format(db=db), echo=verbose, **self._pool_args(db))
+        self._session_maker = scoped_session(sessionmaker(bind=self._engine))
+        self._scopes = threading.local()
         try:
-            model.init(engine)
+            model.init(self._engine)
         except sqlalchemy.exc.OperationalError as err:
             raise InternalError("{db}: {msg}".format(db=db, msg=err))
+        # Timed after schema setup, only lookups and changes are of interest:
+        self._statement_timer = StatementTimer(self._engine, slow_statement_threshold) if slow_statement_threshold is not None else None
+
+    @staticmethod
+    def _pool_args(db: str) -> Dict:
+        """ Keep connections of a file database, instead of reconnecting each time a session is closed
+
+        A connection is used by one thread at a time, the pool takes care of that. In-memory databases keep the default,
+        one connection per thread.
+        """
+        if db == ":memory:":
+            return {}
+        return dict(poolclass=QueuePool, max_overflow=-1, connect_args=dict(check_same_thread=False))
 
     @property
     def session(self) -> Session:
         return self._session_maker()
+
+    def close_session(self):
+        self._session_maker.remove()
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """ Session of this thread, closed with all loaded objects when the outermost scope ends """
+        self._scopes.depth = getattr(self._scopes, "depth", 0) + 1
+        try:
+            yield self.session
+        finally:
+            self._scopes.depth -= 1
+            if not self._scopes.depth:
+                self.close_session()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Session]:
+        """ Changes of all storage calls of this thread within are committed once when the transaction ends
+
+        Storage calls flush their changes instead of committing them, on error all changes are rolled back. A
+        transaction within a transaction is a savepoint, on error only its changes are rolled back.
+        """
+        if self.in_transaction:
+            with self.session_scope() as session, session.begin_nested():
+                yield session
+            return
+        with self.session_scope() as session:
+            self._begin(session)
+            self._scopes.transaction = True
+            try:
+                yield session
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+            finally:
+                self._scopes.transaction = False
+
+    @staticmethod
+    def _begin(session: Session):
+        """ Begin explicitly, the driver otherwise begins with the first change only
+
+        A savepoint before that would start a transaction of its own, committed when the savepoint is released. The
+        write lock is taken right away, lookups within the transaction see no changes of others until it ends.
+        """
+        connection = session.connection()
+        if not connection.connection.in_transaction:
+            try:
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+            except sqlalchemy.exc.OperationalError as err:
+                # locked longer than the busy timeout, such as by an ongoing import:
+                session.rollback()
+                raise NotPossible("Database is busy with another change, try again: {msg}".format(msg=err.orig))
+
+    @property
+    def in_transaction(self) -> bool:
+        return getattr(self._scopes, "transaction", False)
+
+    def statement_stats(self) -> Dict[str, StatementStats]:
+        return self._statement_timer.stats() if self._statement_timer else {}
+
+    def dispose(self):
+        self._session_maker.remove()
+        self._engine.dispose()
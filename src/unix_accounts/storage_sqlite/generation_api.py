@@ -0,0 +1,18 @@
+from storage import DirectoryGeneration
+
+from .generation_schema import Generation
+from .sqlite_api import (
+    Database,
+    DatabaseApi
+)
+
+
+class DirectoryGenerationSqlite(DirectoryGeneration):
+
+    def __init__(self, db: Database):
+        self._db = DatabaseApi(db)
+
+    def get(self) -> int:
+        # Query the column, not the object, to not get a stale value from the session identity map
+        value, = self._db.get_one(Generation.value, filters=(Generation.id == Generation.ID,))
+        return value
@@ -0,0 +1,58 @@
+import unittest
+
+from .schema import UnixAccountSchema
+from .api import SqliteDatabase
+from .generation_api import DirectoryGenerationSqlite
+from .user_api import UnixUserStorageSqlite
+from .group_api import UnixGroupStorageSqlite
+from .group_member_api import UnixGroupMemberStorageSqlite
+
+
+class Defaults:
+    user = "user"
+    group = "group"
+
+
+class DirectoryGenerationTest(unittest.TestCase):
+
+    def setUp(self):
+        database = SqliteDatabase(
+            UnixAccountSchema(),
+            ":memory:"
+        )
+        self.generation = DirectoryGenerationSqlite(database)
+        self.users = UnixUserStorageSqlite(database)
+        self.groups = UnixGroupStorageSqlite(database)
+        self.grp_member = UnixGroupMemberStorageSqlite(database)
+
+    def _assert_changes_generation(self, fn, *args):
+        before = self.generation.get()
+        fn(*args)
+        self.assertNotEqual(before, self.generation.get())
+
+    def test_unchanged_generation_on_lookups(self):
+        self.users.add(Defaults.user)
+        before = self.generation.get()
+        self.users.get_all()
+        self.groups.get_all()
+        self.assertEqual(before, self.generation.get())
+
+    def test_add_user_changes_generation(self):
+        self._assert_changes_generation(self.users.add, Defaults.user)
+
+    def test_update_user_id_changes_generation(self):
+        self.users.add(Defaults.user)
+        self._assert_changes_generation(self.users.update_id, Defaults.user, 12345)
+
+    def test_delete_user_changes_generation(self):
+        self.users.add(Defaults.user)
+        self._assert_changes_generation(self.users.delete, Defaults.user)
+
+    def test_update_group_name_changes_generation(self):
+        self.groups.add(Defaults.group)
+        self._assert_changes_generation(self.groups.update_name, Defaults.group, "new-name")
+
+    def test_add_member_changes_generation(self):
+        self.users.add(Defaults.user)
+        self.groups.add(Defaults.group)
+        self._assert_changes_generation(self.grp_member.add_member, Defaults.user, Defaults.group)
@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from sqlalchemy import (
+    Column,
+    Integer,
+    DDL,
+    text,
+)
+from sqlalchemy.engine import Connection
+
+from .schema_base import SchemaBase
+
+# Any change in these tables bumps the generation
+DIRECTORY_TABLES = ("user_id", "user", "group_id", "group", "user_group_membership", "password")
+
+
+class Generation(SchemaBase):
+
+    """ Single row counter, bumped by triggers on every change in the directory, also from other processes """
+
+    ID = 1
+
+    __tablename__ = "generation"
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
+
+
+def _triggers():
+    for table in DIRECTORY_TABLES:
+        for operation in ("insert", "update", "delete"):
+            yield "generation_{table}_{operation}".format(table=table, operation=operation), table, operation
+
+
+def _generation_triggers():
+    for name, table, operation in _triggers():
+        yield DDL(
+            "CREATE TRIGGER IF NOT EXISTS \"{name}\" AFTER {operation} ON \"{table}\" "
+            "BEGIN UPDATE generation SET value = value + 1 WHERE id = {id}; END".format(
+                name=name,
+                table=table,
+                operation=operation,
+                id=Generation.ID
+            ))
+
+
+def create_generation(connection: Connection):
+    """ Create the counter row and triggers, idempotent to also upgrade existing databases """
+    connection.execute(
+        text("INSERT OR IGNORE INTO generation (id, value) VALUES (:id, 0)"), dict(id=Generation.ID))
+    for trigger in _generation_triggers():
+        connection.execute(trigger)
+
+
+@contextmanager
+def generation_bumped_once(connection: Connection):
+    """ Bump the generation once for all changes made within, instead of once per changed row
+
+    The triggers are dropped and created again within the ongoing transaction of the connection. Other connections
+    never see them missing, and a rollback restores them.
+    """
+    connection.execute(text("UPDATE generation SET value = value + 1 WHERE id = :id"), dict(id=Generation.ID))
+    for name, _, _ in _triggers():
+        connection.execute(DDL("DROP TRIGGER IF EXISTS \"{name}\"".format(name=name)))
+    yield
+    for trigger in _generation_triggers():
+        connection.execute(trigger)
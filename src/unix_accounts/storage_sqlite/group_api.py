@@ -1,5 +1,14 @@
-from typing import List
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Tuple
+)
 import sqlalchemy.exc
+from sqlalchemy import (
+    or_,
+    select
+)
 
 from group import UnixGroup
 from error import (
@@ -8,27 +17,55 @@ from error import (
     NotPossible
 )
 from storage.groups import UnixGroupStorage
+from storage.page import PageOrder
 
 from .sqlite_api import (
     Database,
-    DatabaseApi
+    DatabaseApi,
+    transactional
 )
 from .group_schema import (
     Group,
     GroupId
 )
-from .group_fmt import fmt_group
+from .group_fmt import (
+    PRELOAD,
+    fmt_group
+)
+from .group_membership import GroupMembership
+from .id_allocator import IdAllocatorSqlite
+from .user_schema import User
+
+
+PAGE_KEYS = {
+    PageOrder.NAME: Group.name,
+    PageOrder.ID: Group.id
+}
+
+
+def by_member(user: str) -> Tuple[tuple, tuple]:
+    """ Filters and order for all groups of the user, the primary group first
+
+    Memberships are found through the primary key index of user_group_membership, which leads with user_name.
+    """
+    primary_gid = select(User.gid).where(User.name == user).scalar_subquery()
+    member_of = select(GroupMembership.group_name).where(GroupMembership.user_name == user)
+    filters = (or_(Group.id == primary_gid, Group.name.in_(member_of)),)
+    order_by = ((Group.id == primary_gid).desc(), Group.name)
+    return filters, order_by
 
 
 class UnixGroupStorageSqlite(UnixGroupStorage):
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, ids: IdAllocatorSqlite = None):
         self._db = DatabaseApi(db)
+        self._ids = ids or IdAllocatorSqlite(db)
 
-    def add(self, name: str, gid: int = None) -> UnixGroup:
+    @transactional
+    def add(self, name: str, gid: int = None, system: bool = False) -> UnixGroup:
         grp = Group()
         grp.name = name
-        grp.group_id = GroupId(id=gid)
+        grp.group_id = GroupId(id=gid or self._ids.gid(system))
         try:
             self._db.add(grp)
         except sqlalchemy.exc.IntegrityError:
@@ -39,6 +76,7 @@ class UnixGroupStorageSqlite(UnixGroupStorage):
             raise AlreadyExist(msg)
         return fmt_group(grp)
 
+    @transactional
     def update_id(self, name: str, new_id: int) -> UnixGroup:
         try:
             group = self._try_update_id(name, new_id)
@@ -52,8 +90,10 @@ class UnixGroupStorageSqlite(UnixGroupStorage):
         group = self._db.get_one(Group, filters=(Group.name == name,))
         group.group_id.id = new_id
         self._db.update()
+        self._db.expire(group)
         return group
 
+    @transactional
     def update_name(self, name: str, new_name: str) -> UnixGroup:
         try:
             group = self._try_update_name(name, new_name)
@@ -69,6 +109,7 @@ class UnixGroupStorageSqlite(UnixGroupStorage):
         self._db.update()
         return group
 
+    @transactional
     def delete(self, name: str):
         try:
             group = self._db.get_one(Group, filters=(Group.name == name,))
@@ -93,5 +134,22 @@ class UnixGroupStorageSqlite(UnixGroupStorage):
             raise DoesNotExist("Group {name} does not exist".format(name=name))
 
     def get_all(self) -> List[UnixGroup]:
-        groups = self._db.get(Group)
+        groups = self._db.get(Group, preload=PRELOAD)
         return [fmt_group(grp) for grp in groups]
+
+    def get_by_member(self, user: str) -> List[UnixGroup]:
+        filters, order_by = by_member(user)
+        groups = self._db.get(Group, filters, preload=PRELOAD, order_by=order_by)
+        return [fmt_group(group) for group in groups]
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[UnixGroup]:
+        for group in self._db.iterate(Group, preload=PRELOAD, chunk_size=chunk_size):
+            yield fmt_group(group)
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixGroup]:
+        groups = self._db.page(Group, PAGE_KEYS[order], limit, after, preload=PRELOAD)
+        return [fmt_group(group) for group in groups]
+
+    def get_many(self, names: Iterable[str] = (), gids: Iterable[int] = ()) -> List[UnixGroup]:
+        groups = self._db.get_in(Group, ((Group.name, names), (Group.id, gids)), preload=PRELOAD)
+        return [fmt_group(group) for group in groups]
@@ -1,14 +1,18 @@
 import unittest
+import sqlalchemy.event
 
 from error import AlreadyExist, DoesNotExist
+from storage import PageOrder
 
 from .schema import UnixAccountSchema
 from .api import SqliteDatabase
 from .user_api import UnixUserStorageSqlite
 from .group_api import UnixGroupStorageSqlite
+from .group_member_api import UnixGroupMemberStorageSqlite
 
 
 class Defaults:
+    user = "user"
     group = "group"
     gid = 10000
 
@@ -20,13 +24,20 @@ class UnixGroupStorageTest(unittest.TestCase):
             UnixAccountSchema(),
             ":memory:"
         )
+        self.database = database
         self.users = UnixUserStorageSqlite(database)
         self.groups = UnixGroupStorageSqlite(database)
+        self.group_members = UnixGroupMemberStorageSqlite(database)
 
     def test_add_group(self):
         group = self.groups.add(Defaults.group)
         self.assertEqual(Defaults.group, group.name)
 
+    def test_add_group_with_allocated_gid(self):
+        self.groups.add("first")
+        self.assertEqual(10001, self.groups.add(Defaults.group).id)
+        self.assertEqual(100, self.groups.add("system", system=True).id)
+
     def test_add_group_with_existing_name(self):
         self.groups.add(Defaults.group)
         with self.assertRaises(AlreadyExist):
@@ -87,3 +98,87 @@ class UnixGroupStorageTest(unittest.TestCase):
     def test_get_nonexisting_group_by_gid(self):
         with self.assertRaises(DoesNotExist):
            self.groups.get_by_id(Defaults.gid)
+
+    def test_iter_all_groups(self):
+        names = ["group-{n}".format(n=n) for n in range(5)]
+        for name in names:
+            self.groups.add(name)
+        groups = self.groups.iter_all(chunk_size=2)
+        self.assertCountEqual(names, [group.name for group in groups])
+
+    def test_get_many(self):
+        for gid, name in enumerate(("a", "b", "c"), start=Defaults.gid):
+            self.groups.add(name, gid)
+        groups = self.groups.get_many(names=("b",), gids=(Defaults.gid, 123))
+        self.assertCountEqual(["a", "b"], [group.name for group in groups])
+
+    def test_get_by_member(self):
+        self.users.add(Defaults.user)
+        for name in ("c", "b", "a"):
+            self.groups.add(name)
+        for name in ("c", "a"):
+            self.group_members.add_member(Defaults.user, name)
+        groups = self.groups.get_by_member(Defaults.user)
+        self.assertEqual([Defaults.user, "a", "c"], [group.name for group in groups])
+        self.assertEqual((Defaults.user,), groups[1].members)
+
+    def _get_by_member_statements(self, user: str) -> list:
+        self.database.close_session()
+        statements = []
+        listener = lambda conn, cursor, statement, parameters, *args: statements.append((statement, parameters))
+        sqlalchemy.event.listen(self.database.session.get_bind(), "before_cursor_execute", listener)
+        self.groups.get_by_member(user)
+        sqlalchemy.event.remove(self.database.session.get_bind(), "before_cursor_execute", listener)
+        return statements
+
+    def test_get_by_member_with_indexed_lookups_only(self):
+        self.users.add(Defaults.user)
+        self.groups.add(Defaults.group)
+        self.group_members.add_member(Defaults.user, Defaults.group)
+        few = self._get_by_member_statements(Defaults.user)
+        for n in range(20):
+            name = "other-{n}".format(n=n)
+            self.users.add(name)
+            self.group_members.add_member(name, Defaults.group)
+        statements = self._get_by_member_statements(Defaults.user)
+        # the groups, then their members:
+        self.assertEqual(2, len(statements))
+        self.assertEqual(len(few), len(statements))
+        connection = self.database.session.connection()
+        for statement, parameters in statements:
+            plan = [row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+            self.assertEqual([], [step for step in plan if step.startswith(("SCAN", "MATERIALIZE"))], statement)
+
+    def test_get_by_nonexisting_member(self):
+        self.assertEqual([], self.groups.get_by_member("nonexisting-user"))
+
+    def test_get_page_by_name(self):
+        for gid, name in enumerate(("c", "a", "b"), start=Defaults.gid):
+            self.groups.add(name, gid)
+        self.assertEqual(["a", "b"], [group.name for group in self.groups.get_page(2)])
+        self.assertEqual(["c"], [group.name for group in self.groups.get_page(2, after="b")])
+
+    def test_get_page_by_id(self):
+        for gid, name in enumerate(("c", "a", "b"), start=Defaults.gid):
+            self.groups.add(name, gid)
+        groups = self.groups.get_page(1, after=Defaults.gid, order=PageOrder.ID)
+        self.assertEqual(["a"], [group.name for group in groups])
+
+    def test_get_all_statements_independent_of_groups(self):
+        def count_statements() -> int:
+            self.database.close_session()
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            sqlalchemy.event.listen(self.database.session.get_bind(), "before_cursor_execute", listener)
+            self.groups.get_all()
+            sqlalchemy.event.remove(self.database.session.get_bind(), "before_cursor_execute", listener)
+            return len(statements)
+        self.users.add(Defaults.user)
+        for n in range(3):
+            self.groups.add("group-{n}".format(n=n))
+            self.group_members.add_member(Defaults.user, "group-{n}".format(n=n))
+        few = count_statements()
+        for n in range(3, 20):
+            self.groups.add("group-{n}".format(n=n))
+            self.group_members.add_member(Defaults.user, "group-{n}".format(n=n))
+        self.assertEqual(few, count_statements())
@@ -1,9 +1,15 @@
 from typing import Tuple
+from sqlalchemy.orm import selectinload
 
 from group import UnixGroup
 from .group_schema import Group
 from .user_schema import User
 
+# Members of many groups with one more query, instead of lazy loading them per group:
+PRELOAD = (
+    selectinload(Group.user_membership),
+)
+
 
 def _fmt_user_members(users: Tuple[User]) -> Tuple[str]:
     return tuple(user.name for user in users)
@@ -1,4 +1,13 @@
+from typing import (
+    Iterable,
+    Iterator,
+    List
+)
 import sqlalchemy.exc
+from sqlalchemy import (
+    literal,
+    select
+)
 
 from error import (
     AlreadyExist,
@@ -9,18 +18,39 @@ from storage import UnixGroupMemberStorage
 
 from .group_schema import Group
 from .group_fmt import fmt_group
+from .group_membership import GroupMembership
 from .user_schema import User
 from .sqlite_api import (
     Database,
-    DatabaseApi
+    DatabaseApi,
+    transactional
 )
 
+MEMBERSHIPS = GroupMembership.__table__
+
+# User names per statement, to stay below the limit of bound parameters:
+CHUNK_SIZE = 500
+
+
+def _unique(names: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(names))
+
+
+def _chunks(names: List[str]) -> Iterator[List[str]]:
+    for start in range(0, len(names), CHUNK_SIZE):
+        yield names[start:start + CHUNK_SIZE]
+
+
+def _fmt_names(names: Iterable[str]) -> str:
+    return ", ".join(names)
+
 
 class UnixGroupMemberStorageSqlite(UnixGroupMemberStorage):
 
     def __init__(self, db: Database):
         self._db = DatabaseApi(db)
 
+    @transactional
     def add_member(self, user: str, group: str) -> UnixGroup:
         group = self._try_add_member(*self._try_load_member(user, group))
         return fmt_group(group)
@@ -34,16 +64,20 @@ class UnixGroupMemberStorageSqlite(UnixGroupMemberStorage):
         return group
 
     def _try_load_member(self, user: str, group: str):
-        try:
-            group = self._db.get_one(Group, filters=(Group.name == group,))
-        except sqlalchemy.exc.NoResultFound:
-            raise DoesNotExist("Group {grp} does not exist".format(grp=group))
+        group = self._try_load_group(group)
         try:
             user = self._db.get_one(User, filters=(User.name == user,))
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User {user} does not exist".format(user=user))
         return user, group
 
+    def _try_load_group(self, group: str) -> Group:
+        try:
+            return self._db.get_one(Group, filters=(Group.name == group,))
+        except sqlalchemy.exc.NoResultFound:
+            raise DoesNotExist("Group {grp} does not exist".format(grp=group))
+
+    @transactional
     def delete_member(self, user: str, group: str) -> UnixGroup:
         group = self._try_delete_member(*self._try_load_member(user, group))
         return fmt_group(group)
@@ -55,3 +89,59 @@ class UnixGroupMemberStorageSqlite(UnixGroupMemberStorage):
         else:
             raise DoesNotExist("User {user} is not a member of {grp}".format(user=user.name, grp=group.name))
         return group
+
+    # Many members at once are changed with one statement per chunk of users, without loading the members as objects:
+
+    @transactional
+    def add_members(self, group: str, users: Iterable[str]) -> UnixGroup:
+        group = self._try_load_group(group)
+        users = _unique(users)
+        members = self._members(group.name)
+        already_members = [user for user in users if user in members]
+        if already_members:
+            raise AlreadyExist("Already members of {grp}: {users}".format(grp=group.name, users=_fmt_names(already_members)))
+        self._insert_members(group.name, users)
+        return self._fmt_changed(group)
+
+    @transactional
+    def remove_members(self, group: str, users: Iterable[str]) -> UnixGroup:
+        group = self._try_load_group(group)
+        users = _unique(users)
+        members = self._members(group.name)
+        not_members = [user for user in users if user not in members]
+        if not_members:
+            raise DoesNotExist("Not members of {grp}: {users}".format(grp=group.name, users=_fmt_names(not_members)))
+        self._delete_members(group.name, users)
+        return self._fmt_changed(group)
+
+    @transactional
+    def set_members(self, group: str, users: Iterable[str]) -> UnixGroup:
+        group = self._try_load_group(group)
+        users = _unique(users)
+        members = self._members(group.name)
+        new_members = set(users)
+        self._delete_members(group.name, [user for user in members if user not in new_members])
+        self._insert_members(group.name, [user for user in users if user not in members])
+        return self._fmt_changed(group)
+
+    def _members(self, group: str) -> set:
+        return set(self._db.scalars(select(MEMBERSHIPS.c.user_name).where(MEMBERSHIPS.c.group_name == group)))
+
+    def _insert_members(self, group: str, users: List[str]):
+        """ INSERT ... SELECT from the users, users that don't exist are not inserted and fail the change """
+        for chunk in _chunks(users):
+            existing_users = select(User.name, literal(group)).where(User.name.in_(chunk))
+            inserted = self._db.execute(MEMBERSHIPS.insert().from_select(("user_name", "group_name"), existing_users))
+            if inserted < len(chunk):
+                existing = set(self._db.scalars(select(User.name).where(User.name.in_(chunk))))
+                missing = [user for user in chunk if user not in existing]
+                raise DoesNotExist("Users that don't exist: {users}".format(users=_fmt_names(missing)))
+
+    def _delete_members(self, group: str, users: List[str]):
+        for chunk in _chunks(users):
+            self._db.execute(MEMBERSHIPS.delete().where(MEMBERSHIPS.c.group_name == group, MEMBERSHIPS.c.user_name.in_(chunk)))
+
+    def _fmt_changed(self, group: Group) -> UnixGroup:
+        """ Members loaded before the change are stale, the group is formatted with its members loaded again """
+        self._db.expire_all()
+        return fmt_group(group)
@@ -72,3 +72,77 @@ class UnixGroupMemberStorageTest(unittest.TestCase):
         self._add_user_and_group()
         with self.assertRaises(DoesNotExist):
             self.grp_member.delete_member(Defaults.user, Defaults.group)
+
+    def _add_users(self, *names):
+        for name in names:
+            self.users.add(name)
+
+    def test_add_members(self):
+        self._add_user_and_group()
+        self._add_users("foo", "bar")
+        grp = self.grp_member.add_members(Defaults.group, ("foo", "bar", "foo"))
+        self.assertCountEqual(("foo", "bar"), grp.members)
+        self.assertCountEqual(("foo", "bar"), self.groups.get_by_name(Defaults.group).members)
+
+    def test_add_members_with_nonexisting_user(self):
+        self._add_user_and_group()
+        with self.assertRaisesRegex(DoesNotExist, "nonexisting-user"):
+            self.grp_member.add_members(Defaults.group, (Defaults.user, "nonexisting-user"))
+        self.assertEqual((), self.groups.get_by_name(Defaults.group).members)
+
+    def test_add_members_to_nonexisting_group(self):
+        self._add_user_and_group()
+        with self.assertRaises(DoesNotExist):
+            self.grp_member.add_members("nonexisting-group", (Defaults.user,))
+
+    def test_add_already_existing_members(self):
+        self._add_user_and_group()
+        self._add_users("foo")
+        self.grp_member.add_member(Defaults.user, Defaults.group)
+        with self.assertRaisesRegex(AlreadyExist, Defaults.user):
+            self.grp_member.add_members(Defaults.group, ("foo", Defaults.user))
+        self.assertEqual((Defaults.user,), self.groups.get_by_name(Defaults.group).members)
+
+    def test_add_members_in_chunks(self):
+        self.groups.add(Defaults.group)
+        names = ["user{n}".format(n=n) for n in range(1200)]
+        self._add_users(*names)
+        grp = self.grp_member.add_members(Defaults.group, names)
+        self.assertCountEqual(names, grp.members)
+
+    def test_remove_members(self):
+        self._add_user_and_group()
+        self._add_users("foo", "bar")
+        self.grp_member.add_members(Defaults.group, (Defaults.user, "foo", "bar"))
+        grp = self.grp_member.remove_members(Defaults.group, ("foo", Defaults.user))
+        self.assertEqual(("bar",), grp.members)
+
+    def test_remove_nonexisting_members(self):
+        self._add_user_and_group()
+        self._add_users("foo")
+        self.grp_member.add_member(Defaults.user, Defaults.group)
+        with self.assertRaisesRegex(DoesNotExist, "foo"):
+            self.grp_member.remove_members(Defaults.group, (Defaults.user, "foo"))
+        self.assertEqual((Defaults.user,), self.groups.get_by_name(Defaults.group).members)
+
+    def test_set_members(self):
+        self._add_user_and_group()
+        self._add_users("foo", "bar")
+        self.grp_member.add_members(Defaults.group, (Defaults.user, "foo"))
+        grp = self.grp_member.set_members(Defaults.group, ("foo", "bar"))
+        self.assertCountEqual(("foo", "bar"), grp.members)
+        grp = self.grp_member.set_members(Defaults.group, ())
+        self.assertEqual((), grp.members)
+
+    def test_set_members_with_nonexisting_user(self):
+        self._add_user_and_group()
+        self.grp_member.add_member(Defaults.user, Defaults.group)
+        with self.assertRaises(DoesNotExist):
+            self.grp_member.set_members(Defaults.group, ("nonexisting-user",))
+        self.assertEqual((Defaults.user,), self.groups.get_by_name(Defaults.group).members)
+
+    def test_members_of_user_after_add_members(self):
+        self._add_user_and_group()
+        self.assertEqual((), self.users.get_by_name(Defaults.user).group_membership)
+        self.grp_member.add_members(Defaults.group, (Defaults.user,))
+        self.assertEqual((Defaults.group,), self.users.get_by_name(Defaults.user).group_membership)
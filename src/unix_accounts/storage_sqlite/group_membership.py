@@ -10,4 +10,5 @@ from .schema_base import SchemaBase
 class GroupMembership(SchemaBase):
     __tablename__ = "user_group_membership"
     user_name = Column(String(64), ForeignKey("user.name", onupdate="CASCADE", ondelete="CASCADE"), primary_key=True)
-    group_name = Column(String(64), ForeignKey("group.name", onupdate="CASCADE", ondelete="CASCADE"), primary_key=True)
+    # the primary key indexes user_name first, members of a group are looked up by group_name alone
+    group_name = Column(String(64), ForeignKey("group.name", onupdate="CASCADE", ondelete="CASCADE"), primary_key=True, index=True)
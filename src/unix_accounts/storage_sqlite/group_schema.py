@@ -4,7 +4,6 @@ from sqlalchemy.sql import func
 from sqlalchemy import (
     Column,
     ForeignKey,
-    Sequence,
     String,
     Integer,
     DateTime
@@ -14,10 +13,11 @@ from .schema_base import SchemaBase
 from .group_membership import GroupMembership
 
 
-# sqlite don't support auto-increment on non-primary keys, thus id is a separate table
+# sqlite don't support auto-increment on non-primary keys, thus id is a separate table. Ids are allocated within
+# configured ranges, see id_allocator
 class GroupId(SchemaBase):
     __tablename__ = "group_id"
-    id = Column(Integer, Sequence('uid_sequence', minvalue=10000), primary_key=True)
+    id = Column(Integer, primary_key=True)
     group = relationship("Group", uselist=False, back_populates="group_id")
 
 
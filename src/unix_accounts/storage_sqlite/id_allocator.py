@@ -0,0 +1,149 @@
+from bisect import bisect_left
+from typing import (
+    Iterable,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple
+)
+from sqlalchemy import (
+    Integer,
+    bindparam,
+    func,
+    select
+)
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from error import NotPossible
+
+from .db import Database
+from .group_schema import GroupId
+from .user_schema import UserId
+
+
+class IdRange(NamedTuple):
+    first: int
+    last: int
+
+    def __str__(self):
+        return "{first}-{last}".format(first=self.first, last=self.last)
+
+
+class IdRanges(NamedTuple):
+    """ Ranges of allocated ids, defaults as UID_MIN, UID_MAX and SYS_UID_MIN, SYS_UID_MAX in login.defs(5) """
+    users: IdRange = IdRange(10000, 60000)
+    groups: IdRange = IdRange(10000, 60000)
+    system: IdRange = IdRange(100, 999)
+
+
+def _first_taken(table) -> Select:
+    return select(func.min(table.id)).where(table.id >= bindparam("first", type_=Integer))
+
+
+def _first_gap(table) -> Select:
+    """ First id after the lowest taken id within :first and :last followed by at least :count free ids
+
+    Ids are read in order from the primary key, each with a lookup of the id following it, until the first gap.
+    """
+    last = bindparam("last", type_=Integer)
+    following = aliased(table)
+    next_taken = func.coalesce(select(func.min(following.id)).where(following.id > table.id).scalar_subquery(), last + 1)
+    return select(table.id + 1) \
+        .where(table.id.between(bindparam("first", type_=Integer), last)) \
+        .where(func.min(next_taken, last + 1) - table.id > bindparam("count", type_=Integer)) \
+        .order_by(table.id) \
+        .limit(1)
+
+
+_STATEMENTS = {
+    table: (_first_taken(table), _first_gap(table)) for table in (UserId, GroupId)
+}
+
+
+class IdAllocatorSqlite:
+
+    """ Lowest free ids within the configured ranges
+
+    Ids are free until inserted, allocate and insert them within one transaction. It holds the write lock from its
+    start, other allocations wait until it ends and never get the same ids.
+    """
+
+    def __init__(self, database: Database, ranges: IdRanges = IdRanges()):
+        self._database = database
+        self._ranges = ranges
+
+    def uid(self, system: bool = False) -> int:
+        return self.reserve_uids(1, system)[0]
+
+    def gid(self, system: bool = False) -> int:
+        return self.reserve_gids(1, system)[0]
+
+    def uid_and_gid(self, system: bool = False) -> Tuple[int, int]:
+        """ The same id as uid and gid if any is free as both, within the ranges of both, else the lowest free of each """
+        if system:
+            id_range = self._ranges.system
+        else:
+            id_range = IdRange(max(self._ranges.users.first, self._ranges.groups.first), min(self._ranges.users.last, self._ranges.groups.last))
+        same_id = self._first_free((UserId, GroupId), id_range, 1, ())
+        if same_id is not None:
+            return same_id, same_id
+        return self.uid(system), self.gid(system)
+
+    def reserve_uids(self, count: int, system: bool = False, taken: Iterable[int] = ()) -> range:
+        """ Block of count consecutive free uids, none of them in taken such as ids about to be inserted """
+        return self._reserve(UserId, self._ranges.system if system else self._ranges.users, count, "uid", taken)
+
+    def reserve_gids(self, count: int, system: bool = False, taken: Iterable[int] = ()) -> range:
+        """ Block of count consecutive free gids, none of them in taken such as ids about to be inserted """
+        return self._reserve(GroupId, self._ranges.system if system else self._ranges.groups, count, "gid", taken)
+
+    def _reserve(self, table, id_range: IdRange, count: int, kind: str, taken: Iterable[int]) -> range:
+        if count <= 0:
+            return range(0)
+        start = self._first_free((table,), id_range, count, sorted(set(taken)))
+        if start is None:
+            msg = "No free {kind} in range {range}" if count == 1 else "No {count} consecutive free {kind}s in range {range}"
+            raise NotPossible(msg.format(count=count, kind=kind, range=id_range))
+        return range(start, start + count)
+
+    def _first_free(self, tables: tuple, id_range: IdRange, count: int, taken: Sequence[int]) -> Optional[int]:
+        """ Lowest start of count ids free in all tables and not taken
+
+        A gap found in one table is searched again from its start in the others, or after the taken ids within it,
+        until all agree.
+        """
+        start = id_range.first
+        while True:
+            agreed = True
+            for n, table in enumerate(tables):
+                found = self._first_free_in(table, IdRange(start, id_range.last), count)
+                if found is None:
+                    return None
+                agreed = agreed and (n == 0 or found == start)
+                start = found
+            after_taken = _after_taken(taken, range(start, start + count))
+            if after_taken is not None:
+                start = after_taken
+            elif agreed:
+                return start
+
+    def _first_free_in(self, table, id_range: IdRange, count: int) -> Optional[int]:
+        if id_range.last - id_range.first + 1 < count:
+            return None
+        first_taken, first_gap = _STATEMENTS[table]
+        session = self._database.session
+        taken = session.execute(first_taken, dict(first=id_range.first)).scalar()
+        if taken is None or taken - id_range.first >= count:
+            return id_range.first
+        return session.execute(first_gap, dict(first=id_range.first, last=id_range.last, count=count)).scalar()
+
+
+def _after_taken(taken: Sequence[int], block: range) -> Optional[int]:
+    """ Id after the taken ids within block and the ones following them without gap, None if none is within """
+    end = bisect_left(taken, block.stop)
+    if not end or taken[end - 1] < block.start:
+        return None
+    while end < len(taken) and taken[end] == taken[end - 1] + 1:
+        end += 1
+    return taken[end - 1] + 1
@@ -0,0 +1,113 @@
+import os.path
+import tempfile
+import threading
+import unittest
+
+from error import NotPossible
+
+from .schema import UnixAccountSchema
+from .api import SqliteDatabase
+from .group_schema import GroupId
+from .id_allocator import (
+    IdAllocatorSqlite,
+    IdRange,
+    IdRanges
+)
+from .user_api import UnixUserStorageSqlite
+from .user_schema import UserId
+
+
+class Ranges:
+    users = IdRange(100, 109)
+    groups = IdRange(105, 119)
+    system = IdRange(10, 19)
+
+
+class IdAllocatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.database = SqliteDatabase(
+            UnixAccountSchema(),
+            ":memory:"
+        )
+        self.ids = IdAllocatorSqlite(self.database, IdRanges(Ranges.users, Ranges.groups, Ranges.system))
+
+    def _take(self, cls, *ids):
+        self.database.session.add_all(cls(id=id_) for id_ in ids)
+        self.database.session.flush()
+
+    def test_first_id_of_empty_range(self):
+        self.assertEqual(100, self.ids.uid())
+        self.assertEqual(105, self.ids.gid())
+        self.assertEqual(10, self.ids.uid(system=True))
+
+    def test_lowest_free_id(self):
+        self._take(UserId, 100, 101, 103)
+        self.assertEqual(102, self.ids.uid())
+
+    def test_ids_outside_range_are_ignored(self):
+        self._take(UserId, 99, 110)
+        self.assertEqual(100, self.ids.uid())
+
+    def test_range_exhausted(self):
+        self._take(UserId, *range(100, 110))
+        with self.assertRaises(NotPossible):
+            self.ids.uid()
+
+    def test_reserve_block_in_first_gap_large_enough(self):
+        self._take(UserId, 101, 104, 105)
+        self.assertEqual(range(102, 104), self.ids.reserve_uids(2))
+        self.assertEqual(range(106, 109), self.ids.reserve_uids(3))
+
+    def test_reserve_block_at_end_of_range(self):
+        self._take(UserId, 100)
+        self.assertEqual(range(101, 110), self.ids.reserve_uids(9))
+        with self.assertRaises(NotPossible):
+            self.ids.reserve_uids(10)
+
+    def test_reserve_block_without_taken_ids(self):
+        self._take(GroupId, 106)
+        self.assertEqual(range(110, 113), self.ids.reserve_gids(3, taken=(107, 108, 109)))
+
+    def test_same_uid_and_gid(self):
+        self._take(UserId, 105, 106)
+        self._take(GroupId, 105, 107)
+        self.assertEqual((108, 108), self.ids.uid_and_gid())
+
+    def test_uid_and_gid_without_same_id_free(self):
+        self._take(UserId, *range(105, 110))
+        self.assertEqual((100, 105), self.ids.uid_and_gid())
+
+
+class IdAllocatorConcurrencyTest(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, "accounts.sqlite")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _database(self) -> SqliteDatabase:
+        database = SqliteDatabase(UnixAccountSchema(), self._path)
+        self.addCleanup(database.dispose)
+        return database
+
+    def test_allocation_waits_for_ongoing_transaction(self):
+        importing, adding = self._database(), self._database()
+        reserved, added = threading.Event(), []
+
+        def add_user():
+            reserved.wait()
+            added.append(UnixUserStorageSqlite(adding).add("user").uid)
+
+        thread = threading.Thread(target=add_user)
+        thread.start()
+        with importing.transaction() as session:
+            block = IdAllocatorSqlite(importing).reserve_uids(3)
+            reserved.set()
+            # the user is added once the reserved ids are inserted
+            thread.join(0.2)
+            session.add_all(UserId(id=uid) for uid in block)
+        thread.join()
+        self.assertEqual([block.stop], added)
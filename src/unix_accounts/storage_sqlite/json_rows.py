@@ -0,0 +1,165 @@
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    Dict,
+    Iterator,
+    Tuple
+)
+from sqlalchemy import (
+    bindparam,
+    literal_column,
+    select
+)
+
+from error import DoesNotExist
+from format import (
+    JsonAttributeGroup,
+    JsonAttributePassword,
+    JsonAttributeUser
+)
+
+from .db import Database
+from .group_membership import GroupMembership
+from .group_schema import Group
+from .password_schema import Password
+from .user_schema import User
+
+# Read-only lookups with Core statements, rows are zipped with the json attribute names directly instead of going
+# through mapped objects, UnixUser/UnixGroup/UnixPassword and the json formatters. Statements are built once and
+# compiled once thanks to the statement cache, the same columns in the same order as the attribute names:
+
+_USER_ATTRIBUTES = (
+    JsonAttributeUser.name,
+    JsonAttributeUser.password,
+    JsonAttributeUser.uid,
+    JsonAttributeUser.gid,
+    JsonAttributeUser.gecos,
+    JsonAttributeUser.dir,
+    JsonAttributeUser.shell
+)
+_USERS = select(User.name, literal_column("'x'"), User.id, User.gid, User.gecos, User.home_dir, User.shell)
+_USER_BY_NAME = _USERS.where(User.name == bindparam("name"))
+_USER_BY_ID = _USERS.where(User.id == bindparam("id"))
+
+_GROUP_ATTRIBUTES = (
+    JsonAttributeGroup.name,
+    JsonAttributeGroup.password,
+    JsonAttributeGroup.gid
+)
+_GROUPS = select(Group.name, literal_column("'x'"), Group.id)
+_GROUP_BY_NAME = _GROUPS.where(Group.name == bindparam("name"))
+_GROUP_BY_ID = _GROUPS.where(Group.id == bindparam("id"))
+_MEMBERS = select(GroupMembership.group_name, GroupMembership.user_name)
+_MEMBERS_OF_GROUP = select(GroupMembership.user_name).where(GroupMembership.group_name == bindparam("name"))
+_GROUPS_JOINED = select(Group.name, literal_column("'x'"), Group.id, GroupMembership.user_name) \
+    .outerjoin(GroupMembership, GroupMembership.group_name == Group.name) \
+    .order_by(Group.name)
+
+_MEMBERSHIP_ATTRIBUTES = (
+    JsonAttributeGroup.name,
+    JsonAttributeUser.name
+)
+
+_PASSWORD_ATTRIBUTES = (
+    JsonAttributePassword.name,
+    JsonAttributePassword.password,
+    JsonAttributePassword.last_change,
+    JsonAttributePassword.days_min,
+    JsonAttributePassword.days_max,
+    JsonAttributePassword.days_warn,
+    JsonAttributePassword.days_inactive,
+    JsonAttributePassword.expire
+)
+_PASSWORDS = select(
+    Password.name,
+    Password.encrypted_password,
+    Password.days_since_epoch_last_change,
+    Password.days_min,
+    Password.days_max,
+    Password.days_warn,
+    Password.days_inactive,
+    Password.days_since_epoch_expires
+)
+_PASSWORD_BY_NAME = _PASSWORDS.where(Password.name == bindparam("name"))
+
+
+class JsonRowsSqlite:
+
+    """ Users, groups and passwords as json rows, same content as formatted with JsonFormatterUser and the others """
+
+    def __init__(self, database: Database, chunk_size: int = None):
+        """ With chunk_size, enumerations are fetched chunk by chunk while iterated instead of all rows at once, in
+        memory independent of the directory size
+        """
+        self._database = database
+        self._chunk_size = chunk_size
+
+    def _rows(self, statement, **parameters) -> Iterator[Tuple]:
+        return iter(self._database.session.execute(statement, parameters))
+
+    def _all(self, statement) -> Iterator[Tuple]:
+        """ Chunks are buffered by the connection, without the result processing of the session """
+        if self._chunk_size:
+            connection = self._database.session.connection()
+            return iter(connection.execution_options(stream_results=True, max_row_buffer=self._chunk_size).execute(statement))
+        return self._rows(statement)
+
+    def _one(self, statement, attributes: Tuple[str, ...], not_found: str, **parameters) -> Dict:
+        row = self._database.session.execute(statement, parameters).first()
+        if row is None:
+            raise DoesNotExist(not_found)
+        return dict(zip(attributes, row))
+
+    def users(self) -> Iterator[Dict]:
+        return (dict(zip(_USER_ATTRIBUTES, row)) for row in self._all(_USERS))
+
+    def user_by_name(self, name: str) -> Dict:
+        return self._one(_USER_BY_NAME, _USER_ATTRIBUTES, "User: {name} does not exist".format(name=name), name=name)
+
+    def user_by_id(self, uid: int) -> Dict:
+        return self._one(_USER_BY_ID, _USER_ATTRIBUTES, "User with uid: {uid} does not exist".format(uid=uid), id=uid)
+
+    def groups(self) -> Iterator[Dict]:
+        """ Members of all groups are read first, in a single query, or when fetched in chunks joined to each group """
+        if self._chunk_size:
+            return self._groups_joined()
+        return self._groups_members_first()
+
+    def _groups_joined(self) -> Iterator[Dict]:
+        """ Groups by name, each with one row per member """
+        for _, rows in groupby(self._all(_GROUPS_JOINED), key=itemgetter(0)):
+            rows = list(rows)
+            group = dict(zip(_GROUP_ATTRIBUTES, rows[0]))
+            group[JsonAttributeGroup.members] = tuple(row[3] for row in rows if row[3] is not None)
+            yield group
+
+    def _groups_members_first(self) -> Iterator[Dict]:
+        members = {}
+        for group_name, user_name in self._rows(_MEMBERS):
+            members.setdefault(group_name, []).append(user_name)
+        for row in self._rows(_GROUPS):
+            group = dict(zip(_GROUP_ATTRIBUTES, row))
+            group[JsonAttributeGroup.members] = tuple(members.get(row[0], ()))
+            yield group
+
+    def group_by_name(self, name: str) -> Dict:
+        group = self._one(_GROUP_BY_NAME, _GROUP_ATTRIBUTES, "Group {name} does not exist".format(name=name), name=name)
+        return self._with_members(group)
+
+    def group_by_id(self, gid: int) -> Dict:
+        group = self._one(_GROUP_BY_ID, _GROUP_ATTRIBUTES, "Group with id {gid} does not exist".format(gid=gid), id=gid)
+        return self._with_members(group)
+
+    def _with_members(self, group: Dict) -> Dict:
+        group[JsonAttributeGroup.members] = tuple(name for name, in self._rows(_MEMBERS_OF_GROUP, name=group[JsonAttributeGroup.name]))
+        return group
+
+    def memberships(self) -> Iterator[Dict]:
+        """ Each membership as group and user name """
+        return (dict(zip(_MEMBERSHIP_ATTRIBUTES, row)) for row in self._all(_MEMBERS))
+
+    def passwords(self) -> Iterator[Dict]:
+        return (dict(zip(_PASSWORD_ATTRIBUTES, row)) for row in self._all(_PASSWORDS))
+
+    def password_by_name(self, name: str) -> Dict:
+        return self._one(_PASSWORD_BY_NAME, _PASSWORD_ATTRIBUTES, "User {name} does not exist".format(name=name), name=name)
@@ -0,0 +1,107 @@
+import unittest
+
+from error import DoesNotExist
+from format import (
+    JsonAttributeGroup,
+    JsonAttributeUser,
+    JsonFormatterGroup,
+    JsonFormatterPassword,
+    JsonFormatterUser
+)
+
+from .schema import UnixAccountSchema
+from .api import SqliteDatabase
+from .group_api import UnixGroupStorageSqlite
+from .group_member_api import UnixGroupMemberStorageSqlite
+from .json_rows import JsonRowsSqlite
+from .password_api import UnixPasswordStorageSqlite
+from .user_api import UnixUserStorageSqlite
+
+
+class Defaults:
+    uid = 10
+    user = "user"
+    gid = 20
+    group = "group"
+
+
+class JsonRowsTest(unittest.TestCase):
+
+    def setUp(self):
+        database = SqliteDatabase(
+            UnixAccountSchema(),
+            ":memory:"
+        )
+        self.users = UnixUserStorageSqlite(database)
+        self.groups = UnixGroupStorageSqlite(database)
+        self.group_members = UnixGroupMemberStorageSqlite(database)
+        self.password = UnixPasswordStorageSqlite(database)
+        self.json_rows = JsonRowsSqlite(database)
+        self.json_rows_chunked = JsonRowsSqlite(database, chunk_size=1)
+        self.users.add(Defaults.user, Defaults.uid, gecos="User Account Info")
+        self.users.add("another-user", Defaults.uid + 1)
+        self.groups.add(Defaults.group, Defaults.gid)
+        self.group_members.add_member(Defaults.user, Defaults.group)
+        self.group_members.add_member("another-user", Defaults.group)
+
+    @staticmethod
+    def _sorted_members(group: dict) -> dict:
+        return dict(group, **{JsonAttributeGroup.members: tuple(sorted(group[JsonAttributeGroup.members]))})
+
+    def test_users_same_as_formatted(self):
+        self.assertCountEqual([JsonFormatterUser(user) for user in self.users.get_all()], list(self.json_rows.users()))
+
+    def test_user_by_name(self):
+        self.assertEqual(JsonFormatterUser(self.users.get_by_name(Defaults.user)), self.json_rows.user_by_name(Defaults.user))
+
+    def test_user_by_id(self):
+        self.assertEqual(JsonFormatterUser(self.users.get_by_id(Defaults.uid)), self.json_rows.user_by_id(Defaults.uid))
+
+    def test_nonexisting_user(self):
+        with self.assertRaises(DoesNotExist):
+            self.json_rows.user_by_name("nonexisting-user")
+        with self.assertRaises(DoesNotExist):
+            self.json_rows.user_by_id(123)
+
+    def test_groups_same_as_formatted(self):
+        expected = [self._sorted_members(JsonFormatterGroup(group)) for group in self.groups.get_all()]
+        self.assertCountEqual(expected, [self._sorted_members(group) for group in self.json_rows.groups()])
+
+    def test_group_by_name(self):
+        expected = self._sorted_members(JsonFormatterGroup(self.groups.get_by_name(Defaults.group)))
+        self.assertEqual(expected, self._sorted_members(self.json_rows.group_by_name(Defaults.group)))
+
+    def test_group_by_id_without_members(self):
+        self.assertEqual(JsonFormatterGroup(self.groups.get_by_name(Defaults.user)), self.json_rows.group_by_id(Defaults.uid))
+
+    def test_nonexisting_group(self):
+        with self.assertRaises(DoesNotExist):
+            self.json_rows.group_by_name("nonexisting-group")
+        with self.assertRaises(DoesNotExist):
+            self.json_rows.group_by_id(123)
+
+    def test_passwords_same_as_formatted(self):
+        self.assertCountEqual([JsonFormatterPassword(password) for password in self.password.get_all()], list(self.json_rows.passwords()))
+
+    def test_password_by_name(self):
+        self.assertEqual(JsonFormatterPassword(self.password.get_by_name(Defaults.user)), self.json_rows.password_by_name(Defaults.user))
+        with self.assertRaises(DoesNotExist):
+            self.json_rows.password_by_name("nonexisting-user")
+
+    def test_memberships(self):
+        expected = [
+            {JsonAttributeGroup.name: Defaults.group, JsonAttributeUser.name: Defaults.user},
+            {JsonAttributeGroup.name: Defaults.group, JsonAttributeUser.name: "another-user"}
+        ]
+        self.assertCountEqual(expected, list(self.json_rows.memberships()))
+
+    def test_chunked_same_as_unchunked(self):
+        self.assertCountEqual(list(self.json_rows.users()), list(self.json_rows_chunked.users()))
+        self.assertCountEqual(list(self.json_rows.passwords()), list(self.json_rows_chunked.passwords()))
+        self.assertCountEqual(list(self.json_rows.memberships()), list(self.json_rows_chunked.memberships()))
+        expected = [self._sorted_members(group) for group in self.json_rows.groups()]
+        self.assertCountEqual(expected, [self._sorted_members(group) for group in self.json_rows_chunked.groups()])
+
+    def test_chunked_groups_by_name(self):
+        names = [group[JsonAttributeGroup.name] for group in self.json_rows_chunked.groups()]
+        self.assertEqual(sorted(names), names)
@@ -1,29 +1,30 @@
 from crypt import crypt
 import sqlalchemy.exc
-from typing import List
+from typing import (
+    Iterable,
+    Iterator,
+    List
+)
 
 from error import DoesNotExist
-from storage import UnixPasswordStorage
+from storage import (
+    PageOrder,
+    UnixPasswordStorage
+)
 from password import UnixPassword
 
 from .sqlite_api import (
     Database,
-    DatabaseApi
+    DatabaseApi,
+    transactional
 )
 from .password_schema import Password
+from .password_fmt import fmt_password
 
 
-def _fmt_password(password: Password) -> UnixPassword:
-    return UnixPassword(
-        name=password.name,
-        encrypted_password=password.encrypted_password,
-        days_since_epoch_last_change=password.days_since_epoch_last_change,
-        days_min=password.days_min,
-        days_max=password.days_max,
-        days_warn=password.days_warn,
-        days_inactive=password.days_inactive,
-        days_since_epoch_expires=password.days_since_epoch_expires
-    )
+PAGE_KEYS = {
+    PageOrder.NAME: Password.name
+}
 
 
 class UnixPasswordStorageSqlite(UnixPasswordStorage):
@@ -31,6 +32,7 @@ class UnixPasswordStorageSqlite(UnixPasswordStorage):
     def __init__(self, db: Database):
         self._db = DatabaseApi(db)
 
+    @transactional
     def update(self, user: str, new_password: str):
         self._try_update(user, new_password)
 
@@ -45,10 +47,22 @@ class UnixPasswordStorageSqlite(UnixPasswordStorage):
     def get_by_name(self, name: str) -> UnixPassword:
         try:
             password = self._db.get_one(Password, filters=(Password.name == name,))
-            return _fmt_password(password)
+            return fmt_password(password)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User {name} does not exist".format(name=name))
 
     def get_all(self) -> List[UnixPassword]:
         passwords = self._db.get(Password)
-        return [_fmt_password(sdw) for sdw in passwords]
+        return [fmt_password(sdw) for sdw in passwords]
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[UnixPassword]:
+        for password in self._db.iterate(Password, chunk_size=chunk_size):
+            yield fmt_password(password)
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixPassword]:
+        passwords = self._db.page(Password, PAGE_KEYS[order], limit, after)
+        return [fmt_password(password) for password in passwords]
+
+    def get_many(self, names: Iterable[str] = ()) -> List[UnixPassword]:
+        passwords = self._db.get_in(Password, ((Password.name, names),))
+        return [fmt_password(password) for password in passwords]
@@ -47,3 +47,14 @@ class UnixPasswordStorageTest(unittest.TestCase):
         self.users.add(Defaults.user_name)
         pwds = self.password.get_all()
         self.assertEqual(1, len(pwds))
+
+    def test_get_page(self):
+        for name in ("c", "a", "b"):
+            self.users.add(name)
+        pwds = self.password.get_page(2, after="a")
+        self.assertEqual(["b", "c"], [pwd.name for pwd in pwds])
+
+    def test_get_many(self):
+        self.users.add(Defaults.user_name)
+        pwds = self.password.get_many(names=(Defaults.user_name, "nonexisting-user"))
+        self.assertEqual([Defaults.user_name], [pwd.name for pwd in pwds])
@@ -0,0 +1,15 @@
+from password import UnixPassword
+from .password_schema import Password
+
+
+def fmt_password(password: Password) -> UnixPassword:
+    return UnixPassword(
+        name=password.name,
+        encrypted_password=password.encrypted_password,
+        days_since_epoch_last_change=password.days_since_epoch_last_change,
+        days_min=password.days_min,
+        days_max=password.days_max,
+        days_warn=password.days_warn,
+        days_inactive=password.days_inactive,
+        days_since_epoch_expires=password.days_since_epoch_expires
+    )
@@ -17,6 +17,10 @@ from .user_schema import (
     UserId
 )
 from .password_schema import Password
+from .generation_schema import (
+    Generation,
+    create_generation
+)
 
 
 class Schema(ABC):
@@ -32,3 +36,9 @@ class UnixAccountSchema(Schema):
 
     def init(self, engine: Engine):
         SchemaBase.metadata.create_all(engine)
+        # create_all skips tables which exists, indexes added later are created separately
+        for table in SchemaBase.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(engine, checkfirst=True)
+        with engine.begin() as connection:
+            create_generation(connection)
@@ -1,8 +1,14 @@
+from typing import (
+    ContextManager,
+    Iterator
+)
+import functools
 import sqlalchemy.exc
 import sqlalchemy.event
 from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import Session
 from sqlalchemy.orm import (
+    Load,
     joinedload
 )
 
@@ -10,6 +16,15 @@ from .db import Database
 from .schema import SchemaBase
 
 
+def transactional(method):
+    """ Storage method with all its changes in one transaction, or in a savepoint within an ongoing transaction """
+    # not named self, statements are attributed to the method by the statement timer
+    @functools.wraps(method)
+    def in_transaction(storage, *args, **kwargs):
+        with storage._db.transaction():
+            return method(storage, *args, **kwargs)
+    return in_transaction
+
 
 class DatabaseApi:
 
@@ -20,21 +35,60 @@ class DatabaseApi:
     def _session(self) -> Session:
         return self._database.session
 
-    def _query(self, cls, filters=(), preload=()) -> Query:
-        query = self._session.query(cls).options(joinedload(rel) for rel in preload)
+    @staticmethod
+    def _loader_option(preload) -> Load:
+        """ Relationships are joined, loader options such as selectinload(...) are used as is """
+        return preload if isinstance(preload, Load) else joinedload(preload)
+
+    def _query(self, cls, filters=(), preload=(), order_by=()) -> Query:
+        query = self._session.query(cls).options(self._loader_option(rel) for rel in preload)
         if filters:
             query = query.filter(*filters)
+        if order_by:
+            query = query.order_by(*order_by)
         return query
 
+    def transaction(self) -> ContextManager[Session]:
+        return self._database.transaction()
+
     def _commit(self):
+        """ Changes are only flushed within a transaction, it's committed or rolled back as a whole when it ends """
+        if self._database.in_transaction:
+            self._session.flush()
+            return
         try:
             self._session.commit()
         except sqlalchemy.exc.DatabaseError:
             self._session.rollback()
             raise
 
-    def get(self, cls, filters: tuple=(), preload: tuple=()) -> list:
-        return self._query(cls, filters, preload).all()
+    def get(self, cls, filters: tuple=(), preload: tuple=(), order_by: tuple=()) -> list:
+        return self._query(cls, filters, preload, order_by).all()
+
+    def iterate(self, cls, filters: tuple=(), preload: tuple=(), chunk_size: int=1000) -> Iterator:
+        """ Rows are fetched chunk_size at a time while iterating, collections can only be preloaded with selectinload """
+        return iter(self._query(cls, filters, preload).yield_per(chunk_size))
+
+    def get_in(self, cls, keys: tuple, preload: tuple=(), chunk_size: int=500) -> list:
+        """ Rows where any (column, values) in keys matches, one IN (...) query per chunk of values
+
+        Values are chunked to stay below the limit of bound parameters in a statement.
+        """
+        rows = {}
+        for column, values in keys:
+            values = list(values)
+            for start in range(0, len(values), chunk_size):
+                filters = (column.in_(values[start:start + chunk_size]),)
+                # same instance for the same row within a session, duplicates are dropped
+                rows.update(dict.fromkeys(self.get(cls, filters, preload)))
+        return list(rows)
+
+    def page(self, cls, key, limit: int, after=None, filters: tuple=(), preload: tuple=()) -> list:
+        """ Range scan on the indexed key column instead of OFFSET, cost is independent of page position """
+        query = self._query(cls, filters, preload)
+        if after is not None:
+            query = query.filter(key > after)
+        return query.order_by(key).limit(limit).all()
 
     def get_one(self, cls, filters: tuple=(), preload: tuple=()):
         return self._query(cls, filters, preload).one()
@@ -52,6 +106,23 @@ class DatabaseApi:
     def update(self):
         self._commit()
 
+    def expire(self, item: SchemaBase):
+        """ Load item again when accessed, after the database changed it such as with cascaded ids """
+        self._session.expire(item)
+
+    def expire_all(self):
+        """ Load all objects again when accessed, after changes made with statements instead of through objects """
+        self._session.expire_all()
+
+    def scalars(self, statement) -> list:
+        return self._session.execute(statement).scalars().all()
+
+    def execute(self, statement) -> int:
+        """ Insert, update or delete statement, the amount of changed rows is returned """
+        rows = self._session.execute(statement).rowcount
+        self._commit()
+        return rows
+
     def delete(self, cls, filters: tuple=()) -> bool:
         rows = self._query(cls, filters).delete()
         self._commit()
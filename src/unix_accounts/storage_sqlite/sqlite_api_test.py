@@ -51,6 +51,7 @@ class TestSqliteDatabaseApi(unittest.TestCase):
     def tearDown(self):
         self.db.session.query(User).delete()
         self.db.session.query(Group).delete()
+        self.db.session.commit()
 
     def test_add_one(self):
         item = User(name="developer")
@@ -94,6 +95,12 @@ class TestSqliteDatabaseApi(unittest.TestCase):
         fetched = self.api.get(User, filters=(User.name == second_user_name,))
         self.assertCountEqual([], fetched)
 
+    def test_get_in(self):
+        self.api.add_all([User(name="user-{n}".format(n=n)) for n in range(5)])
+        names = ["user-{n}".format(n=n) for n in range(6)]
+        fetched = self.api.get_in(User, keys=((User.name, names), (User.name, ["user-0"])), chunk_size=2)
+        self.assertCountEqual(names[:5], [user.name for user in fetched])
+
     def test_auto_commit_rollback(self):
         items = [User(name="developer"), User(name="developer")]
         try:
@@ -102,3 +109,73 @@ class TestSqliteDatabaseApi(unittest.TestCase):
             # Expects to fail due to unique constraint for names.
             pass
         self.assertTrue(self.db.session.is_active)
+
+    def test_session_scope_releases_loaded_rows(self):
+        with self.db.session_scope():
+            item = User(name="developer")
+            self.api.add(item)
+            self.assertIs(item, self.api.get_one(User))
+        self.assertIsNot(item, self.api.get_one(User))
+
+    def test_nested_session_scope_keeps_session(self):
+        with self.db.session_scope() as session:
+            with self.db.session_scope():
+                self.api.add(User(name="developer"))
+            self.assertIs(session, self.db.session)
+        self.assertIsNot(session, self.db.session)
+
+    def test_transaction_commits_when_ended(self):
+        with self.db.transaction():
+            self.api.add(User(name="developer"))
+            self.assertTrue(self.db.in_transaction)
+            self.assertTrue(self.db.session.in_transaction())
+        self.assertFalse(self.db.in_transaction)
+        self.assertEqual(["developer"], [user.name for user in self.api.get(User)])
+
+    def test_transaction_rolled_back_on_error(self):
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.api.add(User(name="developer"))
+                self.api.add(Group(name="developer"))
+                raise ValueError()
+        self.assertEqual([], self.api.get(User))
+        self.assertEqual([], self.api.get(Group))
+
+    def test_failed_change_fails_transaction(self):
+        with self.assertRaises(sqlalchemy.exc.SQLAlchemyError):
+            with self.db.transaction():
+                self.api.add(User(name="developer"))
+                try:
+                    self.api.add(User(name="developer"))
+                except sqlalchemy.exc.IntegrityError:
+                    pass
+                self.api.add(Group(name="developer"))
+        self.assertEqual([], self.api.get(User))
+
+    def test_nested_transaction_commits_with_outermost(self):
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                with self.db.transaction():
+                    self.api.add(User(name="developer"))
+                raise ValueError()
+        self.assertEqual([], self.api.get(User))
+
+    def test_nested_transaction_rolled_back_alone(self):
+        with self.db.transaction():
+            self.api.add(User(name="developer"))
+            with self.assertRaises(ValueError):
+                with self.db.transaction():
+                    self.api.add(Group(name="developer"))
+                    raise ValueError()
+        self.assertEqual(["developer"], [user.name for user in self.api.get(User)])
+        self.assertEqual([], self.api.get(Group))
+
+    def test_failed_change_in_nested_transaction_keeps_transaction(self):
+        with self.db.transaction():
+            self.api.add(User(name="developer"))
+            with self.assertRaises(sqlalchemy.exc.IntegrityError):
+                with self.db.transaction():
+                    self.api.add(User(name="developer"))
+            self.api.add(Group(name="developer"))
+        self.assertEqual(1, len(self.api.get(User)))
+        self.assertEqual(1, len(self.api.get(Group)))
@@ -0,0 +1,99 @@
+from functools import lru_cache
+from typing import (
+    Dict,
+    NamedTuple
+)
+import logging
+import re
+import sys
+import threading
+import time
+
+import sqlalchemy.event
+from sqlalchemy.engine import Engine
+
+from storage import (
+    DirectoryGeneration,
+    UnixGroupMemberStorage,
+    UnixGroupStorage,
+    UnixPasswordStorage,
+    UnixUserStorage
+)
+
+log = logging.getLogger(__name__)
+
+STORAGES = (DirectoryGeneration, UnixGroupMemberStorage, UnixGroupStorage, UnixPasswordStorage, UnixUserStorage)
+
+# Expanded "IN (?, ?, ...)" differs by the number of values, aggregated as one statement:
+_IN_VALUES = re.compile(r"\(\?(, \?)+\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(statement: str) -> str:
+    return _IN_VALUES.sub("(?, ...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def calling_storage_method() -> str:
+    """ Outermost method of the innermost storage instance on the stack, "Class.method" """
+    frame, caller, instance = sys._getframe(1), None, None
+    while frame:
+        self = frame.f_locals.get("self")
+        if instance is not None and self is not instance:
+            break
+        if isinstance(self, STORAGES):
+            caller, instance = "{cls}.{method}".format(cls=type(self).__name__, method=frame.f_code.co_name), self
+        frame = frame.f_back
+    return caller or "unknown"
+
+
+class StatementStats(NamedTuple):
+    count: int
+    time_total: float
+    time_max: float
+
+
+class StatementTimer:
+
+    """ Times all statements executed on the engine, aggregated per statement
+
+    Statements slower than the threshold are logged with parameters and the calling storage method, the stack is
+    only searched for those.
+    """
+
+    _STARTED = "statement_timer_started"
+
+    def __init__(self, engine: Engine, slow_threshold: float):
+        self._slow_threshold = slow_threshold
+        self._lock = threading.Lock()
+        self._stats = {}
+        sqlalchemy.event.listen(engine, "before_cursor_execute", self._before_execute)
+        sqlalchemy.event.listen(engine, "after_cursor_execute", self._after_execute)
+        sqlalchemy.event.listen(engine, "handle_error", self._on_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(self._STARTED, []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info[self._STARTED].pop()
+        key = normalize(statement)
+        with self._lock:
+            count, time_total, time_max = self._stats.get(key, (0, 0.0, 0.0))
+            self._stats[key] = StatementStats(count + 1, time_total + duration, max(time_max, duration))
+        if duration >= self._slow_threshold:
+            log.warning("Slow statement, {duration:.1f} ms in {caller}: {statement} {parameters}".format(
+                duration=1000 * duration,
+                caller=calling_storage_method(),
+                statement=key,
+                parameters=parameters
+            ))
+
+    def _on_error(self, context):
+        """ Failed statements are not timed, their start is dropped """
+        # Without execution context the statement failed before being started:
+        if context.execution_context is not None and context.connection.info.get(self._STARTED):
+            context.connection.info[self._STARTED].pop()
+
+    def stats(self) -> Dict[str, StatementStats]:
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,47 @@
+import unittest
+import sqlalchemy
+import sqlalchemy.exc
+
+from .api import Api
+from .statement_timer import (
+    StatementTimer,
+    normalize
+)
+
+
+class StatementTimerTest(unittest.TestCase):
+
+    def test_statements_are_aggregated(self):
+        api = Api(":memory:", slow_statement_threshold=10.0)
+        api.users.add("user")
+        before = api.statement_stats()
+        api.users.get_by_name("user")
+        api.users.get_by_name("user")
+        after = api.statement_stats()
+        counted = {statement: stat.count - before.get(statement, (0,))[0] for statement, stat in after.items()}
+        self.assertIn(2, counted.values())
+        self.assertTrue(all(stat.time_max <= stat.time_total for stat in after.values()))
+
+    def test_slow_statement_is_logged_with_storage_method(self):
+        api = Api(":memory:", slow_statement_threshold=0.0)
+        with self.assertLogs("storage_sqlite.statement_timer", level="WARNING") as logs:
+            api.users.get_all()
+        self.assertIn("UnixUserStorageSqlite.get_all", logs.output[-1])
+
+    def test_not_timed_without_threshold(self):
+        api = Api(":memory:")
+        api.users.get_all()
+        self.assertEqual({}, api.statement_stats())
+
+    def test_failed_statement_is_not_timed(self):
+        engine = sqlalchemy.create_engine("sqlite://")
+        timer = StatementTimer(engine, slow_threshold=10.0)
+        with engine.connect() as conn:
+            with self.assertRaises(sqlalchemy.exc.OperationalError):
+                conn.exec_driver_sql("SELECT * FROM nonexisting")
+            conn.exec_driver_sql("SELECT 1")
+            self.assertEqual([], conn.info[StatementTimer._STARTED])
+        self.assertEqual(["SELECT 1"], list(timer.stats()))
+
+    def test_normalize(self):
+        self.assertEqual("SELECT a FROM b WHERE a IN (?, ...)", normalize("SELECT a\nFROM b\nWHERE a IN (?, ?, ?)"))
@@ -1,18 +1,33 @@
-from typing import List, Tuple
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Tuple
+)
 import sqlalchemy.exc
 from sqlalchemy.sql.expression import func
 from error import (
     DoesNotExist,
     AlreadyExist,
 )
-from storage import UnixUserStorage
+from storage import (
+    PageOrder,
+    UnixUserStorage,
+    UserProjection
+)
 from user import UnixUser
 
-from .group_fmt import fmt_group
+from .user_fmt import (
+    PRELOAD,
+    PRELOAD_PASSWD,
+    fmt_user,
+    fmt_user_passwd
+)
 from .group_schema import (
     Group,
     GroupId
 )
+from .id_allocator import IdAllocatorSqlite
 from .password_schema import Password
 from .user_schema import (
     User,
@@ -20,39 +35,40 @@ from .user_schema import (
 )
 from .sqlite_api import (
     Database,
-    DatabaseApi
+    DatabaseApi,
+    transactional
 )
 
 
-def _fmt_group_members(groups: Tuple[User]) -> Tuple[str]:
-    return tuple(group.name for group in groups)
+PAGE_KEYS = {
+    PageOrder.NAME: User.name,
+    PageOrder.ID: User.id
+}
 
-
-def _fmt_user(user: User) -> UnixUser:
-    return UnixUser(
-        name=user.name,
-        uid=user.id,
-        group=fmt_group(user.group),
-        gecos=user.gecos,
-        home_dir=user.home_dir,
-        shell=user.shell,
-        group_membership=_fmt_group_members(user.group_membership)
-    )
+# Projection to preload for one user, preload for many users and the formatter of lookups:
+PROJECTIONS = {
+    UserProjection.FULL: ((), PRELOAD, fmt_user),
+    UserProjection.PASSWD: (PRELOAD_PASSWD, PRELOAD_PASSWD, fmt_user_passwd)
+}
 
 
 class UnixUserStorageSqlite(UnixUserStorage):
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database, projection: str = UserProjection.FULL, ids: IdAllocatorSqlite = None):
+        """ Lookups return the fields in projection, users returned when changed are complete """
         self._db = DatabaseApi(db)
+        self._ids = ids or IdAllocatorSqlite(db)
+        self._preload_one, self._preload_many, self._fmt = PROJECTIONS[projection]
 
     @staticmethod
     def _default_home(user_name: str) -> str:
         return "/home/" + user_name
 
-    def add(self, name: str, uid: int = None, gid: int = None, gecos: str = None, home_dir: str = None, shell: str = None) -> UnixUser:
+    @transactional
+    def add(self, name: str, uid: int = None, gid: int = None, gecos: str = None, home_dir: str = None, shell: str = None,
+            system: bool = False) -> UnixUser:
         user = User()
         user.name = name
-        user.user_id = UserId(id=uid)
         user.shell = shell
         user.gecos = gecos
         if home_dir:
@@ -60,12 +76,15 @@ class UnixUserStorageSqlite(UnixUserStorage):
         else:
             user.home_dir = self._default_home(name)
         if gid:
-            if self._db.exists(Group, filters=(Group.id == gid)):
+            if self._db.exists(Group, filters=(Group.id == gid,)):
                 user.gid = gid
             else:
                 raise DoesNotExist("Group id {gid} does not exist".format(gid=gid))
+            user.user_id = UserId(id=uid or self._ids.uid(system))
         else:
-            user.group = self._try_add_group(name, uid)
+            new_uid, own_gid = self._own_group_id(uid, system)
+            user.user_id = UserId(id=new_uid)
+            user.group = Group(name=name, group_id=GroupId(id=own_gid))
         user.password = Password()
         user.password.name = name
 
@@ -77,78 +96,84 @@ class UnixUserStorageSqlite(UnixUserStorage):
             else:
                 msg = "User: \"{name}\" is not unique".format(name=name)
             raise AlreadyExist(msg)
-        return _fmt_user(user)
-
-    def _try_add_group(self, name: str, gid: int) -> Group:
-        # Try to favor uid == gid
-        group = Group()
-        group.name = name
-        if not self._db.exists(Group, filters=(Group.id == gid,)):
-            group.group_id = GroupId(id=gid)
-        else:
-            group.group_id = GroupId()
-        return group
+        return fmt_user(user)
 
+    def _own_group_id(self, uid: int, system: bool) -> Tuple[int, int]:
+        """ Uid and gid of a user with an own group, the same id when free as both """
+        if not uid:
+            return self._ids.uid_and_gid(system)
+        if self._db.exists(GroupId, filters=(GroupId.id == uid,)):
+            return uid, self._ids.gid(system)
+        return uid, uid
+
+    @transactional
     def update_id(self, name: str, new_id: int) -> UnixUser:
         try:
             user = self._db.get_one(User, filters=(User.name == name,), preload=(User.user_id,))
             user.user_id.id = new_id
             self._db.update()
-            return _fmt_user(user)
+            self._db.expire(user)
+            return fmt_user(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User id {name} does not exist".format(name=name))
         except sqlalchemy.exc.IntegrityError:
             raise AlreadyExist("User with id {uid} already exist".format(uid=new_id))
 
+    @transactional
     def update_gid(self, name: str, new_gid: int) -> UnixUser:
         try:
             user = self._db.get_one(User, filters=(User.name == name,))
             user.gid = new_gid
             self._db.update()
-            return _fmt_user(user)
+            return fmt_user(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User {name} does not exist".format(name=name))
         except sqlalchemy.exc.IntegrityError:
             raise DoesNotExist("Group id {gid} does not exist".format(gid=new_gid))
 
+    @transactional
     def update_name(self, name: str, new_name: str) -> UnixUser:
         try:
             user = self._db.get_one(User, filters=(User.name == name,))
             user.name = new_name
             self._db.update()
-            return _fmt_user(user)
+            return fmt_user(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User {name} does not exist".format(name=name))
         except sqlalchemy.exc.IntegrityError:
             raise AlreadyExist("User {name} already exist".format(name=new_name))
 
+    @transactional
     def update_gecos(self, name: str, new_gecos: str) -> UnixUser:
         try:
             user = self._db.get_one(User, filters=(User.name == name,))
             user.gecos = new_gecos
             self._db.update()
-            return _fmt_user(user)
+            return fmt_user(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User {name} does not exist".format(name=name))
 
+    @transactional
     def update_home_dir(self, name: str, new_home_dir: str) -> UnixUser:
         try:
             user = self._db.get_one(User, filters=(User.name == name,))
             user.home_dir = new_home_dir
             self._db.update()
-            return _fmt_user(user)
+            return fmt_user(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User {name} does not exist".format(name=name))
 
+    @transactional
     def update_shell(self, name: str, new_shell: str) -> UnixUser:
         try:
             user = self._db.get_one(User, filters=(User.name == name,))
             user.shell = new_shell
             self._db.update()
-            return _fmt_user(user)
+            return fmt_user(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User {name} does not exist".format(name=name))
 
+    @transactional
     def delete(self, name: str) -> bool:
         try:
             user = self._db.get_one(User, filters=(User.name == name,))
@@ -158,18 +183,30 @@ class UnixUserStorageSqlite(UnixUserStorage):
 
     def get_by_id(self, uid: int) -> UnixUser:
         try:
-            user = self._db.get_one(User, filters=(User.id == uid,))
-            return _fmt_user(user)
+            user = self._db.get_one(User, filters=(User.id == uid,), preload=self._preload_one)
+            return self._fmt(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User with uid: {uid} does not exist".format(uid=uid))
 
     def get_by_name(self, name: str) -> UnixUser:
         try:
-            user = self._db.get_one(User, filters=(User.name == name,))
-            return _fmt_user(user)
+            user = self._db.get_one(User, filters=(User.name == name,), preload=self._preload_one)
+            return self._fmt(user)
         except sqlalchemy.exc.NoResultFound:
             raise DoesNotExist("User: {name} does not exist".format(name=name))
 
     def get_all(self) -> List[UnixUser]:
-        users = self._db.get(User)
-        return [_fmt_user(user) for user in users]
+        users = self._db.get(User, preload=self._preload_many)
+        return [self._fmt(user) for user in users]
+
+    def iter_all(self, chunk_size: int = 1000) -> Iterator[UnixUser]:
+        for user in self._db.iterate(User, preload=self._preload_many, chunk_size=chunk_size):
+            yield self._fmt(user)
+
+    def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixUser]:
+        users = self._db.page(User, PAGE_KEYS[order], limit, after, preload=self._preload_many)
+        return [self._fmt(user) for user in users]
+
+    def get_many(self, names: Iterable[str] = (), uids: Iterable[int] = ()) -> List[UnixUser]:
+        users = self._db.get_in(User, ((User.name, names), (User.id, uids)), preload=self._preload_many)
+        return [self._fmt(user) for user in users]
@@ -1,15 +1,21 @@
 import unittest
+import sqlalchemy.event
 
 from error import (
     AlreadyExist,
     DoesNotExist,
     NotPossible
 )
+from storage import (
+    PageOrder,
+    UserProjection
+)
 
 from .schema import UnixAccountSchema
 from .api import SqliteDatabase
 from .user_api import UnixUserStorageSqlite
 from .group_api import UnixGroupStorageSqlite
+from .group_member_api import UnixGroupMemberStorageSqlite
 
 
 class Defaults:
@@ -30,6 +36,7 @@ class UnixUserStorageTest(unittest.TestCase):
             ":memory:",
             # verbose=True
         )
+        self.database = database
         self.users = UnixUserStorageSqlite(database)
         self.groups = UnixGroupStorageSqlite(database)
 
@@ -96,6 +103,16 @@ class UnixUserStorageTest(unittest.TestCase):
         user = self.users.add(name=Defaults.username)
         # don't throw
 
+    def test_add_user_with_allocated_uid_and_gid(self):
+        self.groups.add(Defaults.group, 10000)
+        user = self.users.add(name=Defaults.username)
+        # the lowest id free both as uid and gid:
+        self.assertEqual((10001, 10001), (user.uid, user.group.id))
+
+    def test_add_system_user(self):
+        user = self.users.add(name=Defaults.username, system=True)
+        self.assertEqual((100, 100), (user.uid, user.group.id))
+
     def test_add_user_with_custom_home_dir(self):
         user_data = self._default_userdata()
         user = self.users.add(**user_data)
@@ -203,3 +220,115 @@ class UnixUserStorageTest(unittest.TestCase):
     def test_get_nonexisting_user_by_gid(self):
         with self.assertRaises(DoesNotExist):
             self.users.get_by_id(Defaults.uid)
+
+    def test_iter_all_users(self):
+        names = ["user-{n}".format(n=n) for n in range(5)]
+        for uid, name in enumerate(names, start=Defaults.uid):
+            self.users.add(name, uid)
+        users = self.users.iter_all(chunk_size=2)
+        self.assertCountEqual(names, [user.name for user in users])
+
+    def test_get_many(self):
+        for uid, name in enumerate(("a", "b", "c"), start=Defaults.uid):
+            self.users.add(name, uid)
+        users = self.users.get_many(names=("a", "nonexisting-user"), uids=(Defaults.uid, Defaults.uid + 2, 123))
+        self.assertCountEqual(["a", "c"], [user.name for user in users])
+
+    def test_get_page_by_name(self):
+        for uid, name in enumerate(("c", "a", "b"), start=Defaults.uid):
+            self.users.add(name, uid)
+        self.assertEqual(["a", "b"], [user.name for user in self.users.get_page(2)])
+        self.assertEqual(["c"], [user.name for user in self.users.get_page(2, after="b")])
+        self.assertEqual([], self.users.get_page(2, after="c"))
+
+    def test_get_page_by_id(self):
+        for uid, name in enumerate(("c", "a", "b"), start=Defaults.uid):
+            self.users.add(name, uid)
+        users = self.users.get_page(2, after=Defaults.uid, order=PageOrder.ID)
+        self.assertEqual([Defaults.uid + 1, Defaults.uid + 2], [user.uid for user in users])
+
+    def _count_statements(self, fn, *args) -> int:
+        return len(self._statements(fn, *args))
+
+    def _statements(self, fn, *args) -> list:
+        self.database.close_session()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        sqlalchemy.event.listen(self.database.session.get_bind(), "before_cursor_execute", listener)
+        try:
+            list(fn(*args))
+        finally:
+            sqlalchemy.event.remove(self.database.session.get_bind(), "before_cursor_execute", listener)
+        return statements
+
+    def _add_users(self, first: int, last: int):
+        for n in range(first, last):
+            self.users.add("user-{n}".format(n=n), Defaults.uid + n)
+
+    def test_get_all_statements_independent_of_users(self):
+        self._add_users(0, 3)
+        few = self._count_statements(self.users.get_all)
+        self._add_users(3, 20)
+        self.assertEqual(few, self._count_statements(self.users.get_all))
+
+    def test_iter_all_statements_independent_of_users(self):
+        self._add_users(0, 20)
+        self.assertEqual(
+            self._count_statements(self.users.iter_all, 100),
+            self._count_statements(self.users.get_all))
+
+    def _add_primary_group_members(self, members: int):
+        group_members = UnixGroupMemberStorageSqlite(self.database)
+        self.users.add(Defaults.username, Defaults.uid)
+        self._add_users(1, members + 1)
+        for n in range(1, members + 1):
+            group_members.add_member("user-{n}".format(n=n), Defaults.username)
+
+    def test_passwd_projection_in_one_query(self):
+        self._add_primary_group_members(20)
+        users = UnixUserStorageSqlite(self.database, UserProjection.PASSWD)
+        statements = self._statements(lambda: [users.get_by_name(Defaults.username)])
+        self.assertEqual(1, len(statements))
+        self.assertNotIn("user_group_membership", statements[0])
+
+    def test_passwd_projection_without_members(self):
+        self._add_primary_group_members(2)
+        user = UnixUserStorageSqlite(self.database, UserProjection.PASSWD).get_by_id(Defaults.uid)
+        self.assertEqual((Defaults.username, Defaults.uid), (user.group.name, user.group.id))
+        self.assertEqual((), user.group.members)
+        self.assertEqual((), user.group_membership)
+
+    def test_passwd_projection_enumeration_without_members(self):
+        self._add_primary_group_members(20)
+        users = UnixUserStorageSqlite(self.database, UserProjection.PASSWD)
+        for statement in self._statements(users.iter_all) + self._statements(users.get_all):
+            self.assertNotIn("user_group_membership", statement)
+
+    def test_add_user_and_membership_in_one_transaction(self):
+        self.groups.add(Defaults.group, Defaults.gid)
+        group_members = UnixGroupMemberStorageSqlite(self.database)
+
+        def add_member():
+            with self.database.transaction():
+                self.users.add(Defaults.username, Defaults.uid)
+                group_members.add_member(Defaults.username, Defaults.group)
+            return ()
+        statements = self._statements(add_member)
+        self.assertEqual(1, statements.count("BEGIN IMMEDIATE"))
+        self.assertEqual(2, len([statement for statement in statements if statement.startswith("SAVEPOINT")]))
+        self.assertEqual((Defaults.group,), self.users.get_by_name(Defaults.username).group_membership)
+
+    def test_failed_add_within_transaction_keeps_other_changes(self):
+        with self.database.transaction():
+            self.users.add(Defaults.username, Defaults.uid)
+            with self.assertRaises(AlreadyExist):
+                self.users.add(Defaults.username, Defaults.uid + 1)
+            self.users.add("another-user", Defaults.uid + 2)
+        self.assertCountEqual([Defaults.username, "another-user"], [user.name for user in self.users.get_all()])
+
+    def test_error_within_transaction_rolls_back_all_changes(self):
+        with self.assertRaises(DoesNotExist):
+            with self.database.transaction():
+                self.users.add(Defaults.username, Defaults.uid)
+                self.users.update_gecos("nonexisting-user", Defaults.gecos)
+        self.assertEqual([], self.users.get_all())
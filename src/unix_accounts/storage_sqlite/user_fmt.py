@@ -0,0 +1,50 @@
+from typing import Tuple
+from sqlalchemy.orm import (
+    joinedload,
+    selectinload
+)
+
+from group import UnixGroup
+from user import UnixUser
+from .group_fmt import fmt_group
+from .group_schema import Group
+from .user_schema import User
+
+# Everything fmt_user touches, with one query per relationship for many users instead of lazy loading each
+# relationship per user. Point lookups are left lazy, joining the collections makes sqlite materialize the joins.
+PRELOAD = (
+    selectinload(User.group).selectinload(Group.user_membership),
+    selectinload(User.group_membership)
+)
+# What fmt_user_passwd touches, the primary group in the same query:
+PRELOAD_PASSWD = (
+    joinedload(User.group),
+)
+
+
+def _fmt_group_members(groups: Tuple[Group]) -> Tuple[str]:
+    return tuple(group.name for group in groups)
+
+
+def fmt_user(user: User) -> UnixUser:
+    return UnixUser(
+        name=user.name,
+        uid=user.id,
+        group=fmt_group(user.group),
+        gecos=user.gecos,
+        home_dir=user.home_dir,
+        shell=user.shell,
+        group_membership=_fmt_group_members(user.group_membership)
+    )
+
+
+def fmt_user_passwd(user: User) -> UnixUser:
+    """ Without members of the primary group or group membership, neither is loaded """
+    return UnixUser(
+        name=user.name,
+        uid=user.id,
+        group=UnixGroup(user.group.name, user.group.id),
+        gecos=user.gecos,
+        home_dir=user.home_dir,
+        shell=user.shell
+    )
@@ -2,7 +2,6 @@ from sqlalchemy.orm import relationship
 from sqlalchemy import (
     Column,
     ForeignKey,
-    Sequence,
     String,
     Integer,
     DateTime
@@ -14,10 +13,11 @@ from .schema_base import SchemaBase
 from .group_membership import GroupMembership
 
 
-# sqlite don't support auto-increment on non-primary keys, thus id is a separate table
+# sqlite don't support auto-increment on non-primary keys, thus id is a separate table. Ids are allocated within
+# configured ranges, see id_allocator
 class UserId(SchemaBase):
     __tablename__ = "user_id"
-    id = Column(Integer, Sequence('uid_sequence', minvalue=10000), primary_key=True)
+    id = Column(Integer, primary_key=True)
     user = relationship("User", uselist=False, back_populates="user_id")
 
 
@@ -0,0 +1,5 @@
+from .api import AsyncApi
+
+__all__ = [
+    "AsyncApi"
+]
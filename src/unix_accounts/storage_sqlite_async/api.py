@@ -0,0 +1,42 @@
+from storage import (
+    UnixGroupStorageAsync,
+    UnixUserStorageAsync,
+    UnixPasswordStorageAsync,
+    UserProjection
+)
+
+from .db_sqlite_async import AsyncSqliteDatabase
+from .group_api import UnixGroupStorageSqliteAsync
+from .user_api import UnixUserStorageSqliteAsync
+from .password_api import UnixPasswordStorageSqliteAsync
+
+
+class AsyncApi:
+
+    """ Read-only lookups for the server, the database is expected to be created by storage_sqlite.Api """
+
+    def __init__(self, database_name: str, verbose: bool = False):
+        self._database = AsyncSqliteDatabase(
+            database_name,
+            verbose
+        )
+
+    @property
+    def groups(self) -> UnixGroupStorageAsync:
+        return UnixGroupStorageSqliteAsync(self._database)
+
+    @property
+    def users(self) -> UnixUserStorageAsync:
+        return UnixUserStorageSqliteAsync(self._database)
+
+    @property
+    def passwd_users(self) -> UnixUserStorageAsync:
+        """ Lookups of passwd entries only, without loading any group members """
+        return UnixUserStorageSqliteAsync(self._database, UserProjection.PASSWD)
+
+    @property
+    def password(self) -> UnixPasswordStorageAsync:
+        return UnixPasswordStorageSqliteAsync(self._database)
+
+    async def close(self):
+        await self._database.dispose()
@@ -0,0 +1,48 @@
+from sqlalchemy.future import select
+from sqlalchemy.sql.selectable import Select
+
+from .db_sqlite_async import AsyncSqliteDatabase
+
+
+class AsyncDatabaseApi:
+
+    def __init__(self, database: AsyncSqliteDatabase):
+        self._database = database
+
+    @staticmethod
+    def _select(cls, filters=(), preload=(), order_by=()) -> Select:
+        statement = select(cls).options(*preload)
+        if filters:
+            statement = statement.filter(*filters)
+        if order_by:
+            statement = statement.order_by(*order_by)
+        return statement
+
+    async def get(self, cls, filters: tuple=(), preload: tuple=(), order_by: tuple=()) -> list:
+        async with self._database.session() as session:
+            result = await session.execute(self._select(cls, filters, preload, order_by))
+            return result.scalars().all()
+
+    async def get_one(self, cls, filters: tuple=(), preload: tuple=()):
+        async with self._database.session() as session:
+            result = await session.execute(self._select(cls, filters, preload))
+            return result.scalars().one()
+
+    async def page(self, cls, key, limit: int, after=None, filters: tuple=(), preload: tuple=()) -> list:
+        statement = self._select(cls, filters, preload)
+        if after is not None:
+            statement = statement.filter(key > after)
+        async with self._database.session() as session:
+            result = await session.execute(statement.order_by(key).limit(limit))
+            return result.scalars().all()
+
+    async def get_in(self, cls, keys: tuple, preload: tuple=(), chunk_size: int=500) -> list:
+        rows = {}
+        async with self._database.session() as session:
+            for column, values in keys:
+                values = list(values)
+                for start in range(0, len(values), chunk_size):
+                    statement = self._select(cls, (column.in_(values[start:start + chunk_size]),), preload)
+                    result = await session.execute(statement)
+                    rows.update(dict.fromkeys(result.scalars().all()))
+        return list(rows)
@@ -0,0 +1,26 @@
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    create_async_engine
+)
+from sqlalchemy.orm import sessionmaker
+
+from error import InternalError
+
+
+class AsyncSqliteDatabase:
+
+    """ Database backed by the sqlalchemy asyncio extension and aiosqlite """
+
+    def __init__(self, db: str, verbose=False):
+        try:
+            self._engine = create_async_engine("sqlite+aiosqlite:///{db}".format(db=db), echo=verbose)
+        except ImportError as err:
+            raise InternalError("Async storage requires aiosqlite: {msg}".format(msg=err))
+        self._session_maker = sessionmaker(bind=self._engine, class_=AsyncSession, expire_on_commit=False)
+
+    def session(self) -> AsyncSession:
+        """ A new session, intended to be used for one lookup only: "async with db.session() as session:" """
+        return self._session_maker()
+
+    async def dispose(self):
+        await self._engine.dispose()
@@ -0,0 +1,61 @@
+from typing import (
+    Iterable,
+    List
+)
+import sqlalchemy.exc
+
+from error import DoesNotExist
+from group import UnixGroup
+from storage import (
+    PageOrder,
+    UnixGroupStorageAsync
+)
+from storage_sqlite.group_schema import Group
+from storage_sqlite.group_api import (
+    PAGE_KEYS,
+    by_member
+)
+from storage_sqlite.group_fmt import (
+    PRELOAD,
+    fmt_group
+)
+
+from .async_api import AsyncDatabaseApi
+from .db_sqlite_async import AsyncSqliteDatabase
+
+
+class UnixGroupStorageSqliteAsync(UnixGroupStorageAsync):
+
+    def __init__(self, db: AsyncSqliteDatabase):
+        self._db = AsyncDatabaseApi(db)
+
+    async def get_by_id(self, gid: int) -> UnixGroup:
+        try:
+            group = await self._db.get_one(Group, filters=(Group.id == gid,), preload=PRELOAD)
+            return fmt_group(group)
+        except sqlalchemy.exc.NoResultFound:
+            raise DoesNotExist("Group with id {gid} does not exist".format(gid=gid))
+
+    async def get_by_name(self, name: str) -> UnixGroup:
+        try:
+            group = await self._db.get_one(Group, filters=(Group.name == name,), preload=PRELOAD)
+            return fmt_group(group)
+        except sqlalchemy.exc.NoResultFound:
+            raise DoesNotExist("Group {name} does not exist".format(name=name))
+
+    async def get_all(self) -> List[UnixGroup]:
+        groups = await self._db.get(Group, preload=PRELOAD)
+        return [fmt_group(grp) for grp in groups]
+
+    async def get_by_member(self, user: str) -> List[UnixGroup]:
+        filters, order_by = by_member(user)
+        groups = await self._db.get(Group, filters, preload=PRELOAD, order_by=order_by)
+        return [fmt_group(group) for group in groups]
+
+    async def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixGroup]:
+        groups = await self._db.page(Group, PAGE_KEYS[order], limit, after, preload=PRELOAD)
+        return [fmt_group(group) for group in groups]
+
+    async def get_many(self, names: Iterable[str] = (), gids: Iterable[int] = ()) -> List[UnixGroup]:
+        groups = await self._db.get_in(Group, ((Group.name, names), (Group.id, gids)), preload=PRELOAD)
+        return [fmt_group(group) for group in groups]
@@ -0,0 +1,71 @@
+from tornado.testing import (
+    AsyncTestCase,
+    gen_test
+)
+import importlib.util
+import os.path
+import tempfile
+import unittest
+
+from error import DoesNotExist
+from storage_sqlite import Api
+
+from .api import AsyncApi
+
+
+class Defaults:
+    username = "user"
+    group = "group"
+    gid = 20000
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "requires aiosqlite")
+class UnixGroupStorageAsyncTest(AsyncTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._dir = tempfile.TemporaryDirectory()
+        db = os.path.join(self._dir.name, "accounts.sqlite")
+        api = Api(db)
+        api.users.add(Defaults.username)
+        api.groups.add(Defaults.group, Defaults.gid)
+        api.group_members.add_member(Defaults.username, Defaults.group)
+        self.api = AsyncApi(db)
+        self.groups = self.api.groups
+
+    def tearDown(self):
+        self.io_loop.run_sync(self.api.close)
+        self._dir.cleanup()
+        super().tearDown()
+
+    @gen_test
+    async def test_get_group_by_name(self):
+        group = await self.groups.get_by_name(Defaults.group)
+        self.assertEqual(Defaults.gid, group.id)
+        self.assertEqual((Defaults.username,), group.members)
+
+    @gen_test
+    async def test_get_group_by_id(self):
+        group = await self.groups.get_by_id(Defaults.gid)
+        self.assertEqual(Defaults.group, group.name)
+
+    @gen_test
+    async def test_get_all_groups(self):
+        groups = await self.groups.get_all()
+        self.assertCountEqual([Defaults.username, Defaults.group], [group.name for group in groups])
+
+    @gen_test
+    async def test_get_by_member(self):
+        groups = await self.groups.get_by_member(Defaults.username)
+        self.assertEqual([Defaults.username, Defaults.group], [group.name for group in groups])
+        self.assertEqual((Defaults.username,), groups[1].members)
+
+    @gen_test
+    async def test_get_nonexisting_group_by_name(self):
+        with self.assertRaises(DoesNotExist):
+            await self.groups.get_by_name("nonexisting-group")
+
+    @gen_test
+    async def test_get_nonexisting_group_by_id(self):
+        with self.assertRaises(DoesNotExist):
+            await self.groups.get_by_id(123)
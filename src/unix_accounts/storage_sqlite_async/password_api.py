@@ -0,0 +1,43 @@
+from typing import (
+    Iterable,
+    List
+)
+import sqlalchemy.exc
+
+from error import DoesNotExist
+from password import UnixPassword
+from storage import (
+    PageOrder,
+    UnixPasswordStorageAsync
+)
+from storage_sqlite.password_schema import Password
+from storage_sqlite.password_api import PAGE_KEYS
+from storage_sqlite.password_fmt import fmt_password
+
+from .async_api import AsyncDatabaseApi
+from .db_sqlite_async import AsyncSqliteDatabase
+
+
+class UnixPasswordStorageSqliteAsync(UnixPasswordStorageAsync):
+
+    def __init__(self, db: AsyncSqliteDatabase):
+        self._db = AsyncDatabaseApi(db)
+
+    async def get_by_name(self, name: str) -> UnixPassword:
+        try:
+            password = await self._db.get_one(Password, filters=(Password.name == name,))
+            return fmt_password(password)
+        except sqlalchemy.exc.NoResultFound:
+            raise DoesNotExist("User {name} does not exist".format(name=name))
+
+    async def get_all(self) -> List[UnixPassword]:
+        passwords = await self._db.get(Password)
+        return [fmt_password(sdw) for sdw in passwords]
+
+    async def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixPassword]:
+        passwords = await self._db.page(Password, PAGE_KEYS[order], limit, after)
+        return [fmt_password(password) for password in passwords]
+
+    async def get_many(self, names: Iterable[str] = ()) -> List[UnixPassword]:
+        passwords = await self._db.get_in(Password, ((Password.name, names),))
+        return [fmt_password(password) for password in passwords]
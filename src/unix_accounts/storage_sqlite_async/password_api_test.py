@@ -0,0 +1,50 @@
+from tornado.testing import (
+    AsyncTestCase,
+    gen_test
+)
+import importlib.util
+import os.path
+import tempfile
+import unittest
+
+from error import DoesNotExist
+from storage_sqlite import Api
+
+from .api import AsyncApi
+
+
+class Defaults:
+    username = "user"
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "requires aiosqlite")
+class UnixPasswordStorageAsyncTest(AsyncTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._dir = tempfile.TemporaryDirectory()
+        db = os.path.join(self._dir.name, "accounts.sqlite")
+        api = Api(db)
+        api.users.add(Defaults.username)
+        self.api = AsyncApi(db)
+        self.passwords = self.api.password
+
+    def tearDown(self):
+        self.io_loop.run_sync(self.api.close)
+        self._dir.cleanup()
+        super().tearDown()
+
+    @gen_test
+    async def test_get_password_by_name(self):
+        password = await self.passwords.get_by_name(Defaults.username)
+        self.assertEqual(Defaults.username, password.name)
+
+    @gen_test
+    async def test_get_all_passwords(self):
+        passwords = await self.passwords.get_all()
+        self.assertEqual([Defaults.username], [password.name for password in passwords])
+
+    @gen_test
+    async def test_get_nonexisting_password(self):
+        with self.assertRaises(DoesNotExist):
+            await self.passwords.get_by_name("nonexisting-user")
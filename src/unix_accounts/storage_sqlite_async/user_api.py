@@ -0,0 +1,63 @@
+from typing import (
+    Iterable,
+    List
+)
+import sqlalchemy.exc
+
+from error import DoesNotExist
+from storage import (
+    PageOrder,
+    UnixUserStorageAsync,
+    UserProjection
+)
+from user import UnixUser
+from storage_sqlite.user_schema import User
+from storage_sqlite.user_api import PAGE_KEYS
+from storage_sqlite.user_fmt import (
+    PRELOAD,
+    PRELOAD_PASSWD,
+    fmt_user,
+    fmt_user_passwd
+)
+
+from .async_api import AsyncDatabaseApi
+from .db_sqlite_async import AsyncSqliteDatabase
+
+# Lazy loading is not possible with asyncio, everything formatted is preloaded:
+PROJECTIONS = {
+    UserProjection.FULL: (PRELOAD, fmt_user),
+    UserProjection.PASSWD: (PRELOAD_PASSWD, fmt_user_passwd)
+}
+
+
+class UnixUserStorageSqliteAsync(UnixUserStorageAsync):
+
+    def __init__(self, db: AsyncSqliteDatabase, projection: str = UserProjection.FULL):
+        self._db = AsyncDatabaseApi(db)
+        self._preload, self._fmt = PROJECTIONS[projection]
+
+    async def get_by_id(self, uid: int) -> UnixUser:
+        try:
+            user = await self._db.get_one(User, filters=(User.id == uid,), preload=self._preload)
+            return self._fmt(user)
+        except sqlalchemy.exc.NoResultFound:
+            raise DoesNotExist("User with uid: {uid} does not exist".format(uid=uid))
+
+    async def get_by_name(self, name: str) -> UnixUser:
+        try:
+            user = await self._db.get_one(User, filters=(User.name == name,), preload=self._preload)
+            return self._fmt(user)
+        except sqlalchemy.exc.NoResultFound:
+            raise DoesNotExist("User: {name} does not exist".format(name=name))
+
+    async def get_all(self) -> List[UnixUser]:
+        users = await self._db.get(User, preload=self._preload)
+        return [self._fmt(user) for user in users]
+
+    async def get_page(self, limit: int, after=None, order: str = PageOrder.NAME) -> List[UnixUser]:
+        users = await self._db.page(User, PAGE_KEYS[order], limit, after, preload=self._preload)
+        return [self._fmt(user) for user in users]
+
+    async def get_many(self, names: Iterable[str] = (), uids: Iterable[int] = ()) -> List[UnixUser]:
+        users = await self._db.get_in(User, ((User.name, names), (User.id, uids)), preload=self._preload)
+        return [self._fmt(user) for user in users]
@@ -0,0 +1,86 @@
+from tornado.testing import (
+    AsyncTestCase,
+    gen_test
+)
+import importlib.util
+import os.path
+import tempfile
+import unittest
+
+from error import DoesNotExist
+from storage import PageOrder
+from storage_sqlite import Api
+
+from .api import AsyncApi
+
+
+class Defaults:
+    uid = 10000
+    username = "user"
+    group = "group"
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "requires aiosqlite")
+class UnixUserStorageAsyncTest(AsyncTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._dir = tempfile.TemporaryDirectory()
+        db = os.path.join(self._dir.name, "accounts.sqlite")
+        api = Api(db)
+        api.users.add(Defaults.username, uid=Defaults.uid)
+        api.groups.add(Defaults.group)
+        api.group_members.add_member(Defaults.username, Defaults.group)
+        self.api = AsyncApi(db)
+        self.users = self.api.users
+
+    def tearDown(self):
+        self.io_loop.run_sync(self.api.close)
+        self._dir.cleanup()
+        super().tearDown()
+
+    @gen_test
+    async def test_get_user_by_name(self):
+        user = await self.users.get_by_name(Defaults.username)
+        self.assertEqual(Defaults.uid, user.uid)
+        self.assertEqual(Defaults.username, user.group.name)
+        self.assertEqual((Defaults.group,), user.group_membership)
+
+    @gen_test
+    async def test_get_passwd_user_by_name(self):
+        user = await self.api.passwd_users.get_by_name(Defaults.username)
+        self.assertEqual((Defaults.username, Defaults.uid), (user.group.name, user.group.id))
+        self.assertEqual((), user.group_membership)
+
+    @gen_test
+    async def test_get_user_by_id(self):
+        user = await self.users.get_by_id(Defaults.uid)
+        self.assertEqual(Defaults.username, user.name)
+
+    @gen_test
+    async def test_get_all_users(self):
+        users = await self.users.get_all()
+        self.assertEqual([Defaults.username], [user.name for user in users])
+
+    @gen_test
+    async def test_get_page(self):
+        users = await self.users.get_page(10, after=Defaults.uid - 1, order=PageOrder.ID)
+        self.assertEqual([Defaults.username], [user.name for user in users])
+        self.assertEqual((Defaults.group,), users[0].group_membership)
+        self.assertEqual([], await self.users.get_page(10, after=Defaults.username))
+
+    @gen_test
+    async def test_get_many(self):
+        users = await self.users.get_many(names=(Defaults.username, "nonexisting-user"), uids=(Defaults.uid,))
+        self.assertEqual([Defaults.username], [user.name for user in users])
+        self.assertEqual((Defaults.group,), users[0].group_membership)
+
+    @gen_test
+    async def test_get_nonexisting_user_by_name(self):
+        with self.assertRaises(DoesNotExist):
+            await self.users.get_by_name("nonexisting-user")
+
+    @gen_test
+    async def test_get_nonexisting_user_by_id(self):
+        with self.assertRaises(DoesNotExist):
+            await self.users.get_by_id(123)
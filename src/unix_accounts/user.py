@@ -1,18 +1,25 @@
 from typing import Tuple
 
-from group import UnixGroup
+from group import (
+    UnixGroup,
+    intern_optional
+)
 
 
 class UnixUser:
 
+    """ Immutable, without a __dict__ per instance. Names and shells are interned, repeated in many users and groups """
+
+    __slots__ = ("_name", "_uid", "_group", "_gecos", "_home_dir", "_shell", "_group_membership")
+
     def __init__(self, name: str, uid: int = None, group: UnixGroup = None, gecos = None, home_dir: str = None, shell: str = None, group_membership: Tuple[str] = ()):
-        self._name = name
+        self._name = intern_optional(name)
         self._uid = uid
         self._group = group
         self._gecos = gecos
         self._home_dir = home_dir
-        self._shell = shell
-        self._group_membership = group_membership
+        self._shell = intern_optional(shell)
+        self._group_membership = tuple(map(intern_optional, group_membership))
 
     @property
     def name(self) -> str: